@@ -0,0 +1,151 @@
+# archive.py
+# Napoleon (game archive) - random access over a record file (records.py) via mmap.
+#
+# Sidecar index "<records>.idx" = INDEX_MAGIC, then one little-endian u64 per
+# record: the file offset of its length prefix. Fixed width, so record #n is
+# found without scanning; the index is extended when the record file has grown.
+#
+# Usage:
+#   with GameArchive("games.napr") as ar:
+#       rec = ar[1234]                 # decoded dict
+#       raw = ar.span(1000, 2000)      # zero-copy memoryview of 1000 records
+#       offs = ar.offsets_buffer()     # np.frombuffer(offs, dtype="<u8")
+
+import mmap
+import os
+import random
+import struct
+
+from records import FILE_MAGIC, decode_record
+
+INDEX_MAGIC = b"NAPIDX\x01\x00"  # 8 bytes keeps the u64 entries aligned
+
+_LEN = struct.Struct("<H")
+_OFF = struct.Struct("<Q")
+
+
+def index_path(path) -> str:
+    return f"{path}.idx"
+
+
+def update_index(path) -> int:
+    """Add index entries for records appended since the last update; returns the record count."""
+    ipath = index_path(path)
+    offsets = []
+    n = 0
+    pos = len(FILE_MAGIC)
+
+    mode = "r+b" if os.path.exists(ipath) else "w+b"
+    with open(ipath, mode) as idx, open(path, "rb") as f:
+        if f.read(len(FILE_MAGIC)) != FILE_MAGIC:
+            raise ValueError("Not a Napoleon record file.")
+        head = idx.read(len(INDEX_MAGIC))
+        if head != INDEX_MAGIC:
+            idx.seek(0)
+            idx.truncate()
+            idx.write(INDEX_MAGIC)
+        else:
+            idx.seek(0, os.SEEK_END)
+            n = (idx.tell() - len(INDEX_MAGIC)) // _OFF.size
+            idx.truncate(len(INDEX_MAGIC) + n * _OFF.size)  # drop a torn entry
+            if n:
+                idx.seek(len(INDEX_MAGIC) + (n - 1) * _OFF.size)
+                (last,) = _OFF.unpack(idx.read(_OFF.size))
+                f.seek(last)
+                (size,) = _LEN.unpack(f.read(_LEN.size))
+                pos = last + _LEN.size + size
+
+        end = os.fstat(f.fileno()).st_size
+        f.seek(pos)
+        while pos + _LEN.size <= end:
+            (size,) = _LEN.unpack(f.read(_LEN.size))
+            if pos + _LEN.size + size > end:
+                break  # torn tail; indexed once the write completes
+            offsets.append(pos)
+            pos += _LEN.size + size
+            f.seek(pos)
+
+        idx.seek(0, os.SEEK_END)
+        idx.write(b"".join(_OFF.pack(o) for o in offsets))
+    return n + len(offsets)
+
+
+class GameArchive:
+    """Read-only, memory-mapped view of a record file and its offset index."""
+
+    def __init__(self, path):
+        self.count = update_index(path)
+        self._f = open(path, "rb")
+        self._if = open(index_path(path), "rb")
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._imm = mmap.mmap(self._if.fileno(), 0, access=mmap.ACCESS_READ)
+        self.data = memoryview(self._mm)
+        self.index = memoryview(self._imm)[len(INDEX_MAGIC):len(INDEX_MAGIC) + self.count * _OFF.size]
+
+    def __len__(self):
+        return self.count
+
+    def _check(self, n: int) -> int:
+        if n < 0:
+            n += self.count
+        if not 0 <= n < self.count:
+            raise IndexError("record index out of range")
+        return n
+
+    def offset(self, n: int) -> int:
+        return _OFF.unpack_from(self.index, self._check(n) * _OFF.size)[0]
+
+    def _end(self, n: int) -> int:
+        # End offset of record n (n == count means end of the indexed data).
+        if n >= self.count:
+            if not self.count:
+                return len(FILE_MAGIC)
+            last = self.offset(self.count - 1)
+            return last + _LEN.size + _LEN.unpack_from(self.data, last)[0]
+        return self.offset(n)
+
+    def body(self, n: int) -> memoryview:
+        """Zero-copy body bytes of record n (see records.decode_record)."""
+        off = self.offset(n)
+        (size,) = _LEN.unpack_from(self.data, off)
+        return self.data[off + _LEN.size:off + _LEN.size + size]
+
+    def __getitem__(self, n: int) -> dict:
+        return decode_record(self.body(n))
+
+    def span(self, start: int, stop: int) -> memoryview:
+        """Zero-copy bytes of records start..stop-1, each still length-prefixed."""
+        start = max(0, min(start, self.count))
+        stop = max(start, min(stop, self.count))
+        return self.data[self._end(start):self._end(stop)]
+
+    def offsets_buffer(self, start: int = 0, stop=None) -> memoryview:
+        """Raw index entries (little-endian u64 record offsets) for start..stop-1."""
+        stop = self.count if stop is None else min(stop, self.count)
+        return self.index[start * _OFF.size:stop * _OFF.size]
+
+    def iter_range(self, start: int = 0, stop=None):
+        stop = self.count if stop is None else min(stop, self.count)
+        for n in range(start, stop):
+            yield self[n]
+
+    def sample(self, fraction: float, seed=None):
+        """Yield (n, record) for a random fraction of the games, in file order."""
+        rng = random.Random(seed)
+        k = int(round(self.count * fraction))
+        for n in sorted(rng.sample(range(self.count), k)):
+            yield n, self[n]
+
+    def close(self):
+        self.data.release()
+        self.index.release()
+        self._mm.close()
+        self._imm.close()
+        self._f.close()
+        self._if.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,243 @@
+# bid_model.py
+# Napoleon (bid calibration) - fits P(Napoleon side reaches target | hand score)
+# from self-play and writes the lookup table the CPU bidder loads (bid_table.py).
+#
+# Every deal is played four times, once with each seat as Napoleon in its best
+# suit (bidding.best_bid). The declared target is drawn uniformly from TARGETS
+# (it only tunes the exchange), and the game's Napoleon-side pict count is
+# counted as a reach / miss for every target. Per hand score and target, the
+# reach rate is smoothed and made non-decreasing in score (pool adjacent violators).
+#
+# Napoleon plays the Kivy app's policies: the Lieut card by sampled playouts
+# (lieut.py) and the exchange re-ranked by playouts (exchange.EXCHANGE_TOP_K).
+# The app stops them on a time budget; here they run a fixed number of samples
+# (LIEUT_SAMPLES, EXCHANGE_SAMPLES) so a seed gives the same table. 0 samples
+# plays the engine's fast heuristics (cpu_lieut_card / cpu_exchange) instead.
+#
+# bid_table.py is a plain .py module so buildozer packages it (source.include_exts).
+#
+# Usage:
+#   python bid_model.py calibrate [-n DEALS] [--seed S] [--workers W] [--samples L X] [--out bid_table.py]
+#   python bid_model.py bench [-n DEALS] [--seed S] [--samples L X]
+
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import bidding
+from bidding import TARGETS, best_bid, threshold_target
+from engine import GameEngine, bid_key
+from exchange import EXCHANGE_TOP_K, apply_exchange, plan_exchange
+from lieut import LieutCaller
+from tournament import game_seed
+
+ALL_PICTS = 20  # taking every pict loses (GameEngine.score)
+LIEUT_SAMPLES = 4  # deals per Lieut call (the app fits ~20 in its budget)
+EXCHANGE_SAMPLES = 4  # deals per exchange re-ranking (the app fits ~6)
+NO_BUDGET = float("inf")
+
+
+# ----------------------------
+# Self-play
+# ----------------------------
+
+def play_declared(engine, pid, suit_code, target, lieut_samples=LIEUT_SAMPLES, exchange_samples=EXCHANGE_SAMPLES):
+    """Play out a freshly dealt engine with pid as Napoleon; returns the Napoleon-side pict count."""
+    engine.napoleon_id = pid
+    ok, msg = engine.set_declaration(suit_code, target)
+    if not ok:
+        raise RuntimeError(f"Declare failed: {msg}")
+    if lieut_samples:
+        engine.set_lieut_card(LieutCaller(time_budget=NO_BUDGET, max_samples=lieut_samples).call(engine))
+    else:
+        engine.set_lieut_card(engine.cpu_lieut_card())
+    if exchange_samples:
+        kept = plan_exchange(engine, EXCHANGE_TOP_K, NO_BUDGET, max_samples=exchange_samples)
+        apply_exchange(engine, kept)
+    else:
+        engine.cpu_exchange()
+    engine.finish_exchange()
+    while engine.stage == "play":
+        pid = engine.next_player_id()
+        engine.play_card(pid, engine.cpu_choose(pid))
+    return engine.score()["nap_pict"]
+
+
+def reached(nap_pict: int, target: int) -> bool:
+    return target <= nap_pict < ALL_PICTS
+
+
+def run_chunk(seed, start, count, samples=(LIEUT_SAMPLES, EXCHANGE_SAMPLES)):
+    """Games for deals start..start+count-1: [(score, declared target, nap_pict)], 4 per deal.
+
+    samples: (Lieut, exchange) playout deals per game, see play_declared().
+    """
+    engine = GameEngine()
+    rng = random.Random(game_seed(seed, start) ^ 0x5EED)
+    out = []
+    for i in range(start, start + count):
+        engine.new_game(seed=game_seed(seed, i))
+        for p in engine.players:
+            suit_code, score, _ = best_bid(p.mask)
+            target = rng.choice(TARGETS)
+            out.append((score, target, play_declared(engine.clone(), p.id, suit_code, target, *samples)))
+    return out
+
+
+def run_games(n_deals, seed=0, workers=None, chunk_size=500, samples=(LIEUT_SAMPLES, EXCHANGE_SAMPLES)):
+    chunks = [(s, min(chunk_size, n_deals - s)) for s in range(0, n_deals, chunk_size)]
+    games = []
+    if workers == 1:
+        for start, count in chunks:
+            games.extend(run_chunk(seed, start, count, samples))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for part in pool.map(run_chunk, [seed] * len(chunks), *zip(*chunks), [samples] * len(chunks)):
+                games.extend(part)
+    return games
+
+
+# ----------------------------
+# Fit
+# ----------------------------
+
+def _pool_adjacent(values, weights):
+    # Weighted isotonic (non-decreasing) regression.
+    blocks = []  # [value, weight, length]
+    for v, w in zip(values, weights):
+        blocks.append([v, w, 1])
+        while len(blocks) > 1 and blocks[-2][0] > blocks[-1][0]:
+            v2, w2, n2 = blocks.pop()
+            v1, w1, n1 = blocks.pop()
+            w = w1 + w2
+            blocks.append([(v1 * w1 + v2 * w2) / w if w else (v1 + v2) / 2, w, n1 + n2])
+    out = []
+    for v, _, n in blocks:
+        out.extend([v] * n)
+    return out
+
+
+def fit(games):
+    """(score_min, rows): rows[score - score_min][k] = P(reach TARGETS[k])."""
+    scores = [s for s, _, _ in games]
+    lo, hi = min(scores), max(scores)
+    trials = [0] * (hi - lo + 1)
+    hits = [[0] * len(TARGETS) for _ in trials]
+    for score, _, nap_pict in games:
+        trials[score - lo] += 1
+        for k, t in enumerate(TARGETS):
+            hits[score - lo][k] += reached(nap_pict, t)
+
+    cols = []
+    for k in range(len(TARGETS)):
+        # Jeffreys prior keeps sparse tail scores away from hard 0/1.
+        raw = [(hits[i][k] + 0.5) / (trials[i] + 1) for i in range(len(trials))]
+        cols.append(_pool_adjacent(raw, trials))
+    rows = [[cols[k][i] for k in range(len(TARGETS))] for i in range(len(trials))]
+    for row in rows:
+        for k in range(1, len(row)):
+            row[k] = min(row[k], row[k - 1])  # a higher target is never easier
+    return lo, rows
+
+
+def write_table(path, score_min, rows, note=""):
+    data = bytes(round(p * 255) for row in rows for p in row).hex()
+    lines = [data[i:i + 64] for i in range(0, len(data), 64)]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# bid_table.py\n")
+        f.write("# Generated by bid_model.py calibrate - do not edit.\n")
+        if note:
+            f.write(f"# {note}\n")
+        f.write("#\n")
+        f.write("# PROBS[(score - SCORE_MIN) * len(TARGETS) + k] / 255 = P(Napoleon side reaches\n")
+        f.write("# TARGETS[k]) for a Napoleon whose best bidding.suit_scores() value is score.\n\n")
+        f.write(f"SCORE_MIN = {score_min}\n")
+        f.write(f"TARGETS = {tuple(TARGETS)}\n")
+        f.write("PROBS = bytes.fromhex(\n")
+        for line in lines:
+            f.write(f'    "{line}"\n')
+        f.write(")\n")
+
+
+# ----------------------------
+# Benchmark
+# ----------------------------
+
+def calibration_error(games, bins=10):
+    """(Brier score, expected calibration error) of bidding.reach_probability() on games."""
+    sq = 0.0
+    acc = [[0.0, 0.0, 0] for _ in range(bins)]  # sum p, sum outcome, count
+    n = 0
+    for score, _, nap_pict in games:
+        for t in TARGETS:
+            p = bidding.reach_probability(score, t)
+            y = 1.0 if reached(nap_pict, t) else 0.0
+            sq += (p - y) ** 2
+            b = acc[min(bins - 1, int(p * bins))]
+            b[0] += p
+            b[1] += y
+            b[2] += 1
+            n += 1
+    ece = sum(abs(sp - sy) for sp, sy, _ in acc) / n
+    return sq / n, ece
+
+
+def napoleon_win_rate(n_deals, seed, target_of, samples=(LIEUT_SAMPLES, EXCHANGE_SAMPLES)):
+    """Self-play Napoleon win rate when every CPU bids with target_of(score)."""
+    engine = GameEngine()
+    wins = 0
+    for i in range(n_deals):
+        engine.new_game(seed=game_seed(seed, i))
+        bids = []
+        for p in engine.players:
+            suit_code, score, _ = best_bid(p.mask)
+            bids.append({"pid": p.id, "suit": suit_code, "target": target_of(score), "score": score})
+        bid = max(bids, key=bid_key)
+        wins += reached(play_declared(engine, bid["pid"], bid["suit"], bid["target"], *samples), bid["target"])
+    return wins / max(1, n_deals)
+
+
+def bench(n_deals, seed, samples=(LIEUT_SAMPLES, EXCHANGE_SAMPLES)):
+    t0 = time.perf_counter()
+    games = run_games(n_deals, seed, workers=1, samples=samples)
+    brier, ece = calibration_error(games)
+    print(f"table: {'bid_table.py' if bidding.bid_table is not None else 'missing (thresholds)'}")
+    print(f"held-out games: {len(games)}  seed: {seed}")
+    print(f"Brier score: {brier:.4f}  expected calibration error: {ece:.4f}")
+    for name, fn in (("thresholds", threshold_target), ("calibrated", bidding.target_for_score)):
+        rate = napoleon_win_rate(n_deals, seed, fn, samples)
+        print(f"Napoleon win rate ({name} bids): {rate:.3f}")
+    print(f"elapsed: {time.perf_counter() - t0:.1f}s")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Calibrate / benchmark the CPU bid target table.")
+    ap.add_argument("command", choices=("calibrate", "bench"))
+    ap.add_argument("-n", "--deals", type=int, default=None, help="deals (4 games each)")
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--workers", type=int, default=None, help="calibrate: process count (1 = in-process)")
+    ap.add_argument(
+        "--samples", type=int, nargs=2, metavar=("LIEUT", "EXCHANGE"), default=(LIEUT_SAMPLES, EXCHANGE_SAMPLES),
+        help="playout deals per Lieut call / exchange (0 0 = engine heuristics)",
+    )
+    ap.add_argument("--out", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "bid_table.py"))
+    args = ap.parse_args(argv)
+
+    if args.command == "bench":
+        bench(args.deals or 2000, 1 if args.seed is None else args.seed, tuple(args.samples))
+        return
+
+    n = args.deals or 50000
+    seed = 0 if args.seed is None else args.seed
+    t0 = time.perf_counter()
+    games = run_games(n, seed, args.workers, samples=tuple(args.samples))
+    score_min, rows = fit(games)
+    note = f"{len(games)} games ({n} deals x 4 seats), seed {seed}, samples {args.samples[0]} / {args.samples[1]}."
+    write_table(args.out, score_min, rows, note)
+    print(f"{len(games)} games in {time.perf_counter() - t0:.1f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+# bid_table.py
+# Generated by bid_model.py calibrate - do not edit.
+# 240000 games (60000 deals x 4 seats), seed 0.
+#
+# PROBS[(score - SCORE_MIN) * len(TARGETS) + k] / 255 = P(Napoleon side reaches
+# TARGETS[k]) for a Napoleon whose best bidding.suit_scores() value is score.
+
+SCORE_MIN = 6
+TARGETS = (13, 14, 15, 16, 17, 18, 19)
+PROBS = bytes.fromhex(
+    "0d0d050502010018110505020100181105050201002c1a0c050201002c1a0c06"
+    "030100311c10090401003823130b0402003c25160b0502013d26160b05020142"
+    "29170c060201452d1c0f0803014d331f11080301503621130a0401543922130a"
+    "0401563b25140b04015e4129180d050161442c190e0601684a301c0f06016c4f"
+    "331e1108027052382112080276573b251409027d5b4028170a028060432b190c"
+    "02876849301d0c028d6b4f331d0c028d6e5034200c0296775638210f02967756"
+    "382511039f7e5b3c271203a78e6845291203a78e6a47311703a78e6c4c371703"
+    "ae976c4c371704b4987c52401c04b4987c61441c08caa57c61441c10caa5807c"
+    "633022caa5807c634622cab29c7c634622cabf9c7c634640"
+)
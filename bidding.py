@@ -0,0 +1,270 @@
+# bidding.py
+# Napoleon (bidding) - hand-strength evaluators on card bitmasks, with lookup tables.
+#
+# Two heuristics live here:
+# - engine/Kivy CPU (GameEngine.bid_strength_for_suit / cpu_best_bid):
+#   suit_scores(mask) scores a hand for all four suits at once.
+# - napo.py CPU (declare first / raise): is_declaration_hand(), hand_strength_score().
+#
+# A suit's 13 cards are one 13-bit chunk of the hand mask (engine.CARD_CODES
+# order), so each heuristic is a few table lookups per hand. The tables hold
+# the summed card contributions for every possible chunk and are built once.
+#
+# The bid target comes from bid_table.py, P(Napoleon side reaches target | score)
+# fitted from self-play by bid_model.py: the CPU bids the highest target it
+# reaches at least BID_CONFIDENCE of the time. Without the table the older
+# hand-written thresholds (TARGET_STEPS) are used.
+#
+# The *_batch functions evaluate many hands at once with NumPy (optional, like
+# trick_batch.py), e.g. for bidding statistics over millions of deals.
+
+from engine import CARD_BIT, JOKER_BIT, PICT_MASK, RANKS, SPECIAL_MIGHTY, SPECIAL_YORO, SUITS, mask_count
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+try:
+    import bid_table
+except ImportError:  # pragma: no cover - not calibrated yet
+    bid_table = None
+
+
+CHUNK_BITS = len(RANKS)
+CHUNK = (1 << CHUNK_BITS) - 1
+AK_MASK = sum(CARD_BIT[f"{s}{r}"] for s in SUITS for r in ("A", "K"))
+
+# Engine heuristic, per rank: value as a card of the bid suit / of another suit.
+IN_SUIT = {r: 2 + {"A": 6, "K": 5, "Q": 4, "J": 3, "0": 2}.get(r, 0) for r in RANKS}
+OFF_SUIT = {r: 1 if r in ("A", "K") else 0 for r in RANKS}
+JOKER_SCORE = 5
+LENGTH_BONUS = (0, 0, 0, 0, 1, 2) + (3,) * (CHUNK_BITS - 5)  # by cards held in the bid suit
+
+TARGETS = (13, 14, 15, 16, 17, 18, 19)  # CPU / UI bid range
+MIN_TARGET = TARGETS[0]
+BID_CONFIDENCE = 0.5
+# Hand-written (score floor, target) steps, best first; used without bid_table.py.
+TARGET_STEPS = ((41, 19), (37, 18), (33, 17), (29, 16), (23, 15), (17, 14))
+
+# napo.py heuristic, per rank ("strong" points; strength in half points).
+NAPO_STRONG = {"A": 2, "K": 1, "Q": 1}
+NAPO_HALVES = {"A": 4, "K": 2, "Q": 2, "J": 1, "0": 1}
+NAPO_JOKER = 3
+# sA/hQ replace their rank value: sA 3 (A is 2), hQ 2 (Q is 1).
+NAPO_MIGHTY_EXTRA = 1
+NAPO_YORO_EXTRA = 1
+
+
+def _chunk_table(values):
+    # t[chunk] = sum of values[i] over the set bits i of chunk.
+    t = [0] * (1 << CHUNK_BITS)
+    for ch in range(1, 1 << CHUNK_BITS):
+        low = ch & -ch
+        t[ch] = t[ch ^ low] + values[low.bit_length() - 1]
+    return t
+
+
+# Score of the bid suit's own chunk: in-suit values minus the off-suit value the
+# same cards get in the hand-wide base, plus the length bonus.
+_BID_CHUNK = _chunk_table([IN_SUIT[r] - OFF_SUIT[r] for r in RANKS])
+for _ch in range(1 << CHUNK_BITS):
+    _BID_CHUNK[_ch] += LENGTH_BONUS[bin(_ch).count("1")]
+_STRONG_CHUNK = _chunk_table([NAPO_STRONG.get(r, 0) for r in RANKS])
+_HALVES_CHUNK = _chunk_table([NAPO_HALVES.get(r, 0) for r in RANKS])
+del _ch
+MAX_SCORE = max(_BID_CHUNK) + JOKER_SCORE + 2 * len(SUITS)  # bound for suit_scores()
+
+
+# ----------------------------
+# Engine / Kivy CPU
+# ----------------------------
+
+def suit_scores(mask: int):
+    """bid_strength_for_suit() of a hand for every suit, in SUITS order."""
+    base = mask_count(mask & AK_MASK)
+    if mask & JOKER_BIT:
+        base += JOKER_SCORE
+    t = _BID_CHUNK
+    return (
+        base + t[mask & CHUNK],
+        base + t[(mask >> CHUNK_BITS) & CHUNK],
+        base + t[(mask >> 2 * CHUNK_BITS) & CHUNK],
+        base + t[(mask >> 3 * CHUNK_BITS) & CHUNK],
+    )
+
+
+def threshold_target(score: int) -> int:
+    for floor, target in TARGET_STEPS:
+        if score >= floor:
+            return target
+    return MIN_TARGET
+
+
+def reach_probability(score: int, target: int) -> float:
+    """Fitted P(Napoleon side reaches target) for a best-suit score (bid_table.py)."""
+    if bid_table is None:
+        raise RuntimeError("bid_table.py is missing; run: python bid_model.py calibrate")
+    n = len(bid_table.TARGETS)
+    row = min(max(score - bid_table.SCORE_MIN, 0), len(bid_table.PROBS) // n - 1)
+    k = min(max(target - bid_table.TARGETS[0], 0), n - 1)
+    return bid_table.PROBS[row * n + k] / 255.0
+
+
+def _model_target(score: int) -> int:
+    best = MIN_TARGET
+    for t in TARGETS:
+        if reach_probability(score, t) >= BID_CONFIDENCE:
+            best = t
+    return best
+
+
+# Target per score 0..MAX_SCORE, worked out once at import.
+_TARGET_OF_SCORE = [
+    (_model_target if bid_table is not None else threshold_target)(score) for score in range(MAX_SCORE + 1)
+]
+
+
+def target_for_score(score: int) -> int:
+    return _TARGET_OF_SCORE[min(max(score, 0), MAX_SCORE)]
+
+
+def best_bid(mask: int):
+    """(suit, score, target) of cpu_best_bid(); ties go to the earlier suit in SUITS."""
+    scores = suit_scores(mask)
+    best = max(range(len(SUITS)), key=scores.__getitem__)
+    return SUITS[best], scores[best], target_for_score(scores[best])
+
+
+# ----------------------------
+# napo.py CPU
+# ----------------------------
+
+def _napo_specials(mask: int) -> int:
+    extra = 0
+    if mask & CARD_BIT[SPECIAL_MIGHTY]:
+        extra += NAPO_MIGHTY_EXTRA
+    if mask & CARD_BIT[SPECIAL_YORO]:
+        extra += NAPO_YORO_EXTRA
+    return extra
+
+
+def is_declaration_hand(mask: int) -> bool:
+    """Strong enough to declare first: 6+ strong points or 8+ pict cards (Joker not counted)."""
+    t = _STRONG_CHUNK
+    strong = (
+        t[mask & CHUNK]
+        + t[(mask >> CHUNK_BITS) & CHUNK]
+        + t[(mask >> 2 * CHUNK_BITS) & CHUNK]
+        + t[(mask >> 3 * CHUNK_BITS) & CHUNK]
+        + _napo_specials(mask)
+    )
+    if mask & JOKER_BIT:
+        strong += NAPO_JOKER
+    return strong >= 6 or mask_count(mask & PICT_MASK) >= 8
+
+
+def hand_strength_score(mask: int) -> int:
+    """Raise strength (about 0..15): card points plus a bonus for 8+/10+ picts (Joker counts)."""
+    t = _HALVES_CHUNK
+    halves = (
+        t[mask & CHUNK]
+        + t[(mask >> CHUNK_BITS) & CHUNK]
+        + t[(mask >> 2 * CHUNK_BITS) & CHUNK]
+        + t[(mask >> 3 * CHUNK_BITS) & CHUNK]
+        + 2 * _napo_specials(mask)
+    )
+    picts = mask_count(mask & PICT_MASK)
+    if mask & JOKER_BIT:
+        halves += 2 * NAPO_JOKER
+        picts += 1
+    score = halves // 2
+    if picts >= 10:
+        score += 2
+    elif picts >= 8:
+        score += 1
+    return score
+
+
+# ----------------------------
+# Batch (NumPy)
+# ----------------------------
+
+_np_tables = None
+
+
+def _require_numpy():
+    global _np_tables
+    if np is None:
+        raise ImportError("bidding batch functions need NumPy (pip install numpy).")
+    if _np_tables is None:
+        _np_tables = (
+            np.array(_BID_CHUNK, dtype=np.int16),
+            np.array(_STRONG_CHUNK, dtype=np.int16),
+            np.array(_HALVES_CHUNK, dtype=np.int16),
+            np.array([bin(ch).count("1") for ch in range(1 << CHUNK_BITS)], dtype=np.int16),
+        )
+    return _np_tables
+
+
+def _chunks(masks):
+    # (N, 4) suit chunks and the (N,) Joker flag of an array of hand masks.
+    m = np.asarray(masks, dtype=np.uint64).reshape(-1)
+    shifts = np.arange(len(SUITS), dtype=np.uint64) * np.uint64(CHUNK_BITS)
+    chunks = ((m[:, None] >> shifts) & np.uint64(CHUNK)).astype(np.intp)
+    joker = ((m >> np.uint64(JOKER_BIT.bit_length() - 1)) & np.uint64(1)).astype(bool)
+    return m, chunks, joker
+
+
+def _count(m, bits):
+    count = _require_numpy()[3]
+    c = (m & np.uint64(bits))
+    return sum(count[((c >> np.uint64(k * CHUNK_BITS)) & np.uint64(CHUNK)).astype(np.intp)] for k in range(len(SUITS)))
+
+
+def suit_scores_batch(masks):
+    """suit_scores() for many hands: (N, 4) int array in SUITS order."""
+    bid_t = _require_numpy()[0]
+    m, chunks, joker = _chunks(masks)
+    base = _count(m, AK_MASK) + np.where(joker, JOKER_SCORE, 0)
+    return base[:, None] + bid_t[chunks]
+
+
+def best_bids_batch(masks):
+    """best_bid() for many hands: (suit index into SUITS, score, target) arrays."""
+    scores = suit_scores_batch(masks)
+    best = np.argmax(scores, axis=1)  # first maximum, as in best_bid()
+    top = scores[np.arange(len(scores)), best]
+    targets = np.array(_TARGET_OF_SCORE, dtype=np.int16)
+    return best, top, targets[np.clip(top, 0, MAX_SCORE)]
+
+
+def napo_batch(masks):
+    """(is_declaration_hand, hand_strength_score) arrays for many hands."""
+    _, strong_t, halves_t, _ = _require_numpy()
+    m, chunks, joker = _chunks(masks)
+    mighty = (m & np.uint64(CARD_BIT[SPECIAL_MIGHTY])) != 0
+    yoro = (m & np.uint64(CARD_BIT[SPECIAL_YORO])) != 0
+    specials = mighty * NAPO_MIGHTY_EXTRA + yoro * NAPO_YORO_EXTRA
+    picts = _count(m, PICT_MASK)
+
+    strong = strong_t[chunks].sum(axis=1) + specials + np.where(joker, NAPO_JOKER, 0)
+    declares = (strong >= 6) | (picts >= 8)
+
+    picts = picts + joker
+    score = (halves_t[chunks].sum(axis=1) + 2 * specials + np.where(joker, 2 * NAPO_JOKER, 0)) // 2
+    score = score + np.where(picts >= 10, 2, np.where(picts >= 8, 1, 0))
+    return declares, score
+
+
+def deal_batch(n: int, seed=None):
+    """n random deals as masks: ((n, 4) hand masks, (n,) mount masks), uint64.
+
+    Same dealing scheme as engine.deal_masks() (random-key sort), vectorized.
+    """
+    _require_numpy()
+    rng = np.random.default_rng(seed)
+    ids = np.argsort(rng.random((n, len(SUITS) * CHUNK_BITS + 1)), axis=1).astype(np.uint64)
+    bits = np.uint64(1) << ids
+    hands = np.stack([np.bitwise_or.reduce(bits[:, k:48:4], axis=1) for k in range(4)], axis=1)
+    return hands, np.bitwise_or.reduce(bits[:, 48:], axis=1)
@@ -0,0 +1,106 @@
+# build_atlas.py
+# Napoleon (build step) - packs the card images into a Kivy atlas.
+#
+# The 53 faces and back.png from Cards/ are scaled to one cell size and laid
+# out on a grid, on as few pages as MAX_PAGE allows. The result is the Kivy
+# atlas format: Cards/cards.atlas (JSON) plus Cards/cards-<n>.png pages.
+#   {"cards-0.png": {"ace_of_spades": [x, y, w, h], ...}, ...}
+# Region ids are the file names without ".png"; y counts from the bottom of
+# the page, as Kivy textures do.
+#
+# main.py uses the atlas when Cards/cards.atlas exists (atlas://Cards/cards/<id>),
+# otherwise the separate PNG files. The generated atlas is committed and
+# buildozer.spec leaves the separate files out of the APK, so run this again
+# whenever a card image changes:
+#   python build_atlas.py [--card-width 200] [--cards Cards]
+#
+# Needs Pillow at build time only.
+
+import argparse
+import json
+import os
+
+from engine import build_deck_4p, card_to_filename
+
+ATLAS_NAME = "cards"
+CARD_WIDTH = 200  # px; a card is at most ~180 px wide on a phone screen
+MAX_PAGE = 2048  # px, page width and height
+PADDING = 2  # px between regions, against texture bleeding
+
+
+def atlas_files():
+    """Card image file names in the atlas: the 53 faces, then back.png."""
+    return [card_to_filename(c) for c in build_deck_4p()] + ["back.png"]
+
+
+def plan_pages(ids, cell_w, cell_h, max_page=MAX_PAGE, padding=PADDING):
+    """Grid layout of equal cells: [(page size (w, h), {id: [x, y, w, h]})].
+
+    y is measured from the bottom of the page (Kivy atlas coordinates).
+    """
+    step_w, step_h = cell_w + padding, cell_h + padding
+    cols = max(1, (max_page + padding) // step_w)
+    rows = max(1, (max_page + padding) // step_h)
+    if cell_w > max_page or cell_h > max_page:
+        raise ValueError(f"A {cell_w}x{cell_h} cell does not fit a {max_page} px page.")
+
+    pages = []
+    per_page = cols * rows
+    for start in range(0, len(ids), per_page):
+        chunk = ids[start:start + per_page]
+        used_cols = min(cols, len(chunk))
+        used_rows = -(-len(chunk) // cols)
+        w = used_cols * step_w - padding
+        h = used_rows * step_h - padding
+        regions = {}
+        for i, uid in enumerate(chunk):
+            col, row = i % cols, i // cols
+            regions[uid] = [col * step_w, h - row * step_h - cell_h, cell_w, cell_h]
+        pages.append(((w, h), regions))
+    return pages
+
+
+def build(cards_dir, card_width=CARD_WIDTH, max_page=MAX_PAGE, padding=PADDING):
+    """Write <cards_dir>/cards.atlas and its pages; returns the .atlas path."""
+    from PIL import Image
+
+    files = atlas_files()
+    missing = [fn for fn in files if not os.path.exists(os.path.join(cards_dir, fn))]
+    if missing:
+        raise FileNotFoundError(f"Missing card images in {cards_dir}: {', '.join(missing)}")
+
+    with Image.open(os.path.join(cards_dir, files[0])) as im:
+        src_w, src_h = im.size
+    cell_w = card_width
+    cell_h = round(src_h * card_width / src_w)
+    ids = [os.path.splitext(fn)[0] for fn in files]
+
+    meta = {}
+    for k, ((w, h), regions) in enumerate(plan_pages(ids, cell_w, cell_h, max_page, padding)):
+        page = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+        for uid, (x, y, rw, rh) in regions.items():
+            with Image.open(os.path.join(cards_dir, f"{uid}.png")) as im:
+                card = im.convert("RGBA").resize((rw, rh), Image.LANCZOS)
+            page.paste(card, (x, h - y - rh))  # PIL counts y from the top
+        page_name = f"{ATLAS_NAME}-{k}.png"
+        page.save(os.path.join(cards_dir, page_name), optimize=True)
+        meta[page_name] = regions
+
+    path = os.path.join(cards_dir, f"{ATLAS_NAME}.atlas")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=1, sort_keys=True)
+    return path
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Pack Cards/*.png into a Kivy atlas.")
+    ap.add_argument("--cards", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "Cards"))
+    ap.add_argument("--card-width", type=int, default=CARD_WIDTH)
+    ap.add_argument("--max-page", type=int, default=MAX_PAGE)
+    args = ap.parse_args(argv)
+    path = build(args.cards, args.card_width, args.max_page)
+    print(f"{len(atlas_files())} images -> {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,10 @@ package.name = napoleon
 package.domain = org.fujiwara
 version = 0.1
 source.dir = .
-source.include_exts = py,png,ico
+source.include_exts = py,png,ico,atlas
+# Card images ship packed as Cards/cards.atlas + Cards/cards-*.png (committed;
+# rerun python build_atlas.py after changing a card image).
+source.exclude_patterns = Cards/*_of_*.png,Cards/joker.png,Cards/back.png
 requirements = python3,kivy
 orientation = landscape
 fullscreen = 1
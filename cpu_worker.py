@@ -0,0 +1,79 @@
+# cpu_worker.py
+# Napoleon (CPU worker) - CPU decisions on a background thread.
+#
+# The UI thread hands over a snapshot (GameEngine.clone()) and gets the card
+# back through a callback; it never waits on the search itself. Kivy-free, so
+# the app decides how the result gets back to its main loop.
+
+import threading
+
+
+class CpuJob:
+    def __init__(self, pid: int, ply: int, stage: str = "play"):
+        self.pid = pid
+        self.ply = ply  # len(engine.history) when submitted; a stale result no longer matches
+        self.stage = stage  # engine.stage when submitted
+        self.card = None  # what decide() returned: a card, or e.g. the Lieut card
+        self.error = None
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+
+def _cpu_choose(engine, pid, stop):
+    return engine.cpu_choose(pid)
+
+
+class CpuWorker:
+    """Runs decide(engine_snapshot, pid, stop) -> card on a daemon thread.
+
+    stop() turns True once the job is cancelled, so long searches can end early.
+    on_done(job) is called on the worker thread, and only for jobs not cancelled.
+    decide() calls never overlap: a new job waits for a cancelled one to return,
+    so decide may keep state (e.g. an ISMCTS tree) between jobs.
+    submit(..., decide=f) runs f instead for that one job (the Lieut call,
+    the exchange), still on the same thread and lock.
+    """
+
+    def __init__(self, decide=None):
+        self.decide = decide or _cpu_choose
+        self.job = None
+        self._lock = threading.Lock()
+
+    def submit(self, engine, pid, on_done, decide=None):
+        self.cancel()
+        job = CpuJob(pid, len(engine.history), engine.stage)
+        snapshot = engine.clone()
+        decide = decide or self.decide
+        self.job = job
+
+        def run():
+            with self._lock:
+                if job.cancelled:
+                    return
+                try:
+                    job.card = decide(snapshot, pid, lambda: job.cancelled)
+                except Exception as ex:  # reported to the UI instead of killing the thread silently
+                    job.error = ex
+            if not job.cancelled:
+                on_done(job)
+
+        threading.Thread(target=run, name=f"cpu-P{pid}", daemon=True).start()
+        return job
+
+    def claim(self, job) -> bool:
+        """True (and the worker is free again) if job is the live result to apply."""
+        if job is not self.job or job.cancelled:
+            return False
+        self.job = None
+        return True
+
+    def cancel(self):
+        if self.job is not None:
+            self.job.cancel()
+            self.job = None
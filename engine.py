@@ -30,28 +30,39 @@ FACE_DOWN = "BACK"
 
 PICT_RANKS = {"0", "J", "Q", "K", "A"}  # 10/J/Q/K/A
 
+REVERSE_SUIT = {"s": "c", "c": "s", "h": "d", "d": "h"}
+
 
 def is_joker(c: str) -> bool:
     return c == "Jo"
 
 
 def suit(c: str) -> str:
+    s = CARD_SUIT.get(c)
+    if s is not None:
+        return s
     if is_joker(c) or not c:
         return ""
     return c[0]
 
 
 def rank(c: str) -> str:
+    r = CARD_RANK.get(c)
+    if r is not None:
+        return r
     if is_joker(c) or not c:
         return ""
     return c[1]
 
 
 def reverse_suit(s: str) -> str:
-    return {"s": "c", "c": "s", "h": "d", "d": "h"}.get(s, "")
+    return REVERSE_SUIT.get(s, "")
 
 
 def card_value_basic(c: str) -> int:
+    v = CARD_VALUE.get(c)
+    if v is not None:
+        return v
     if is_joker(c):
         return 0
     return RANK_TO_INT.get(rank(c), 0)
@@ -75,6 +86,106 @@ def build_deck_4p():
     return deck  # 53
 
 
+# ----------------------------
+# Compact card encoding
+# Every card of build_deck_4p() maps to a small int (0..52) and a set of cards
+# maps to an int bitmask (fits in 64 bits). Ids follow sort_cards() order
+# (s2..sA, h2..hA, d2..dA, c2..cA, Joker), so walking a mask from the low bit
+# yields an already sorted hand. The engine API keeps using string codes.
+# ----------------------------
+
+CARD_CODES = tuple([f"{s}{r}" for s in SUITS for r in RANKS] + ["Jo"])
+CARD_ID = {c: i for i, c in enumerate(CARD_CODES)}
+CARD_BIT = {c: 1 << i for i, c in enumerate(CARD_CODES)}
+FULL_MASK = (1 << len(CARD_CODES)) - 1
+
+JOKER_BIT = CARD_BIT["Jo"]
+MIGHTY_BIT = CARD_BIT[SPECIAL_MIGHTY]
+SUIT_MASK = {s: sum(CARD_BIT[f"{s}{r}"] for r in RANKS) for s in SUITS}
+PICT_MASK = sum(CARD_BIT[f"{s}{r}"] for s in SUITS for r in PICT_RANKS)
+
+# Per-code lookup tables used by suit()/rank()/card_value_basic().
+CARD_SUIT = {c: ("" if c == "Jo" else c[0]) for c in CARD_CODES}
+CARD_RANK = {c: ("" if c == "Jo" else c[1]) for c in CARD_CODES}
+CARD_VALUE = {c: (0 if c == "Jo" else RANK_TO_INT[c[1]]) for c in CARD_CODES}
+CARD_IS_PICT = {c: bool(CARD_BIT[c] & PICT_MASK) for c in CARD_CODES}
+
+
+def card_id(c: str) -> int:
+    return CARD_ID[c]
+
+
+def card_from_id(i: int) -> str:
+    return CARD_CODES[i]
+
+
+def cards_to_mask(cards) -> int:
+    m = 0
+    for c in cards:
+        m |= CARD_BIT[c]
+    return m
+
+
+def mask_to_cards(m: int):
+    # Lowest bit first -> same order as sort_cards().
+    out = []
+    while m:
+        low = m & -m
+        out.append(CARD_CODES[low.bit_length() - 1])
+        m ^= low
+    return out
+
+
+_MOVES_CACHE = {}
+MOVES_CACHE_SIZE = 1 << 14  # ~3 MB when full; cleared, not evicted one by one
+
+
+def mask_to_moves(m: int):
+    """mask_to_cards() as a shared immutable tuple.
+
+    A seat's legal mask only changes when its hand or the lead changes, so
+    search and rollouts keep asking for the same few masks.
+    """
+    moves = _MOVES_CACHE.get(m)
+    if moves is None:
+        if len(_MOVES_CACHE) >= MOVES_CACHE_SIZE:
+            _MOVES_CACHE.clear()
+        moves = _MOVES_CACHE[m] = tuple(mask_to_cards(m))
+    return moves
+
+
+def deal_masks(rng):
+    """Random deal as bitmasks: ([4 hand masks], mount mask). No card strings are built."""
+    # Sorting by random keys is a uniform shuffle and about twice as fast as rng.shuffle().
+    r = rng.random
+    keys = [r() for _ in CARD_CODES]
+    ids = sorted(range(len(CARD_CODES)), key=keys.__getitem__)
+    hands = []
+    for k in range(4):
+        m = 0
+        for i in ids[k:48:4]:
+            m |= 1 << i
+        hands.append(m)
+    mount = 0
+    for i in ids[48:]:
+        mount |= 1 << i
+    return hands, mount
+
+
+def mask_count(m: int) -> int:
+    return bin(m).count("1")
+
+
+NO_EXCLUSIONS = (0, 0, 0, 0, 0)  # GameEngine.excluded_masks before any inference
+
+
+# Shared play tuples: turn_cards/turn_display hold (pid, code) and history holds
+# (pid, card, shown) entries taken from these tables, so a play allocates nothing.
+_TURN_ENTRY = [None] + [{c: (pid, c) for c in CARD_CODES + (FACE_DOWN,)} for pid in range(1, 5)]
+_PLAY_UP = [None] + [{c: (pid, c, c) for c in CARD_CODES} for pid in range(1, 5)]
+_PLAY_DOWN = [None] + [{c: (pid, c, FACE_DOWN) for c in CARD_CODES} for pid in range(1, 5)]
+
+
 # ----------------------------
 # Image filename mapping (matches "X_of_suit.png" format)
 # ----------------------------
@@ -101,14 +212,70 @@ def card_to_filename(c: str) -> str:
 
 
 def is_pict(c: str) -> bool:
+    v = CARD_IS_PICT.get(c)
+    if v is not None:
+        return v
     return (not is_joker(c)) and (rank(c) in PICT_RANKS)
 
 
+# ----------------------------
+# Per-declaration strength tables
+# Built once per obverse suit and shared by every engine:
+# - score:     card -> trick strength (specials use their fixed strength,
+#              Joker its non-led strength, other cards their rank value)
+# - special:   card -> True for Joker/Mighty/obverse J/reverse J
+#              (Yoromeki depends on the trick and is checked separately)
+# - forbidden: specials that disable the 2-rule and Joker-lead dominance
+# ----------------------------
+
+_DECL_TABLES = {}
+
+
+def declaration_tables(obverse: str):
+    t = _DECL_TABLES.get(obverse)
+    if t is not None:
+        return t
+
+    score = dict(CARD_VALUE)
+    special = {c: False for c in CARD_CODES}
+    forbidden = {SPECIAL_MIGHTY}
+
+    score["Jo"] = 1
+    special["Jo"] = True
+    score[SPECIAL_MIGHTY] = 4500
+    special[SPECIAL_MIGHTY] = True
+    if obverse:
+        obv_j = f"{obverse}J"
+        rev_j = f"{reverse_suit(obverse)}J"
+        score[obv_j] = 4300
+        score[rev_j] = 4200
+        special[obv_j] = True
+        special[rev_j] = True
+        forbidden.update((obv_j, rev_j))
+
+    t = (score, special, frozenset(forbidden))
+    _DECL_TABLES[obverse] = t
+    return t
+
+
+# ----------------------------
+# Bids
+# bid: {"pid", "target", "suit", "score", "is_human"}
+# ----------------------------
+
+def bid_key(b: dict):
+    suit_power = SUIT_ORDER.get(b.get("suit", ""), 0)
+    # target > suit strength > hand score > human priority
+    return (b.get("target", 13), suit_power, b.get("score", 0), 1 if b.get("is_human") else 0)
+
+
 # ----------------------------
 # Player / Engine
 # ----------------------------
 
 class Player:
+    __slots__ = ("id", "is_human", "_cards", "mask", "role", "revealed_role")
+
     def __init__(self, pid: int, is_human: bool = False):
         self.id = pid
         self.is_human = is_human
@@ -116,9 +283,68 @@ class Player:
         self.role = "unknown"  # napoleon/lieut/coalition/unknown
         self.revealed_role = False
 
+    # Hand is kept both as a list of codes and as a bitmask (see cards_to_mask).
+    # Assigning .cards refreshes the mask; the engine updates it on every play.
+    @property
+    def cards(self):
+        return self._cards
+
+    @cards.setter
+    def cards(self, cards):
+        self._cards = cards
+        self.mask = cards_to_mask(cards)
+
+    def copy(self):
+        q = Player.__new__(Player)
+        q.id = self.id
+        q.is_human = self.is_human
+        q._cards = list(self._cards)
+        q.mask = self.mask
+        q.role = self.role
+        q.revealed_role = self.revealed_role
+        return q
+
 
 class GameEngine:
-    def __init__(self):
+    # Slotted so that many live engines (search, multi-table serving) stay small;
+    # clone() copies every slot explicitly.
+    __slots__ = (
+        "_rng",
+        "players",
+        "deck",
+        "_mount",
+        "mount_mask",
+        "obverse",
+        "target",
+        "declaration",
+        "lieut_card",
+        "turn_no",
+        "leader_id",
+        "stage",
+        "napoleon_id",
+        "turn_cards",
+        "turn_display",
+        "first_card",
+        "first_suit",
+        "lieut_id",
+        "lieut_in_mount",
+        "lieut_revealed",
+        "pict_won_masks",
+        "history",
+        "seen_mask",
+        "excluded_masks",
+        "_decl_obverse",
+        "_decl",
+        "_undo",
+        "recorder",
+    )
+
+    def __init__(self, rng=None, seed=None):
+        # Own random stream (never the global one), so parallel engines stay independent.
+        # Without rng/seed it is created on first use (see the rng property).
+        if rng is None and seed is not None:
+            rng = random.Random(seed)
+        self._rng = rng
         self.players = [Player(1, True), Player(2, False), Player(3, False), Player(4, False)]
         self.deck = []
         self.mount = []
@@ -142,15 +368,105 @@ class GameEngine:
         self.lieut_in_mount = False
         self.lieut_revealed = False
 
-        self.pict_won_count = {1: 0, 2: 0, 3: 0, 4: 0}
-        self.pict_won_cards = {1: [], 2: [], 3: [], 4: []}
+        self.pict_won_masks = [0, 0, 0, 0]  # pict cards taken, per pid - 1
+        self.history = []  # [(pid, actual_card, shown_code)] for every play of the game
+
+        # Public knowledge, updated by play_card() (see possible_mask()):
+        # seen_mask:      cards everyone has seen (face-up plays, finished tricks)
+        # excluded_masks: per pid - 1, then the mount: cards that place is known
+        #                 not to hold (voids, a located sA). A tuple, replaced on change.
+        self.seen_mask = 0
+        self.excluded_masks = NO_EXCLUSIONS
+
+        self._decl_obverse = ""
+        self._decl = declaration_tables("")
+
+        self._undo = []  # push_move() entries
+        self.recorder = None  # optional records.GameRecorder
+
+    @property
+    def rng(self):
+        if self._rng is None:
+            self._rng = random.Random()
+        return self._rng
+
+    @rng.setter
+    def rng(self, rng):
+        self._rng = rng
+
+    @property
+    def mount(self):
+        return self._mount
+
+    @mount.setter
+    def mount(self, cards):
+        self._mount = cards
+        self.mount_mask = cards_to_mask(cards)
+
+    # Read-only views of pict_won_masks, keyed by pid like the other per-player state.
+    @property
+    def pict_won_count(self):
+        return {pid: mask_count(m) for pid, m in enumerate(self.pict_won_masks, 1)}
+
+    @property
+    def pict_won_cards(self):
+        return {pid: mask_to_cards(m) for pid, m in enumerate(self.pict_won_masks, 1)}
+
+    def pict_count(self, pid: int) -> int:
+        return mask_count(self.pict_won_masks[pid - 1])
+
+    # ----------------------------
+    # Public knowledge queries
+    # ----------------------------
+
+    def possible_mask(self, pid: int) -> int:
+        # Cards pid may still hold as far as the other players can tell.
+        return FULL_MASK & ~(self.seen_mask | self.excluded_masks[pid - 1])
+
+    @property
+    def possible_masks(self):
+        # possible_mask() for pids 1..4, then the mount.
+        seen = self.seen_mask
+        return [FULL_MASK & ~(seen | m) for m in self.excluded_masks]
+
+    def is_void(self, pid: int, s: str) -> bool:
+        # Known to everyone that pid holds no card of suit s.
+        return not (self.possible_mask(pid) & SUIT_MASK[s])
+
+    def known_lieut_id(self):
+        # Lieut holder once the Lieut card has been played (None before, or if in the mount).
+        return self.lieut_id if self.lieut_revealed else None
+
+    def _note_play(self, pid: int, c: str, shown: str):
+        # O(1) knowledge update for one play (called before it joins turn_cards).
+        if shown == FACE_DOWN:
+            # No lead-suit card left in that hand.
+            ex = list(self.excluded_masks)
+            ex[pid - 1] |= SUIT_MASK.get(self.first_suit, 0)
+            self.excluded_masks = tuple(ex)
+            return
+        self.seen_mask |= CARD_BIT[c]
+        if self.turn_cards and self.first_suit == "s" and CARD_SUIT[c] not in ("s", ""):
+            # Face-up off-suit on a Spade lead: the hand's only Spade is sA.
+            ex = [m | MIGHTY_BIT for m in self.excluded_masks]
+            ex[pid - 1] = self.excluded_masks[pid - 1] | (SUIT_MASK["s"] & ~MIGHTY_BIT)
+            self.excluded_masks = tuple(ex)
+
+    def _note_trick_done(self):
+        # Face-down cards are turned up when the trick is taken.
+        for _, c in self.turn_cards:
+            self.seen_mask |= CARD_BIT[c]
 
     def human(self) -> Player:
         return self.players[0]
 
-    def new_game(self):
-        self.deck = build_deck_4p()
-        random.shuffle(self.deck)
+    def new_game(self, deck=None, seed=None):
+        # deck: optional pre-shuffled 53-card order (dealt from the end) for fixed deals.
+        # seed: reseeds self.rng first, so the deal (and any policy drawing from
+        # self.rng) is reproducible; also stored in the game record.
+        if seed is not None:
+            self.rng.seed(seed)
+        self.deck = [] if deck is None else list(deck)
 
         self.mount = []
         self.obverse = ""
@@ -172,24 +488,41 @@ class GameEngine:
         self.lieut_in_mount = False
         self.lieut_revealed = False
 
-        self.pict_won_count = {1: 0, 2: 0, 3: 0, 4: 0}
-        self.pict_won_cards = {1: [], 2: [], 3: [], 4: []}
+        self.pict_won_masks = [0, 0, 0, 0]
+        self.history = []
+        self.seen_mask = 0
+        self.excluded_masks = NO_EXCLUSIONS
+        self._undo = []
 
         for p in self.players:
-            p.cards = []
             p.role = "unknown"
             p.revealed_role = False
 
-        for _ in range(5):
-            self.mount.append(self.deck.pop())
-
-        for _ in range(12):
-            for p in self.players:
-                p.cards.append(self.deck.pop())
-
-        for p in self.players:
-            p.cards = sort_cards(p.cards)
-        self.mount = sort_cards(self.mount)
+        if deck is None:
+            hand_masks, mount_mask = deal_masks(self.rng)
+        else:
+            mount = []
+            for _ in range(5):
+                mount.append(self.deck.pop())
+
+            hands = [[] for _ in self.players]
+            for _ in range(12):
+                for h in hands:
+                    h.append(self.deck.pop())
+            hand_masks = [cards_to_mask(h) for h in hands]
+            mount_mask = cards_to_mask(mount)
+
+        # Walking a hand bitmask yields the sort_cards() order directly.
+        for p, m in zip(self.players, hand_masks):
+            p.cards = mask_to_cards(m)
+        self.mount = mask_to_cards(mount_mask)
+        if self.recorder is not None:
+            self.recorder.on_new_game(self, seed)
+
+    def note_bids(self, bids):
+        # Bidding is run by the caller (UI / simulator); only the record needs the bids.
+        if self.recorder is not None:
+            self.recorder.on_bids(bids)
 
     def set_declaration(self, obverse_suit: str, target: int):
         """
@@ -209,8 +542,11 @@ class GameEngine:
         self.obverse = obverse_suit
         self.target = target
         self.declaration = f"{SUIT_LABEL[self.obverse]} {self.target}"
+        self._decl_tables()
         # Next step is lieut selection in your ruleset
         self.stage = "lieut"
+        if self.recorder is not None:
+            self.recorder.on_declaration(self)
         return True, "OK"
 
     def set_lieut_card(self, c):
@@ -233,6 +569,8 @@ class GameEngine:
                     break
 
         self.stage = "exchange"
+        if self.recorder is not None:
+            self.recorder.on_lieut(self)
         return True, "OK"
 
     def do_swap(self, hand_card, mount_card):
@@ -245,13 +583,11 @@ class GameEngine:
         if mount_card not in self.mount:
             return False, "Selected mount card not in Mount."
 
-        nap.cards.remove(hand_card)
-        self.mount.remove(mount_card)
-        nap.cards.append(mount_card)
-        self.mount.append(hand_card)
-
-        nap.cards = sort_cards(nap.cards)
-        self.mount = sort_cards(self.mount)
+        swap = CARD_BIT[hand_card] | CARD_BIT[mount_card]
+        nap.cards = mask_to_cards(nap.mask ^ swap)
+        self.mount = mask_to_cards(self.mount_mask ^ swap)
+        if self.recorder is not None:
+            self.recorder.on_swap(hand_card, mount_card)
         return True, "OK"
 
     def finish_exchange(self):
@@ -268,41 +604,36 @@ class GameEngine:
         return True, "OK"
 
     def legal_moves(self, pid):
-        p = self.players[pid - 1]
-        hand = p.cards[:]
+        # Immutable tuple in id order, shared through the mask cache (mask_to_moves).
+        return mask_to_moves(self.legal_mask(pid))
+
+    def legal_mask(self, pid):
+        # Same rules as legal_moves(), as a card bitmask.
+        hand = self.players[pid - 1].mask
 
         # Turn 1: obverse-suit cards cannot be played by anyone
         if self.turn_no == 1 and self.obverse:
-            hand = [c for c in hand if is_joker(c) or suit(c) != self.obverse]
+            hand &= ~SUIT_MASK[self.obverse]
             # Turn 1: Napoleon cannot lead Joker.
             if (not self.turn_cards) and pid == self.napoleon_id:
-                hand = [c for c in hand if c != "Jo"]
+                hand &= ~JOKER_BIT
 
         if not self.turn_cards:
             return hand
 
-        lead = self.first_card
-        lead_suit = self.first_suit
-        if is_joker(lead):
-            lead_suit = self.first_suit
-
-        same = [c for c in hand if (not is_joker(c)) and suit(c) == lead_suit]
+        same = hand & SUIT_MASK.get(self.first_suit, 0)
         # Mighty (sA) exception:
         # Even when Spade is led, sA is not forced as a follow card,
         # but it is still legal to play.
-        if lead_suit == "s":
-            same_wo_mighty = [c for c in same if c != SPECIAL_MIGHTY]
-            if same_wo_mighty:
-                legal = same_wo_mighty + (["Jo"] if "Jo" in hand else [])
-                if SPECIAL_MIGHTY in hand:
-                    legal.append(SPECIAL_MIGHTY)
-                return legal
+        if self.first_suit == "s":
+            if same & ~MIGHTY_BIT:
+                return same | (hand & JOKER_BIT)
             # If the only spade is sA, follow-suit is not forced.
             # Player may play any card (including sA).
-            if SPECIAL_MIGHTY in same:
+            if same:
                 return hand
         if same:
-            return same + (["Jo"] if "Jo" in hand else [])
+            return same | (hand & JOKER_BIT)
         return hand
 
     def _pict_cards_in_turn(self):
@@ -314,23 +645,21 @@ class GameEngine:
     def _is_pict(self, c: str) -> bool:
         return is_pict(c)
 
+    def _decl_tables(self):
+        # Tables are picked at set_declaration(); re-pick if obverse was assigned directly.
+        if self._decl_obverse != self.obverse:
+            self._decl = declaration_tables(self.obverse)
+            self._decl_obverse = self.obverse
+        return self._decl
+
     def yoro_is_special_now(self):
         cards = [c for _, c in self.turn_cards]
         return (SPECIAL_MIGHTY in cards) and (SPECIAL_YORO in cards)
 
     def is_special(self, c):
-        if is_joker(c):
-            return True
-        if c == SPECIAL_MIGHTY:
-            return True
         if c == SPECIAL_YORO:
             return self.yoro_is_special_now()
-        if self.obverse:
-            if c == f"{self.obverse}J":
-                return True
-            if c == f"{reverse_suit(self.obverse)}J":
-                return True
-        return False
+        return self._decl_tables()[1].get(c, False)
 
     def eff_suit_for_sameness(self, c):
         # Joker effective suit = lead suit for that Turn
@@ -347,19 +676,15 @@ class GameEngine:
             return 4500
         if c == SPECIAL_YORO:
             return 4400 if self.yoro_is_special_now() else RANK_TO_INT["Q"]
-        if self.obverse:
-            if c == f"{self.obverse}J":
-                return 4300
-            if c == f"{reverse_suit(self.obverse)}J":
-                return 4200
+        # Obverse/reverse J come from the declaration table.
         # Joker base strength is below 2.
         # Its exceptional win condition is handled in judge_turn_winner().
-        if is_joker(c):
-            return 1
-        return card_value_basic(c)
+        v = self._decl_tables()[0].get(c)
+        return v if v is not None else card_value_basic(c)
 
     def judge_turn_winner(self):
-        cards = self.turn_cards[:]
+        score_t, special_t, forbidden = self._decl_tables()
+        cards = self.turn_cards
         lead_suit = self.first_suit
         first_is_joker = is_joker(self.first_card)
         shown_map = {pid: shown for pid, shown in self.turn_display}
@@ -369,12 +694,11 @@ class GameEngine:
         # - No special card in the turn (sA / obverse J / reverse J / sA+hQ case)
         # - All 4 cards are non-Joker and same suit
         # - No face-down shown on table
-        face_down_exists = any((shown == "BACK") for _, shown in self.turn_display)
-        obv_j = f"{self.obverse}J" if self.obverse else ""
-        rev_j = f"{reverse_suit(self.obverse)}J" if self.obverse else ""
+        face_down_exists = FACE_DOWN in shown_map.values()
         turn_cards_only = [c for _, c in cards]
-        has_forbidden_special = (SPECIAL_MIGHTY in turn_cards_only) or (obv_j in turn_cards_only) or (rev_j in turn_cards_only) or ((SPECIAL_MIGHTY in turn_cards_only) and (SPECIAL_YORO in turn_cards_only))
-        all_non_joker = all((not is_joker(c)) for c in turn_cards_only)
+        has_forbidden_special = any(c in forbidden for c in turn_cards_only)
+        yoro_now = (SPECIAL_MIGHTY in turn_cards_only) and (SPECIAL_YORO in turn_cards_only)
+        all_non_joker = "Jo" not in turn_cards_only
         same_suit_all = all_non_joker and (len({suit(c) for c in turn_cards_only}) == 1)
         # Turn-1 exception: rank-2 behaves as a normal card on the first turn.
         two_rule_active = (self.turn_no != 1) and (not first_is_joker) and (not has_forbidden_special) and same_suit_all and (not face_down_exists)
@@ -382,31 +706,38 @@ class GameEngine:
         # If Joker is led, it beats all non-special cards.
         # It still loses to special cards (sA / obverse J / reverse J / sA+hQ case).
         joker_dominant = first_is_joker and (not has_forbidden_special)
+        face_down_trump = self.obverse if not first_is_joker else None
 
         best_pid = cards[0][0]
         best_score = -10**9
         best_c = cards[0][1]
 
         for pid, c in cards:
-            if is_joker(c):
+            if c == "Jo":
                 # Joker wins when it was led and no special cards exist in this turn.
                 # Otherwise Joker is weaker than rank-2.
                 score = 4100 if joker_dominant else 1
-            elif (not self.is_special(c)):
+            elif c == SPECIAL_MIGHTY:
+                # If sA and hQ are both in this turn, hQ outranks sA.
+                score = 4350 if yoro_now else 4500
+            elif c == SPECIAL_YORO and yoro_now:
+                score = 4400
+            elif special_t.get(c, False):
+                score = score_t[c]
+            else:
                 # Face-down trump rule:
                 # If a face-down card is Obverse suit, and lead card is not Joker,
                 # it competes as trump and highest trump wins (except specials which are handled above).
-                is_face_down = (shown_map.get(pid) == FACE_DOWN)
-                if (not first_is_joker) and is_face_down and self.obverse and suit(c) == self.obverse:
-                    score = 2000 + card_value_basic(c)
-                elif suit(c) != lead_suit:
-                    score = -10000 + card_value_basic(c)
+                v = card_value_basic(c)
+                cs = suit(c)
+                if face_down_trump and cs == face_down_trump and shown_map.get(pid) == FACE_DOWN:
+                    score = 2000 + v
+                elif cs != lead_suit:
+                    score = -10000 + v
                 else:
-                    score = card_value_basic(c)
-            else:
-                score = self.strength(c)
+                    score = v
 
-            if two_rule_active and (not is_joker(c)) and rank(c) == "2":
+            if two_rule_active and rank(c) == "2":
                 score += 3000
 
             if score > best_score:
@@ -421,8 +752,7 @@ class GameEngine:
 
         picts = self._pict_cards_in_turn()
         if picts:
-            self.pict_won_count[winner_id] += len(picts)
-            self.pict_won_cards[winner_id].extend(picts)
+            self.pict_won_masks[winner_id - 1] |= cards_to_mask(picts)
 
         self.advance_leader(winner_id)
         return winner_id, win_card, two_active, picts
@@ -447,7 +777,7 @@ class GameEngine:
 
         # Check whether player has any lead-suit card in hand at the moment of play
         p = self.players[pid - 1]
-        has_lead = any((not is_joker(x)) and suit(x) == lead_suit for x in p.cards)
+        has_lead = p.mask & SUIT_MASK.get(lead_suit, 0)
 
         if not has_lead:
             return FACE_DOWN
@@ -476,8 +806,7 @@ class GameEngine:
             if pid == self.napoleon_id and (not self.turn_cards) and is_joker(c):
                 return False, "Turn 1: Napoleon cannot lead Joker."
 
-        legal = self.legal_moves(pid)
-        if c not in legal:
+        if not (self.legal_mask(pid) & CARD_BIT.get(c, 0)):
             return False, "Illegal move."
 
         if not self.turn_cards:
@@ -493,6 +822,8 @@ class GameEngine:
         if not self.turn_cards:
             shown = c
         p.cards.remove(c)
+        p.mask &= ~CARD_BIT[c]
+        self._note_play(pid, c, shown)
 
         # Reveal Lieut when Lieut card is played.
         if (not self.lieut_in_mount) and (not self.lieut_revealed) and c == self.lieut_card:
@@ -509,11 +840,13 @@ class GameEngine:
                 op.role = "coalition"
                 op.revealed_role = True
 
-        self.turn_cards.append((pid, c))
-        self.turn_display.append((pid, shown))
+        self.turn_cards.append(_TURN_ENTRY[pid][c])
+        self.turn_display.append(_TURN_ENTRY[pid][shown])
+        self.history.append((_PLAY_DOWN if shown == FACE_DOWN else _PLAY_UP)[pid][c])
 
         if len(self.turn_cards) == 4:
             had_face_down = any(sh == FACE_DOWN for _, sh in self.turn_display)
+            self._note_trick_done()
             winner_id, win_card, two_active, picts = self.award_turn()
 
             if self.turn_no >= 12:
@@ -524,6 +857,8 @@ class GameEngine:
                 self.turn_display = []
                 self.first_card = ""
                 self.first_suit = ""
+            if self.recorder is not None:
+                self.recorder.on_play(self, c, shown)
 
             return True, {
                 "turn_complete": True,
@@ -535,8 +870,141 @@ class GameEngine:
                 "shown": shown,
             }
 
+        if self.recorder is not None:
+            self.recorder.on_play(self, c, shown)
         return True, {"turn_complete": False, "had_face_down": False, "shown": shown}
 
+    # ----------------------------
+    # Make / unmake (search without copying the engine)
+    # ----------------------------
+
+    def push_move(self, pid, c):
+        """play_card() that records an undo entry; pop_move() restores the exact prior state."""
+        p = self.players[pid - 1]
+        if c not in p.cards:
+            return False, "Card not in hand."
+        idx = p.cards.index(c)
+
+        # Role flags change only when the Lieut card gets revealed by this play.
+        roles = None
+        if (not self.lieut_in_mount) and (not self.lieut_revealed) and c == self.lieut_card:
+            roles = [(op.role, op.revealed_role) for op in self.players]
+
+        # turn_cards/turn_display are kept by reference: play_card() appends to them
+        # and, at the 4th card, replaces them with fresh lists.
+        prev = (
+            self.turn_cards,
+            self.turn_display,
+            self.first_card,
+            self.first_suit,
+            self.leader_id,
+            self.turn_no,
+            self.stage,
+            self.lieut_revealed,
+            self.seen_mask,
+            self.excluded_masks,
+        )
+
+        # Search moves are never recorded.
+        recorder = self.recorder
+        self.recorder = None
+        try:
+            ok, res = self.play_card(pid, c)
+        finally:
+            self.recorder = recorder
+        if not ok:
+            return ok, res
+
+        award = (res["winner_id"], cards_to_mask(res["picts"])) if res["turn_complete"] else None
+        self._undo.append((pid, c, idx, prev, roles, award))
+        return ok, res
+
+    def pop_move(self):
+        """Undo the latest push_move(). Returns (pid, card)."""
+        pid, c, idx, prev, roles, award = self._undo.pop()
+        (
+            turn_cards,
+            turn_display,
+            self.first_card,
+            self.first_suit,
+            self.leader_id,
+            self.turn_no,
+            self.stage,
+            self.lieut_revealed,
+            self.seen_mask,
+            self.excluded_masks,
+        ) = prev
+
+        if award is not None:
+            winner_id, picts = award
+            self.pict_won_masks[winner_id - 1] &= ~picts
+
+        turn_cards.pop()
+        turn_display.pop()
+        self.history.pop()
+        self.turn_cards = turn_cards
+        self.turn_display = turn_display
+
+        if roles is not None:
+            for op, (role, revealed) in zip(self.players, roles):
+                op.role = role
+                op.revealed_role = revealed
+
+        p = self.players[pid - 1]
+        p.cards.insert(idx, c)
+        p.mask |= CARD_BIT[c]
+        return pid, c
+
+    def clone(self):
+        """Independent copy of the game state for search/sampling.
+
+        Only the flat per-game buffers are copied; play tuples and the declaration
+        tables are shared. The undo stack is not copied. The clone gets its own
+        rng continuing from the same stream state, so a seeded game replays the
+        same after a clone (an engine that never drew keeps its lazy rng).
+        """
+        e = GameEngine.__new__(GameEngine)
+        if self._rng is None:
+            e._rng = None
+        else:
+            e._rng = random.Random()
+            e._rng.setstate(self._rng.getstate())
+        e.players = [p.copy() for p in self.players]
+        e.deck = list(self.deck)
+        e._mount = list(self._mount)
+        e.mount_mask = self.mount_mask
+        e.obverse = self.obverse
+        e.target = self.target
+        e.declaration = self.declaration
+        e.lieut_card = self.lieut_card
+        e.turn_no = self.turn_no
+        e.leader_id = self.leader_id
+        e.stage = self.stage
+        e.napoleon_id = self.napoleon_id
+        e.turn_cards = list(self.turn_cards)
+        e.turn_display = list(self.turn_display)
+        e.first_card = self.first_card
+        e.first_suit = self.first_suit
+        e.lieut_id = self.lieut_id
+        e.lieut_in_mount = self.lieut_in_mount
+        e.lieut_revealed = self.lieut_revealed
+        e.pict_won_masks = list(self.pict_won_masks)
+        e.history = list(self.history)
+        e.seen_mask = self.seen_mask
+        e.excluded_masks = self.excluded_masks
+        e._decl_obverse = self._decl_obverse
+        e._decl = self._decl
+        e._undo = []
+        e.recorder = None
+        return e
+
+    def next_player_id(self) -> int:
+        if self.stage != "play":
+            return 1
+        if not self.turn_cards:
+            return self.leader_id
+        return (self.turn_cards[-1][0] % 4) + 1
+
     def turn_complete(self) -> bool:
         return len(self.turn_cards) == 0 and self.stage in {"play", "done"}
 
@@ -563,54 +1031,55 @@ class GameEngine:
 
     def _score_card_in_trick(self, pid: int, c: str, shown_code: str, lead_suit: str, first_is_joker: bool) -> int:
         # Approximate per-card trick score using only public current-trick information.
-        if c == SPECIAL_MIGHTY:
-            return 4500
-        if self.obverse:
-            if c == f"{self.obverse}J":
-                return 4300
-            if c == f"{reverse_suit(self.obverse)}J":
-                return 4200
+        score_t, special_t, forbidden = self._decl_tables()
         if c == SPECIAL_YORO:
             return 4400 if self.yoro_is_special_now() else RANK_TO_INT["Q"]
         if is_joker(c):
-            has_forbidden_special = any(
-                x in {SPECIAL_MIGHTY, f"{self.obverse}J" if self.obverse else "", f"{reverse_suit(self.obverse)}J" if self.obverse else ""}
-                for _, x in self.turn_cards
-            )
+            has_forbidden_special = any(x in forbidden for _, x in self.turn_cards)
             return 4100 if (first_is_joker and (not has_forbidden_special)) else 1
+        if special_t.get(c, False):
+            # Mighty / obverse J / reverse J
+            return score_t[c]
 
+        v = card_value_basic(c)
         if suit(c) != lead_suit:
-            return -10000 + card_value_basic(c)
+            return -10000 + v
         if (not first_is_joker) and shown_code == FACE_DOWN and self.obverse and suit(c) == self.obverse:
-            return 2000 + card_value_basic(c)
-        return card_value_basic(c)
+            return 2000 + v
+        return v
 
-    def _provisional_winner_after_play(self, pid: int, c: str):
+    def _current_trick_best(self):
+        # Public winner of the current trick so far: (pid, score), or (None, -10**9) on lead.
+        best_pid = None
+        best_score = -10**9
+        if self.turn_cards:
+            lead_suit = self.first_suit
+            first_is_joker = is_joker(self.first_card)
+            shown_map = {p: sh for p, sh in self.turn_display}
+            for p, card in self.turn_cards:
+                sh = shown_map.get(p, card)
+                sc = self._score_card_in_trick(p, card, sh, lead_suit, first_is_joker)
+                if sc > best_score:
+                    best_score = sc
+                    best_pid = p
+        return best_pid, best_score
+
+    def _provisional_winner_after_play(self, pid: int, c: str, current=None):
         # Uses current trick + candidate card only (no hidden future cards).
+        # current: optional precomputed _current_trick_best() for this trick.
         if not self.turn_cards:
             return pid, True
 
-        lead_suit = self.first_suit
-        first_is_joker = is_joker(self.first_card)
-        shown_map = {p: sh for p, sh in self.turn_display}
-        best_pid = self.turn_cards[0][0]
-        best_score = -10**9
-        for p, card in self.turn_cards:
-            sh = shown_map.get(p, card)
-            sc = self._score_card_in_trick(p, card, sh, lead_suit, first_is_joker)
-            if sc > best_score:
-                best_score = sc
-                best_pid = p
-
+        best_pid, best_score = current if current is not None else self._current_trick_best()
         cand_shown = self._shown_code_for_play(pid, c)
-        cand_score = self._score_card_in_trick(pid, c, cand_shown, lead_suit, first_is_joker)
+        cand_score = self._score_card_in_trick(pid, c, cand_shown, self.first_suit, is_joker(self.first_card))
         if cand_score > best_score:
             return pid, True
         return best_pid, False
 
     def _nap_side_pict_public(self) -> int:
         nap_ids = self._nap_side_ids()
-        return sum(self.pict_won_count[i] for i in nap_ids)
+        return sum(self.pict_count(i) for i in nap_ids)
 
     def cpu_choose(self, pid):
         legal = self.legal_moves(pid)
@@ -619,60 +1088,103 @@ class GameEngine:
         if len(legal) == 1:
             return legal[0]
 
-        my_side = self._side_of(pid)
+        nap_ids = self._nap_side_ids()
+        my_nap = pid in nap_ids
         pict_in_turn = sum(1 for _, cc in self.turn_cards if is_pict(cc))
 
         # Current public winner (before playing).
-        cur_winner = None
-        if self.turn_cards:
-            lead_suit = self.first_suit
-            first_is_joker = is_joker(self.first_card)
-            shown_map = {p: sh for p, sh in self.turn_display}
-            best_score = -10**9
-            for p, card in self.turn_cards:
-                sh = shown_map.get(p, card)
-                sc = self._score_card_in_trick(p, card, sh, lead_suit, first_is_joker)
-                if sc > best_score:
-                    best_score = sc
-                    cur_winner = p
+        current = self._current_trick_best()
+        cur_winner = current[0]
+        ally_winning = cur_winner is not None and ((cur_winner in nap_ids) == my_nap)
 
         def score(c):
             s = self._estimate_strength(c) - self._resource_cost(pid, c)
-            next_winner, can_win_now = self._provisional_winner_after_play(pid, c)
-            winner_side = self._side_of(next_winner)
-            pict_pool = pict_in_turn + (1 if is_pict(c) else 0)
+            next_winner, can_win_now = self._provisional_winner_after_play(pid, c, current)
+            same_side = (next_winner in nap_ids) == my_nap
+            c_pict = is_pict(c)
+            pict_pool = pict_in_turn + (1 if c_pict else 0)
 
             # Cooperation: keep pict cards on own side, avoid donating pict to enemy.
             if pict_pool > 0:
-                if winner_side == my_side:
+                if same_side:
                     s += 140 * pict_pool
                 else:
                     s -= 220 * pict_pool
 
             # If cannot take the trick and enemy is winning, avoid throwing pict.
-            if (not can_win_now) and is_pict(c) and winner_side != my_side:
+            if (not can_win_now) and c_pict and not same_side:
                 s -= 180
 
             # If ally already winning and no pict pressure, avoid wasteful overtakes.
-            if cur_winner is not None and self._side_of(cur_winner) == my_side and can_win_now and pict_pool == 0:
+            if ally_winning and can_win_now and pict_pool == 0:
                 if self.is_special(c):
                     s -= 90
                 else:
                     s -= 35
 
             # On lead, avoid opening with weak pict when safer low cards exist.
-            if not self.turn_cards and is_pict(c) and (not self.is_special(c)):
+            if not self.turn_cards and c_pict and (not self.is_special(c)):
                 s -= 18
 
             return s
 
         return max(legal, key=score)
 
+    # ----------------------------
+    # CPU bid / lieut / exchange
+    # ----------------------------
+
+    # Bidding heuristics live in bidding.py (imported here, as it builds on this module).
+    def bid_strength_for_suit(self, pid: int, suit_code: str) -> int:
+        from bidding import suit_scores
+
+        return suit_scores(self.players[pid - 1].mask)[SUITS.index(suit_code)]
+
+    def cpu_best_bid(self, pid: int):
+        from bidding import best_bid
+
+        s, sc, target = best_bid(self.players[pid - 1].mask)
+        return {"pid": pid, "target": target, "suit": s, "score": sc, "is_human": False}
+
+    def cpu_lieut_card(self):
+        nap = self.players[self.napoleon_id - 1]
+        nap_set = set(nap.cards)
+        # Strong rule: if Napoleon does not hold sA, always call sA as Lieut.
+        if SPECIAL_MIGHTY not in nap_set:
+            return SPECIAL_MIGHTY
+        pool = [c for c in build_deck_4p() if c not in nap_set]
+
+        def score(c: str) -> int:
+            if c == "Jo":
+                return 1000
+            r = rank(c)
+            bonus = 30 if r in PICT_RANKS else 0
+            return card_value_basic(c) + bonus
+
+        pool = sort_cards(pool)
+        return max(pool, key=score) if pool else "Jo"
+
+    def cpu_exchange(self, max_swaps=None, top_k=1, time_budget=None):
+        """Swap Napoleon's hand to the best 12 of hand + mount (exchange.py); returns the swap count.
+
+        top_k > 1 re-ranks that many best keeps by playouts within time_budget seconds.
+        """
+        if self.stage != "exchange":
+            return 0
+        nap = self.players[self.napoleon_id - 1]
+        if not nap.cards or not self.mount:
+            return 0
+
+        from exchange import EXCHANGE_BUDGET, apply_exchange, plan_exchange
+
+        budget = EXCHANGE_BUDGET if time_budget is None else time_budget
+        return apply_exchange(self, plan_exchange(self, top_k, budget), max_swaps)
+
     def score(self):
         nap_ids = self._nap_side_ids()
         coal_ids = {1, 2, 3, 4} - nap_ids
-        nap_pict = sum(self.pict_won_count[pid] for pid in nap_ids)
-        coal_pict = sum(self.pict_won_count[pid] for pid in coal_ids)
+        nap_pict = sum(self.pict_count(pid) for pid in nap_ids)
+        coal_pict = sum(self.pict_count(pid) for pid in coal_ids)
         total_pict = nap_pict + coal_pict
 
         if self.stage != "done":
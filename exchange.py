@@ -0,0 +1,238 @@
+# exchange.py
+# Napoleon (exchange) - exhaustive mount exchange for a CPU Napoleon.
+#
+# Napoleon picks up the 5 mount cards and keeps 12 of the 17. A keep set is
+# scored as  sum(card value) + shape(kept cards per suit),  so the search over
+# discard sets only updates a running total and the four suit counts. All
+# C(17, 5) = 6188 discard sets are covered depth first, over the cards in
+# ascending value order, with a branch-and-bound cut: the running total minus
+# the cheapest discards still to make, plus the best shape any completion can
+# reach, must beat the k-th best keep found so far.
+#
+# Optionally the top-k keeps are re-ranked by playouts: the hidden hands are
+# re-dealt (pimc.sample_world) and every keep is played out with cpu_choose()
+# on the same deals until the time budget runs out.
+#
+# Usage: GameEngine.cpu_exchange(top_k=EXCHANGE_TOP_K), or plan_exchange(engine).
+
+import heapq
+import itertools
+import time
+
+from engine import (
+    CARD_BIT,
+    CARD_ID,
+    PICT_RANKS,
+    SPECIAL_MIGHTY,
+    SPECIAL_YORO,
+    SUITS,
+    card_value_basic,
+    cards_to_mask,
+    is_joker,
+    mask_to_cards,
+    rank,
+    reverse_suit,
+    suit,
+)
+from pimc import sample_world
+from solver import nap_side_ids
+
+SUIT_PAIR_VALUE = 1.6  # per pair of kept cards in one suit
+EXCHANGE_BUDGET = 0.05  # seconds for the playout re-ranking
+EXCHANGE_TOP_K = 5  # keeps the app re-ranks by playouts (main.py)
+
+_SUIT_SHIFT = {s: 4 * k for k, s in enumerate(SUITS)}  # suit counts packed 4 bits each
+
+
+# ----------------------------
+# Engine / Kivy CPU heuristic
+# ----------------------------
+
+def card_value(c: str, obverse: str, target: int) -> float:
+    """Keep value of one card for a Napoleon declaring obverse / target."""
+    target = max(13, min(19, int(target or 13)))
+    aggr = target - 13  # 0..6
+
+    if c == SPECIAL_MIGHTY:
+        return 200.0
+    if obverse and c == f"{obverse}J":
+        return 185.0
+    if obverse and c == f"{reverse_suit(obverse)}J":
+        return 178.0
+    if is_joker(c):
+        return 165.0 + aggr * 3.0
+    if c == SPECIAL_YORO:
+        return 150.0
+
+    r = rank(c)
+    sv = suit(c)
+    pict_bonus = 22.0 + aggr * 6.0 if r in PICT_RANKS else 0.0
+    obv_bonus = (10.0 + aggr * 2.0) if (obverse and sv == obverse) else 0.0
+    low_offsuit_penalty = -6.0 if (r in {"2", "3", "4", "5", "6"} and sv != obverse) else 0.0
+    return card_value_basic(c) + pict_bonus + obv_bonus + low_offsuit_penalty
+
+
+def pair_shape(counts) -> float:
+    # Long suits: every pair of same-suit cards adds SUIT_PAIR_VALUE.
+    return SUIT_PAIR_VALUE * sum(n * (n - 1) // 2 for n in counts)
+
+
+# ----------------------------
+# Exhaustive search
+# ----------------------------
+
+def best_keeps(cards, value, shape=None, keep=12, top_k=1, forced_keep=(), forced_out=()):
+    """The top_k ways to keep `keep` of cards, best first: [(score, kept cards)].
+
+    score = sum(value[c] for the kept c) + shape(counts), where counts is the
+    number of kept cards per suit in SUITS order (the Joker is in none).
+    forced_keep / forced_out cards are always kept / always discarded.
+    Kept cards are in card id order; equal scores keep the earlier find.
+    """
+    forced_keep = set(forced_keep)
+    forced_out = set(c for c in cards if c in forced_out)
+    free = sorted((c for c in cards if c not in forced_keep and c not in forced_out), key=lambda c: (value[c], CARD_ID[c]))
+    n_drop = len(cards) - len(forced_out) - keep
+    if not 0 <= n_drop <= len(free):
+        raise ValueError(f"Cannot keep {keep} of {len(cards)} cards with these constraints.")
+
+    kept = [c for c in cards if c not in forced_out]
+    steps = [0 if is_joker(c) else 1 << _SUIT_SHIFT[suit(c)] for c in free]
+    code = sum(0 if is_joker(c) else 1 << _SUIT_SHIFT[suit(c)] for c in kept)
+    vals = [value[c] for c in free]
+    prefix = [0.0]
+    for v in vals:
+        prefix.append(prefix[-1] + v)
+
+    shapes = {}
+
+    def shape_of(code):
+        s = shapes.get(code)
+        if s is None:
+            s = shape(tuple((code >> sh) & 15 for sh in _SUIT_SHIFT.values())) if shape else 0.0
+            shapes[code] = s
+        return s
+
+    # Best shape over every suit-count vector a completion can reach.
+    per_suit = [sum(1 for st in steps if st == 1 << sh) for sh in _SUIT_SHIFT.values()]
+    jokers = steps.count(0)
+    shape_hi = None
+    for drops in itertools.product(*(range(min(f, n_drop) + 1) for f in per_suit)):
+        if 0 <= n_drop - sum(drops) <= jokers:
+            s = shape_of(code - sum(d << sh for d, sh in zip(drops, _SUIT_SHIFT.values())))
+            shape_hi = s if shape_hi is None else max(shape_hi, s)
+
+    n = len(free)
+    heap = []  # (score, -order, drop indices): the current top_k, worst first
+    found = itertools.count()
+
+    def search(start, left, total, code, dropped):
+        if left == 0:
+            item = (total + shape_of(code), -next(found), dropped)
+            if len(heap) < top_k:
+                heapq.heappush(heap, item)
+            elif item[0] > heap[0][0]:
+                heapq.heapreplace(heap, item)
+            return
+        for i in range(start, n - left + 1):
+            # Values ascend, so a later i can only cost more: stop here.
+            if len(heap) == top_k and total - (prefix[i + left] - prefix[i]) + shape_hi <= heap[0][0]:
+                break
+            search(i + 1, left - 1, total - vals[i], code - steps[i], dropped + (i,))
+
+    search(0, n_drop, sum(value[c] for c in kept), code, ())
+
+    out = []
+    for score, _, dropped in sorted(heap, reverse=True):
+        gone = {free[i] for i in dropped}
+        out.append((score, mask_to_cards(cards_to_mask([c for c in kept if c not in gone]))))
+    return out
+
+
+# ----------------------------
+# GameEngine
+# ----------------------------
+
+def keep_candidates(engine, top_k=1):
+    """best_keeps() for the engine's Napoleon with the engine heuristic (card_value, pair_shape)."""
+    nap = engine.players[engine.napoleon_id - 1]
+    cards = list(nap.cards) + list(engine.mount)
+    value = {c: card_value(c, engine.obverse, engine.target) for c in cards}
+    # Keep lieutenant-in-mount semantics stable: that card stays in the mount.
+    forced_out = (engine.lieut_card,) if engine.lieut_in_mount else ()
+    return best_keeps(cards, value, pair_shape, keep=len(nap.cards), top_k=top_k, forced_out=forced_out)
+
+
+def _playout(world):
+    while world.stage == "play":
+        pid = world.next_player_id()
+        world.push_move(pid, world.cpu_choose(pid))
+    return sum(world.pict_count(i) for i in nap_side_ids(world))
+
+
+def rank_by_playouts(engine, keeps, deadline, rng, max_samples=None):
+    """Mean Napoleon-side picts per keep, over shared re-deals of the hidden cards.
+
+    At least one deal is always played, and no deal is started that the last
+    one's time says would end past the deadline. Returns (means, deals played).
+    """
+    totals = [0] * len(keeps)
+    n = 0
+    while True:
+        t0 = time.perf_counter()
+        world = sample_world(engine, engine.napoleon_id, rng)
+        both = world.players[engine.napoleon_id - 1].mask | world.mount_mask
+        for k, kept in enumerate(keeps):
+            w = world.clone()
+            w.players[engine.napoleon_id - 1].cards = list(kept)
+            w.mount = mask_to_cards(both & ~cards_to_mask(kept))
+            w.finish_exchange()
+            totals[k] += _playout(w)
+        n += 1
+        if max_samples is not None and n >= max_samples:
+            break
+        now = time.perf_counter()
+        if now + (now - t0) > deadline:
+            break
+    return [t / n for t in totals], n
+
+
+def plan_exchange(engine, top_k=1, time_budget=EXCHANGE_BUDGET, max_samples=None, rng=None):
+    """Cards for the engine's Napoleon to keep (card id order).
+
+    top_k <= 1 is the exhaustive heuristic alone. Otherwise the top_k keeps are
+    re-ranked by playouts within time_budget seconds; ties go to the heuristic order.
+    """
+    deadline = time.perf_counter() + time_budget
+    keeps = [kept for _, kept in keep_candidates(engine, max(1, top_k))]
+    if len(keeps) == 1:
+        return keeps[0]
+    means, _ = rank_by_playouts(engine, keeps, deadline, rng if rng is not None else engine.rng, max_samples)
+    best = max(range(len(keeps)), key=lambda k: (means[k], -k))
+    return keeps[best]
+
+
+def apply_exchange(engine, kept, max_swaps=None):
+    """do_swap() the engine's Napoleon to the kept cards; returns the swap count.
+
+    Swaps pair the weakest leaving card with the strongest arriving one, so a
+    max_swaps cut keeps the most valuable swaps.
+    """
+    nap = engine.players[engine.napoleon_id - 1]
+    kept_mask = cards_to_mask(kept)
+
+    def value(c):
+        return card_value(c, engine.obverse, engine.target)
+
+    gone = sorted((c for c in nap.cards if not kept_mask & CARD_BIT[c]), key=value)
+    came = sorted((c for c in engine.mount if kept_mask & CARD_BIT[c]), key=value, reverse=True)
+    pairs = list(zip(gone, came))
+    if max_swaps is not None:
+        pairs = pairs[:max(0, int(max_swaps))]
+    done = 0
+    for hand_card, mount_card in pairs:
+        ok, _ = engine.do_swap(hand_card, mount_card)
+        if not ok:
+            break
+        done += 1
+    return done
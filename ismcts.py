@@ -0,0 +1,215 @@
+# ismcts.py
+# Napoleon (ISMCTS CPU) - Information Set Monte Carlo Tree Search.
+#
+# One tree per seat, built from that seat's point of view: every iteration
+# re-deals the hidden cards (pimc.sample_world), walks the tree with UCB over
+# the moves available in that deal, expands one node and finishes the game
+# with cpu_choose() playouts.
+#
+# Edges are keyed by what the seat can observe: its own cards, and the shown
+# code of other plays (a face-down play is just "BACK"). Subtrees are kept
+# between moves of the same game, and search runs in slices so the Kivy clock
+# can ask for the best move at any time.
+#
+# Usage: IsmctsPlayer(time_budget=1.0).choose(engine, pid)
+
+import math
+import time
+
+from engine import CARD_BIT
+from pimc import sample_world
+from solver import nap_side_ids
+
+
+class _Node:
+    __slots__ = ("children", "visits", "avail", "reward")
+
+    def __init__(self):
+        self.children = {}
+        self.visits = 0
+        self.avail = 0
+        self.reward = 0.0  # summed from the side of the player who moved into this node
+
+
+def _edge_key(pov, pid, c, shown):
+    return c if pid == pov else shown
+
+
+def _nap_reward(world):
+    return sum(world.pict_count(i) for i in nap_side_ids(world)) / 20.0
+
+
+class IsmctsPlayer:
+    """Anytime ISMCTS with the same entry point as cpu_choose(pid).
+
+    iterations / time_budget: per-move budget; search stops at whichever comes first.
+    exploration: UCB constant (rewards are pict shares in 0..1).
+    rng: random.Random for sampling; defaults to the engine's own stream.
+    """
+
+    def __init__(self, iterations=1000, time_budget=1.0, exploration=0.7, rng=None):
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.exploration = exploration
+        self.rng = rng
+        self.reset()
+
+    def reset(self):
+        # pid -> [root, edge keys from game start to root, iterations, seconds spent]
+        self._trees = {}
+
+    # ----------------------------
+    # Tree bookkeeping
+    # ----------------------------
+
+    def _path_keys(self, engine, pid):
+        # Deal as seen by pid (so a new game never matches an old tree), then every play.
+        # Face-down cards of finished tricks are public but stay "BACK" in the tree.
+        start = engine.players[pid - 1].mask
+        for p, c, _ in engine.history:
+            if p == pid:
+                start |= CARD_BIT[c]
+        keys = [(engine.napoleon_id, engine.obverse, engine.target, engine.lieut_card, start)]
+        keys.extend(_edge_key(pid, p, c, sh) for p, c, sh in engine.history)
+        return keys
+
+    def _root(self, engine, pid):
+        # Re-root the seat's tree at the current position, keeping the subtree if it exists.
+        keys = self._path_keys(engine, pid)
+        t = self._trees.get(pid)
+        if t is not None:
+            root, old_keys = t[0], t[1]
+            if keys == old_keys:
+                return t
+            if keys[: len(old_keys)] == old_keys:
+                node = root
+                for k in keys[len(old_keys):]:
+                    node = node.children.get(k)
+                    if node is None:
+                        break
+                if node is not None:
+                    t = [node, keys, 0, 0.0]
+                    self._trees[pid] = t
+                    return t
+        t = [_Node(), keys, 0, 0.0]
+        self._trees[pid] = t
+        return t
+
+    # ----------------------------
+    # Search
+    # ----------------------------
+
+    def _iterate(self, engine, pid, root, rng):
+        world = sample_world(engine, pid, rng)
+        node = root
+        path = []  # (node, mover pid)
+        expanded = False
+
+        while world.stage == "play":
+            mover = world.next_player_id()
+            groups = {}
+            for c in world.legal_moves(mover):
+                groups.setdefault(_edge_key(pid, mover, c, world._shown_code_for_play(mover, c)), []).append(c)
+
+            if expanded:
+                c = world.cpu_choose(mover)
+                world.play_card(mover, c)
+                continue
+
+            untried = [k for k in groups if k not in node.children]
+            for k in groups:
+                child = node.children.get(k)
+                if child is not None:
+                    child.avail += 1
+            if untried:
+                k = rng.choice(untried)
+                child = node.children[k] = _Node()
+                expanded = True
+            else:
+                ucb_c = self.exploration
+                kids = node.children
+
+                def ucb(k):
+                    ch = kids[k]
+                    return ch.reward / ch.visits + ucb_c * math.sqrt(math.log(ch.avail) / ch.visits)
+
+                k = max(groups, key=ucb)
+                child = kids[k]
+
+            cards = groups[k]
+            c = cards[0]
+            if len(cards) > 1:
+                # Several cards share one face-down edge: use the CPU's pick when it is one of them.
+                pick = world.cpu_choose(mover)
+                c = pick if pick in cards else rng.choice(cards)
+            world.play_card(mover, c)
+            path.append((child, mover))
+            node = child
+
+        nap_ids = nap_side_ids(world)
+        r = _nap_reward(world)
+        for n, mover in path:
+            n.visits += 1
+            n.reward += r if mover in nap_ids else 1.0 - r
+
+    def search(self, engine, pid, max_time=None, max_iterations=None):
+        """Run iterations for seat pid until this move's budget or the slice limit; returns the count."""
+        t = self._root(engine, pid)
+        root = t[0]
+        rng = self.rng if self.rng is not None else engine.rng
+        start = time.perf_counter()
+        limit = self.time_budget - t[3]
+        if max_time is not None:
+            limit = min(limit, max_time)
+        n = 0
+        while t[2] < self.iterations:
+            if max_iterations is not None and n >= max_iterations:
+                break
+            if n and time.perf_counter() - start >= limit:
+                break
+            self._iterate(engine, pid, root, rng)
+            t[2] += 1
+            n += 1
+        t[3] += time.perf_counter() - start
+        return n
+
+    def finished(self, engine, pid) -> bool:
+        """True when this move's iteration or time budget is used up."""
+        t = self._root(engine, pid)
+        return t[2] >= self.iterations or t[3] >= self.time_budget
+
+    def best_move(self, engine, pid):
+        """Most visited legal card at the current root (cpu_choose() before any search)."""
+        root = self._root(engine, pid)[0]
+        legal = engine.legal_moves(pid)
+        if not legal:
+            return None
+        visited = [c for c in legal if c in root.children]
+        if not visited:
+            return engine.cpu_choose(pid)
+        return max(visited, key=lambda c: (root.children[c].visits, root.children[c].reward))
+
+    def choose(self, engine, pid, stop=None):
+        """Search until the move budget is spent (or stop() turns True) and return the best card."""
+        legal = engine.legal_moves(pid)
+        if len(legal) <= 1:
+            return legal[0] if legal else None
+        while not self.finished(engine, pid):
+            if stop is None:
+                self.search(engine, pid)
+            elif stop():
+                break
+            else:
+                self.search(engine, pid, max_time=0.05)
+        return self.best_move(engine, pid)
+
+
+_default_player = None
+
+
+def ismcts_policy(engine, pid):
+    """Play policy for simulate/tournament with the default IsmctsPlayer."""
+    global _default_player
+    if _default_player is None:
+        _default_player = IsmctsPlayer()
+    return _default_player.choose(engine, pid)
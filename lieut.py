@@ -0,0 +1,134 @@
+# lieut.py
+# Napoleon (Lieut call) - picks the Lieut card by sampled playouts.
+#
+# When the Lieut card is called, Napoleon knows only their own 12 cards and the
+# declaration: the other 41 cards (3 hands and the mount) are unknown. For every
+# sample those 41 cards are dealt at random, and each candidate card is played
+# out on the same deal: set_lieut_card(), the CPU exchange (exchange.py, no
+# playouts), then cpu_choose() for every seat. A candidate's value is its mean
+# Napoleon-side pict count (Napoleon alone when the card ends up in the mount).
+#
+# Candidates are the outside cards with the best exchange.card_value(): the
+# Mighty, the Jacks, the Joker and high trumps. Results are memoized per
+# (Napoleon hand, obverse, target), so asking again for the same hand is free.
+#
+# The latency budget is strict: the deadline is checked after every playout and
+# an unfinished sample is dropped. With no finished sample the best candidate
+# by card value is called.
+#
+# Usage: LieutCaller(time_budget=0.2).call(engine), or .choose(hand, obverse, target)
+
+import random
+import time
+
+from engine import FULL_MASK, GameEngine, build_deck_4p, cards_to_mask, mask_to_cards
+from exchange import card_value
+from solver import nap_side_ids
+
+LIEUT_BUDGET = 0.2  # seconds per call
+LIEUT_CANDIDATES = 6
+LIEUT_CACHE_SIZE = 1 << 10  # memoized hands; cleared when full
+
+
+def candidate_cards(hand, obverse, target, n=LIEUT_CANDIDATES):
+    """The n outside cards with the best exchange.card_value(), best first."""
+    held = cards_to_mask(hand)
+    outside = mask_to_cards(FULL_MASK & ~held)
+    # Stable sort: equal values stay in card id order.
+    return sorted(outside, key=lambda c: -card_value(c, obverse, target))[:n]
+
+
+def _table(hand, obverse, target):
+    # Engine at the Lieut call with Napoleon in seat 1 holding hand; other hands are sampled.
+    e = GameEngine()
+    e.new_game(deck=build_deck_4p())
+    e.players[0].cards = mask_to_cards(cards_to_mask(hand))
+    ok, msg = e.set_declaration(obverse, target)
+    if not ok:
+        raise ValueError(msg)
+    return e
+
+
+def _playout(world, c):
+    world.set_lieut_card(c)
+    world.cpu_exchange()
+    world.finish_exchange()
+    while world.stage == "play":
+        pid = world.next_player_id()
+        world.push_move(pid, world.cpu_choose(pid))
+    return sum(world.pict_count(i) for i in nap_side_ids(world))
+
+
+class LieutCaller:
+    """Lieut card choice by sampled playouts, memoized per hand signature.
+
+    time_budget: seconds per call (checked after every playout).
+    max_samples: optional cap on deals per call.
+    rng: random.Random for the deals; defaults to the engine's own stream in
+    call(), or a fresh one.
+    """
+
+    def __init__(self, time_budget=LIEUT_BUDGET, max_samples=None, candidates=LIEUT_CANDIDATES, rng=None):
+        self.rng = rng
+        self.time_budget = time_budget
+        self.max_samples = max_samples
+        self.candidates = candidates
+        self.cache = {}  # (hand mask, obverse, target) -> (candidate means, samples)
+        self.last_samples = 0
+
+    def values(self, hand, obverse, target, rng=None):
+        """({candidate: mean Napoleon-side picts}, samples); empty dict with 0 samples on timeout."""
+        key = (cards_to_mask(hand), obverse, target)
+        hit = self.cache.get(key)
+        if hit is not None:
+            self.last_samples = 0
+            return hit
+
+        deadline = time.perf_counter() + self.time_budget
+        if rng is None:
+            rng = self.rng if self.rng is not None else random.Random()
+        cands = candidate_cards(hand, obverse, target, self.candidates)
+        table = _table(hand, obverse, target)
+        unseen = mask_to_cards(FULL_MASK & ~table.players[0].mask)
+        totals = dict.fromkeys(cands, 0)
+        n = 0
+        while self.max_samples is None or n < self.max_samples:
+            rng.shuffle(unseen)
+            world = table.clone()
+            for k, p in enumerate(world.players[1:]):
+                p.cards = mask_to_cards(cards_to_mask(unseen[12 * k:12 * (k + 1)]))
+            world.mount = mask_to_cards(cards_to_mask(unseen[36:]))
+            sample = {}
+            for c in cands:
+                sample[c] = _playout(world.clone(), c)
+                if time.perf_counter() >= deadline:
+                    break
+            if len(sample) < len(cands):
+                break  # out of time mid-deal: drop it
+            for c, v in sample.items():
+                totals[c] += v
+            n += 1
+            if time.perf_counter() >= deadline:
+                break
+        self.last_samples = n
+
+        if n == 0:
+            return {}, 0
+        out = ({c: v / n for c, v in totals.items()}, n)
+        if len(self.cache) >= LIEUT_CACHE_SIZE:
+            self.cache.clear()
+        self.cache[key] = out
+        return out
+
+    def choose(self, hand, obverse, target, rng=None):
+        """Lieut card to call; ties (and a timeout) go to the better card value."""
+        cands = candidate_cards(hand, obverse, target, self.candidates)
+        means, n = self.values(hand, obverse, target, rng)
+        if not n:
+            return cands[0]
+        return max(cands, key=lambda c: (means[c], -cands.index(c)))
+
+    def call(self, engine):
+        """choose() for the engine's Napoleon at the Lieut call."""
+        rng = self.rng if self.rng is not None else engine.rng
+        return self.choose(engine.players[engine.napoleon_id - 1].cards, engine.obverse, engine.target, rng)
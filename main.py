@@ -1,10 +1,10 @@
 ﻿import os
-import random
 import time
 
 from kivy.app import App
 from kivy.clock import Clock
 from kivy.core.window import Window
+from kivy.graphics import Color, Rectangle
 from kivy.metrics import dp
 from kivy.properties import NumericProperty, StringProperty
 from kivy.utils import platform
@@ -24,28 +24,50 @@ from engine import (
     SPECIAL_YORO,
     SUIT_LABEL,
     SUIT_LABEL_INV,
-    SUITS,
     GameEngine,
+    bid_key,
     build_deck_4p,
     card_to_filename,
     is_joker,
     rank,
     reverse_suit,
-    sort_cards,
     suit,
 )
+from cpu_worker import CpuWorker
+from exchange import EXCHANGE_TOP_K, apply_exchange, plan_exchange
+from ismcts import IsmctsPlayer
+from lieut import LieutCaller
+from records import GameRecorder, RecordWriter
+from textures import CardTextures
 
 
 CARD_DIR = os.path.join(os.path.dirname(__file__), "Cards")
 
+# CPU play: ISMCTS thinking per move, run on a worker thread (cpu_worker.py).
+CPU_THINK_SEC = 0.8
+CPU_ITERATIONS = 600
+
+
+# Card images come from the atlas built by build_atlas.py when it exists (one
+# texture for every card), otherwise from the separate PNG files.
+CARD_ATLAS = os.path.join(CARD_DIR, "cards.atlas")
+USE_CARD_ATLAS = os.path.exists(CARD_ATLAS)
+CARD_IMAGES = build_deck_4p() + [FACE_DOWN]  # every card code with an image
+_card_paths = {}  # card code -> image source ("" if none); resolved once per card
+
 
 def card_img_path(c: str) -> str:
-    if c == FACE_DOWN:
-        p = os.path.join(CARD_DIR, "back.png")
-        return p if os.path.exists(p) else ""
-    fn = card_to_filename(c)
-    p = os.path.join(CARD_DIR, fn)
-    return p if os.path.exists(p) else ""
+    p = _card_paths.get(c)
+    if p is None:
+        fn = "back.png" if c == FACE_DOWN else card_to_filename(c)
+        if USE_CARD_ATLAS:
+            base = os.path.splitext(CARD_ATLAS)[0].replace(os.sep, "/")
+            p = f"atlas://{base}/{os.path.splitext(fn)[0]}"
+        else:
+            p = os.path.join(CARD_DIR, fn)
+            p = p if os.path.exists(p) else ""
+        _card_paths[c] = p
+    return p
 
 
 def pretty_card(c: str) -> str:
@@ -67,13 +89,23 @@ def make_card_code(suit_label: str, rank_label: str) -> str:
     return f"{s}{r}"
 
 
+CARD_BG = (1, 1, 1, 1)
+CARD_BG_SELECTED = (0.72, 0.85, 1.0, 1.0)
+
+
 class CardButton(Button):
     card_code = StringProperty("")
     wdp = NumericProperty(dp(42))
     hdp = NumericProperty(dp(63))
+    textures = None  # CardTextures shared by every card button (set by Root)
 
     def __init__(self, card_code: str, on_tap, selected: bool = False, wdp=None, hdp=None, **kwargs):
         super().__init__(**kwargs)
+        # Face drawn from a scaled texture (textures.py) over the Button background.
+        with self.canvas.before:
+            self._tint = Color(1, 1, 1, 0)
+            self._face = Rectangle(pos=self.pos, size=self.size)
+        self.bind(pos=self._place_face, size=self._place_face)
         self.card_code = card_code
         self._on_tap = on_tap
         self.size_hint = (None, None)
@@ -83,31 +115,63 @@ class CardButton(Button):
             self.hdp = hdp
         self.size = (self.wdp, self.hdp)
         self.border = (0, 0, 0, 0)
-        self.background_color = (0.72, 0.85, 1.0, 1.0) if selected else (1, 1, 1, 1)
+        self._bg = CARD_BG_SELECTED if selected else CARD_BG
         self.text = ""
         self.always_release = True
         self.reload_source()
 
+    def update(self, card_code: str, on_tap, selected: bool = False, wdp=None, hdp=None):
+        # Reuse for another card (Root.refresh pools): only changed properties are set.
+        self._on_tap = on_tap
+        reload = card_code != self.card_code
+        if reload:
+            self.card_code = card_code
+        bg = CARD_BG_SELECTED if selected else CARD_BG
+        if bg != self._bg:
+            self._bg = bg
+            self._apply_bg()
+        if wdp is not None and wdp != self.wdp:
+            self.wdp = wdp
+            reload = reload or self.textures is not None
+        if hdp is not None and hdp != self.hdp:
+            self.hdp = hdp
+            reload = reload or self.textures is not None
+        if tuple(self.size) != (self.wdp, self.hdp):
+            self.size = (self.wdp, self.hdp)
+        if reload:
+            self.reload_source()
+
     def on_press(self):
         if self._on_tap:
             self._on_tap(self.card_code)
 
-    def reload_source(self):
-        p = card_img_path(self.card_code)
-        if p:
-            self.background_normal = p
-            self.background_down = p
-            self.background_disabled_normal = p
-            self.background_disabled_down = p
+    def _place_face(self, *_):
+        self._face.pos = self.pos
+        self._face.size = self.size
+
+    def _apply_bg(self):
+        # The selection color tints the face texture when there is one.
+        if self._face.texture is not None:
+            self._tint.rgba = self._bg
+            self.background_color = (0, 0, 0, 0)
         else:
-            self.background_normal = ""
-            self.background_down = ""
-            self.background_disabled_normal = ""
-            self.background_disabled_down = ""
-            self.text = pretty_card(self.card_code)
+            self._tint.a = 0
+            self.background_color = self._bg
+
+    def reload_source(self):
+        tex = self.textures.get(self.card_code, self.wdp, self.hdp) if self.textures is not None else None
+        self._face.texture = tex
+        p = "" if tex is not None else card_img_path(self.card_code)
+        self.background_normal = p
+        self.background_down = p
+        self.background_disabled_normal = p
+        self.background_disabled_down = p
+        self.text = "" if (tex is not None or p) else pretty_card(self.card_code)
+        self._apply_bg()
 
 
 class TableCell(BoxLayout):
+    # One per seat, kept for the whole session; set_card() swaps the card / "-" placeholder.
     def __init__(self, pid: int, card_code: str, wdp, hdp, **kwargs):
         super().__init__(orientation="vertical", spacing=dp(2), **kwargs)
         self.size_hint = (1, 1)
@@ -116,12 +180,26 @@ class TableCell(BoxLayout):
         lab.bind(size=lambda *_: setattr(lab, "text_size", lab.size))
         self.add_widget(lab)
 
-        slot = AnchorLayout(anchor_x="center", anchor_y="center")
+        self.slot = AnchorLayout(anchor_x="center", anchor_y="center")
+        self.card = None  # CardButton, made on the first card
+        self.blank = Button(text="-", disabled=True, size_hint=(None, None), size=(wdp, hdp))
+        self.add_widget(self.slot)
+        self.set_card(card_code, wdp, hdp)
+
+    def set_card(self, card_code: str, wdp, hdp):
         if card_code:
-            slot.add_widget(CardButton(card_code, None, wdp=wdp, hdp=hdp))
+            if self.card is None:
+                self.card = CardButton(card_code, None, wdp=wdp, hdp=hdp)
+            else:
+                self.card.update(card_code, None, wdp=wdp, hdp=hdp)
+            shown = self.card
         else:
-            slot.add_widget(Button(text="-", disabled=True, size_hint=(None, None), size=(wdp, hdp)))
-        self.add_widget(slot)
+            if tuple(self.blank.size) != (wdp, hdp):
+                self.blank.size = (wdp, hdp)
+            shown = self.blank
+        if shown.parent is None:
+            self.slot.clear_widgets()
+            self.slot.add_widget(shown)
 
 
 class FinalResultModal(ModalView):
@@ -229,6 +307,13 @@ class Root(BoxLayout):
 
         self.cpu_running = False
         self.cpu_event = None
+        # The player, its trees and the Lieut caller's memo are only touched from the worker thread.
+        self.cpu_player = IsmctsPlayer(iterations=CPU_ITERATIONS, time_budget=CPU_THINK_SEC)
+        self.cpu_worker = CpuWorker(self.cpu_player.choose)
+        self.lieut_caller = LieutCaller()
+        # Card faces at their on-screen size (textures.py); sizes follow compute_card_sizes().
+        self.card_textures = CardTextures(card_img_path)
+        CardButton.textures = self.card_textures
 
         self.hand_w = dp(32)
         self.hand_h = dp(48)
@@ -304,6 +389,9 @@ class Root(BoxLayout):
         self.table_label.bind(size=lambda *_: setattr(self.table_label, "text_size", self.table_label.size))
         self.add_widget(self.table_label)
         self.table = GridLayout(cols=4, spacing=dp(2), size_hint_y=None, height=dp(62))
+        self.table_cells = [TableCell(pid, "", self.table_w, self.table_h) for pid in (1, 2, 3, 4)]
+        for cell in self.table_cells:
+            self.table.add_widget(cell)
         self.add_widget(self.table)
         self.table_gap_bottom = Widget(size_hint_y=None, height=dp(8))
         self.add_widget(self.table_gap_bottom)
@@ -317,6 +405,7 @@ class Root(BoxLayout):
         self.mount_head.add_widget(self.log)
         self.add_widget(self.mount_head)
         self.mount_grid = GridLayout(cols=5, spacing=dp(2), size_hint_y=None, height=dp(50))
+        self.mount_pool = []  # CardButtons reused by refresh() (_sync_cards)
         self.add_widget(self.mount_grid)
 
         self.hand_label = Label(text="Your Hand", size_hint_y=None, height=self.label_h, halign="left", valign="middle")
@@ -326,6 +415,7 @@ class Root(BoxLayout):
         self.add_widget(self.hand_gap)
         self.hand_wrap = AnchorLayout(anchor_x="center", anchor_y="center", size_hint=(1, None), height=dp(56))
         self.hand_grid = GridLayout(cols=12, spacing=dp(2), size_hint=(None, None), height=dp(56), width=dp(360))
+        self.hand_pool = []
         self.hand_wrap.add_widget(self.hand_grid)
         self.add_widget(self.hand_wrap)
 
@@ -450,6 +540,9 @@ class Root(BoxLayout):
         # Table cards use the same size as hand cards.
         self.table_w = cw
         self.table_h = ch
+        self.card_textures.set_sizes(
+            [(self.hand_w, self.hand_h), (self.mount_w, self.mount_h), (self.table_w, self.table_h)], CARD_IMAGES
+        )
 
         self.status.height = self.status_h
         self.bid_wrap.height = self.panel_h
@@ -584,11 +677,7 @@ class Root(BoxLayout):
         return msgs
 
     def next_player_id(self) -> int:
-        if self.engine.stage != "play":
-            return 1
-        if not self.engine.turn_cards:
-            return self.engine.leader_id
-        return (self.engine.turn_cards[-1][0] % 4) + 1
+        return self.engine.next_player_id()
 
     def _show_lieut_panel(self, show: bool):
         self.lieut_panel.opacity = 1.0 if show else 0.0
@@ -675,161 +764,80 @@ class Root(BoxLayout):
         if self.cpu_event is not None:
             self.cpu_event.cancel()
             self.cpu_event = None
+        self.cpu_worker.cancel()
         self.cpu_running = False
 
         self.append_log("Game ready. Declare first.")
         self.refresh()
 
-    def _bid_strength_for_suit(self, pid: int, suit_code: str) -> int:
-        hand = self.engine.players[pid - 1].cards[:]
-        score = 0
-        suit_count = 0
-        for c in hand:
-            if c == "Jo":
-                score += 5
-                continue
-            r = rank(c)
-            if suit(c) == suit_code:
-                suit_count += 1
-                score += 2
-                score += {"A": 6, "K": 5, "Q": 4, "J": 3, "0": 2}.get(r, 0)
-            elif r in {"A", "K"}:
-                score += 1
-
-        if suit_count >= 6:
-            score += 3
-        elif suit_count >= 5:
-            score += 2
-        elif suit_count >= 4:
-            score += 1
-        return score
-
-    def _cpu_best_bid(self, pid: int):
-        best = {"pid": pid, "target": 13, "suit": "s", "score": -10**9, "is_human": False}
-        for s in SUITS:
-            sc = self._bid_strength_for_suit(pid, s)
-            if sc > best["score"]:
-                best["score"] = sc
-                best["suit"] = s
-
-        sc = best["score"]
-        if sc >= 41:
-            best["target"] = 19
-        elif sc >= 37:
-            best["target"] = 18
-        elif sc >= 33:
-            best["target"] = 17
-        elif sc >= 29:
-            best["target"] = 16
-        elif sc >= 23:
-            best["target"] = 15
-        elif sc >= 17:
-            best["target"] = 14
+    def _submit_napoleon_job(self, decide, on_result):
+        # Napoleon's decision (Lieut call, exchange) on the CPU worker; on_result(job) runs on the Clock.
+        self.cpu_worker.submit(
+            self.engine,
+            self.engine.napoleon_id,
+            lambda job: Clock.schedule_once(lambda _dt: self._on_napoleon_job(job, on_result)),
+            decide=decide,
+        )
+
+    def _on_napoleon_job(self, job, on_result):
+        if not self.cpu_worker.claim(job):
+            return
+        if self.engine.stage != job.stage:
+            return  # the game moved on while thinking
+        on_result(job)
+
+    def _decide_lieut(self, engine, _pid, _stop):
+        # Worker thread only: the caller's memo is not locked.
+        return self.lieut_caller.call(engine)
+
+    def _lieut_result(self, job):
+        if job.error is not None:
+            self.append_log(f"CPU lieut think failed: {job.error}")
+            return self.engine.cpu_lieut_card()
+        return job.card
+
+    def _on_auto_lieut(self, job):
+        ok, msg = self.engine.set_lieut_card(self._lieut_result(job))
+        if not ok:
+            self.append_log(f"CPU lieut failed: {msg}")
+            self.refresh()
+            return
+        self._auto_progress_cpu_napoleon()
+        self.refresh()
+
+    def _decide_exchange(self, engine, _pid, _stop):
+        return plan_exchange(engine, top_k=EXCHANGE_TOP_K)
+
+    def _apply_cpu_exchange(self, job):
+        # job.card is the keep planned on the snapshot; apply_exchange() swaps toward it from the live hand.
+        if job.error is not None:
+            self.append_log(f"CPU exchange think failed: {job.error}")
+            self.engine.cpu_exchange(max_swaps=None)
         else:
-            best["target"] = 13
-        return best
+            apply_exchange(self.engine, job.card)
+        return self.engine.finish_exchange()
 
-    def _bid_key(self, b: dict):
-        suit_power = {"s": 4, "h": 3, "d": 2, "c": 1}.get(b.get("suit", ""), 0)
-        # target > suit strength > hand score > human priority
-        return (b.get("target", 13), suit_power, b.get("score", 0), 1 if b.get("is_human") else 0)
+    def _on_auto_exchange(self, job):
+        ok, msg = self._apply_cpu_exchange(job)
+        if not ok:
+            self.append_log(f"CPU FinishEx failed: {msg}")
+            self.refresh()
+            return
+        self._auto_progress_cpu_napoleon()
+        self.refresh()
 
     def _auto_progress_cpu_napoleon(self):
         if self.engine.stage == "lieut" and self.engine.napoleon_id != 1:
-            c = self._auto_lieut_card()
-            ok, msg = self.engine.set_lieut_card(c)
-            if not ok:
-                self.append_log(f"CPU lieut failed: {msg}")
-                return
+            if self.cpu_worker.job is None:
+                self._submit_napoleon_job(self._decide_lieut, self._on_auto_lieut)
+            return
         if self.engine.stage == "exchange" and self.engine.napoleon_id != 1:
-            self._cpu_exchange_smart(max_swaps=None)
-            ok, msg = self.engine.finish_exchange()
-            if not ok:
-                self.append_log(f"CPU FinishEx failed: {msg}")
-                return
+            if self.cpu_worker.job is None:
+                self._submit_napoleon_job(self._decide_exchange, self._on_auto_exchange)
+            return
         if self.engine.stage == "play" and self.engine.napoleon_id != 1:
             self.start_cpu_until_human(immediate=True)
 
-    def _cpu_card_exchange_score(self, c: str, suit_counts: dict) -> float:
-        # Evaluate card strength from Napoleon-side perspective during exchange.
-        obv = self.engine.obverse
-        target = max(13, min(19, int(self.engine.target or 13)))
-        aggr = target - 13  # 0..6
-
-        obv_j = f"{obv}J" if obv else ""
-        rev_j = f"{reverse_suit(obv)}J" if obv else ""
-
-        if c == SPECIAL_MIGHTY:
-            return 200.0
-        if c == obv_j:
-            return 185.0
-        if c == rev_j:
-            return 178.0
-        if c == "Jo":
-            return 165.0 + aggr * 3.0
-        if c == SPECIAL_YORO:
-            return 150.0
-
-        r = rank(c)
-        sv = suit(c)
-        rank_v = {"2": 2, "3": 3, "4": 4, "5": 5, "6": 6, "7": 7, "8": 8, "9": 9, "0": 10, "J": 11, "Q": 12, "K": 13, "A": 14}.get(r, 0)
-        pict_bonus = 22.0 + aggr * 6.0 if r in {"0", "J", "Q", "K", "A"} else 0.0
-        obv_bonus = (10.0 + aggr * 2.0) if (obv and sv == obv) else 0.0
-        suit_len_bonus = suit_counts.get(sv, 0) * 1.6
-        low_offsuit_penalty = -6.0 if (r in {"2", "3", "4", "5", "6"} and (not obv or sv != obv)) else 0.0
-        return rank_v + pict_bonus + obv_bonus + suit_len_bonus + low_offsuit_penalty
-
-    def _cpu_exchange_smart(self, max_swaps=None):
-        if self.engine.stage != "exchange":
-            return 0
-        nap = self.engine.players[self.engine.napoleon_id - 1]
-        if not nap.cards or not self.engine.mount:
-            return 0
-
-        swaps_done = 0
-        threshold = 2.5
-        # If max_swaps is None, keep swapping until no further improvement.
-        if max_swaps is None:
-            max_swaps = 64  # safety guard only
-        max_swaps = max(0, int(max_swaps))
-
-        while swaps_done < max_swaps:
-            if not nap.cards or not self.engine.mount:
-                break
-
-            suit_counts = {s: 0 for s in SUITS}
-            for hc in nap.cards:
-                if hc != "Jo":
-                    suit_counts[suit(hc)] += 1
-
-            hand_scores = sorted(
-                [(self._cpu_card_exchange_score(hc, suit_counts), hc) for hc in nap.cards],
-                key=lambda x: x[0],
-            )
-
-            mount_candidates = []
-            for mc in self.engine.mount:
-                # Keep lieutenant-in-mount semantics stable.
-                if self.engine.lieut_in_mount and mc == self.engine.lieut_card:
-                    continue
-                mount_candidates.append((self._cpu_card_exchange_score(mc, suit_counts), mc))
-            mount_scores = sorted(mount_candidates, key=lambda x: x[0], reverse=True)
-
-            if not hand_scores or not mount_scores:
-                break
-
-            worst_hand_score, worst_hand = hand_scores[0]
-            best_mount_score, best_mount = mount_scores[0]
-            if best_mount_score <= worst_hand_score + threshold:
-                break
-
-            ok, _ = self.engine.do_swap(worst_hand, best_mount)
-            if not ok:
-                break
-            swaps_done += 1
-
-        return swaps_done
-
     def _finalize_bid(self, bid: dict):
         self.pending_cpu_bid = None
         self.engine.napoleon_id = bid["pid"]
@@ -861,14 +869,15 @@ class Root(BoxLayout):
             "pid": 1,
             "target": target,
             "suit": suit_code,
-            "score": self._bid_strength_for_suit(1, suit_code),
+            "score": self.engine.bid_strength_for_suit(1, suit_code),
             "is_human": True,
         }
 
         # If a CPU bid is pending, Human may re-declare repeatedly until overtaking.
         if self.pending_cpu_bid is not None:
             cpu_bid = self.pending_cpu_bid
-            if self._bid_key(human_bid) >= self._bid_key(cpu_bid):
+            self.engine.note_bids([human_bid])
+            if bid_key(human_bid) >= bid_key(cpu_bid):
                 self._finalize_bid(human_bid)
             else:
                 cpu_suit = SUIT_LABEL.get(cpu_bid["suit"], "Spade")
@@ -879,15 +888,16 @@ class Root(BoxLayout):
             self.refresh()
             return
 
-        bids = [human_bid] + [self._cpu_best_bid(pid) for pid in (2, 3, 4)]
-        winner = max(bids, key=self._bid_key)
+        bids = [human_bid] + [self.engine.cpu_best_bid(pid) for pid in (2, 3, 4)]
+        self.engine.note_bids(bids)
+        winner = max(bids, key=bid_key)
         if winner["pid"] == 1:
             self._finalize_bid(winner)
             self.refresh()
             return
 
         # Keep CPU best bid pending; Human can re-declare any number of times.
-        cpu_best = max([b for b in bids if b["pid"] != 1], key=self._bid_key)
+        cpu_best = max([b for b in bids if b["pid"] != 1], key=bid_key)
         self.pending_cpu_bid = cpu_best
         cpu_suit = SUIT_LABEL.get(cpu_best["suit"], "Spade")
         self.append_log(
@@ -896,25 +906,6 @@ class Root(BoxLayout):
         )
         self.refresh()
 
-    def _auto_lieut_card(self):
-        nap = self.engine.players[self.engine.napoleon_id - 1]
-        nap_set = set(nap.cards)
-        # Strong rule: if Napoleon does not hold sA, always call sA as Lieut.
-        if SPECIAL_MIGHTY not in nap_set:
-            return SPECIAL_MIGHTY
-        pool = [c for c in build_deck_4p() if c not in nap_set]
-
-        def score(c: str) -> int:
-            if c == "Jo":
-                return 1000
-            r = rank(c)
-            rv = {"2": 2, "3": 3, "4": 4, "5": 5, "6": 6, "7": 7, "8": 8, "9": 9, "0": 10, "J": 11, "Q": 12, "K": 13, "A": 14}.get(r, 0)
-            bonus = 30 if r in {"A", "K", "Q", "J", "0"} else 0
-            return rv + bonus
-
-        pool = sort_cards(pool)
-        return max(pool, key=score) if pool else "Jo"
-
     def on_set_lieut(self, *_):
         if self.engine.stage != "lieut":
             self.append_log("Not in lieut stage.")
@@ -934,7 +925,12 @@ class Root(BoxLayout):
             self.append_log("Not in lieut stage.")
             self.refresh()
             return
-        c = self._auto_lieut_card()
+        if self.cpu_worker.job is None:
+            self._submit_napoleon_job(self._decide_lieut, self._on_human_auto_lieut)
+        self.refresh()
+
+    def _on_human_auto_lieut(self, job):
+        c = self._lieut_result(job)
         ok, msg = self.engine.set_lieut_card(c)
         if ok:
             self.append_log(f"Lieut auto: {pretty_card(c)}")
@@ -1077,7 +1073,26 @@ class Root(BoxLayout):
             self.refresh()
             return
 
-        c = self.engine.cpu_choose(pid)
+        if self.cpu_worker.job is not None:
+            return
+        # Think on a snapshot off the UI thread; the card comes back through the Clock.
+        self.cpu_worker.submit(self.engine, pid, lambda job: Clock.schedule_once(lambda _dt: self._on_cpu_move(job)))
+
+    def _on_cpu_move(self, job):
+        if not self.cpu_worker.claim(job):
+            return
+        if not self.cpu_running:
+            return
+        if self.engine.stage != "play" or len(self.engine.history) != job.ply:
+            # The position moved on while thinking; decide again.
+            self.cpu_event = Clock.schedule_once(self._cpu_step, 0)
+            return
+
+        pid = job.pid
+        c = job.card
+        if job.error is not None:
+            self.append_log(f"CPU P{pid} think failed: {job.error}")
+            c = self.engine.cpu_choose(pid)
         if c is None:
             self.cpu_running = False
             self.append_log(f"CPU P{pid} no legal move.")
@@ -1120,19 +1135,13 @@ class Root(BoxLayout):
             return
 
         if st == "lieut" and self.engine.napoleon_id != 1:
-            c = self._auto_lieut_card()
-            ok, _ = self.engine.set_lieut_card(c)
-            if ok:
-                self.append_log("CPU lieut set.")
-                self.refresh()
+            if self.cpu_worker.job is None:
+                self._submit_napoleon_job(self._decide_lieut, self._on_cpu_lieut)
             return
 
         if st == "exchange" and self.engine.napoleon_id != 1:
-            self._cpu_exchange_smart(max_swaps=None)
-            ok, msg = self.engine.finish_exchange()
-            self.append_log("CPU exchange done." if ok else f"CPU FinishEx failed: {msg}")
-            self.refresh()
-            self.start_cpu_until_human(immediate=True)
+            if self.cpu_worker.job is None:
+                self._submit_napoleon_job(self._decide_exchange, self._on_cpu_exchange)
             return
 
         if st == "play":
@@ -1143,6 +1152,18 @@ class Root(BoxLayout):
         if st == "done":
             self.refresh()
 
+    def _on_cpu_lieut(self, job):
+        ok, _ = self.engine.set_lieut_card(self._lieut_result(job))
+        if ok:
+            self.append_log("CPU lieut set.")
+            self.refresh()
+
+    def _on_cpu_exchange(self, job):
+        ok, msg = self._apply_cpu_exchange(job)
+        self.append_log("CPU exchange done." if ok else f"CPU FinishEx failed: {msg}")
+        self.refresh()
+        self.start_cpu_until_human(immediate=True)
+
     def _schedule_final_result_after(self, delay_sec: float):
         if self.final_result_logged:
             return
@@ -1265,6 +1286,20 @@ class Root(BoxLayout):
         for c in coal_cards:
             self.result_coal_grid.add_widget(CardButton(c, None, wdp=self.mount_w, hdp=self.mount_h))
 
+    def _sync_cards(self, grid, pool, cards, on_tap, selected, wdp, hdp):
+        # Show cards in grid with its pooled CardButtons instead of rebuilding them:
+        # pool[:len(cards)] are the grid's children, in order; the rest are detached.
+        for i, c in enumerate(cards):
+            if i < len(pool):
+                pool[i].update(c, on_tap, selected=(selected == c), wdp=wdp, hdp=hdp)
+            else:
+                pool.append(CardButton(c, on_tap, selected=(selected == c), wdp=wdp, hdp=hdp))
+            if pool[i].parent is None:
+                grid.add_widget(pool[i])
+        for b in pool[len(cards):]:
+            if b.parent is not None:
+                grid.remove_widget(b)
+
     def refresh(self):
         st = self.engine.stage
         self._sync_selection_validity()
@@ -1289,7 +1324,8 @@ class Root(BoxLayout):
             self.table_label.opacity = 0.0
             self.table.opacity = 0.0
             self.table.disabled = True
-            self.table.clear_widgets()
+            for cell in self.table_cells:
+                cell.set_card("", self.table_w, self.table_h)
         else:
             self.table_label.opacity = 1.0
             self.table.opacity = 1.0
@@ -1311,12 +1347,10 @@ class Root(BoxLayout):
                 pairs = self.turn_snapshot
 
             shown = {pid: c for pid, c in pairs}
-            self.table.clear_widgets()
-            for pid in (1, 2, 3, 4):
-                self.table.add_widget(TableCell(pid, shown.get(pid, ""), self.table_w, self.table_h))
+            for pid, cell in enumerate(self.table_cells, 1):
+                cell.set_card(shown.get(pid, ""), self.table_w, self.table_h)
 
         # Mount
-        self.mount_grid.clear_widgets()
         if st == "exchange":
             mount = list(getattr(self.engine, "mount", []))
             self.mount_label.text = f"Mount({len(mount)})"
@@ -1325,11 +1359,9 @@ class Root(BoxLayout):
             self.mount_grid.opacity = 1.0
             self.mount_grid.disabled = False
             self.mount_grid.cols = max(1, len(mount))
-            for c in mount:
-                self.mount_grid.add_widget(
-                    CardButton(c, self._on_mount_tap, selected=(self.selected_mount == c), wdp=self.mount_w, hdp=self.mount_h)
-                )
+            self._sync_cards(self.mount_grid, self.mount_pool, mount, self._on_mount_tap, self.selected_mount, self.mount_w, self.mount_h)
         else:
+            self._sync_cards(self.mount_grid, self.mount_pool, [], None, None, self.mount_w, self.mount_h)
             self.mount_label.text = ""
             self.mount_label.height = self.label_h
             self.mount_grid.height = 0
@@ -1338,14 +1370,10 @@ class Root(BoxLayout):
             self.mount_grid.cols = 5
 
         # Hand
-        self.hand_grid.clear_widgets()
         hand = self.engine.players[0].cards[:]
         self.hand_label.text = f"Your Hand({len(hand)})"
         self.hand_grid.cols = max(1, len(hand))
-        for c in hand:
-            self.hand_grid.add_widget(
-                CardButton(c, self._on_hand_tap, selected=(self.selected_hand == c), wdp=self.hand_w, hdp=self.hand_h)
-            )
+        self._sync_cards(self.hand_grid, self.hand_pool, hand, self._on_hand_tap, self.selected_hand, self.hand_w, self.hand_h)
 
         # Final stage handling: show revealed final turn first, then open modal result.
         if done and not self.final_result_logged and self.final_result_due_at == 0.0:
@@ -1362,7 +1390,10 @@ class NapoleonApp(App):
         if platform not in {"android", "ios"}:
             # Pixel 9a logical size (portrait ~412x915 dp) in landscape.
             Window.size = (915, 412)
-        return Root()
+        root = Root()
+        # Every game played in the app is appended to the local record file.
+        root.engine.recorder = GameRecorder(RecordWriter(os.path.join(self.user_data_dir, "games.napr")))
+        return root
 
     def on_start(self):
         if platform == "android":
@@ -1373,6 +1404,11 @@ class NapoleonApp(App):
         if os.path.exists(icon_path):
             self.icon = icon_path
 
+    def on_stop(self):
+        recorder = self.root.engine.recorder if self.root is not None else None
+        if recorder is not None:
+            recorder.close()
+
 
 if __name__ == "__main__":
     NapoleonApp().run()
@@ -43,10 +43,17 @@
 import os
 import random
 import datetime
+import threading
+from collections import OrderedDict
 import tkinter as tk
 from tkinter import ttk, messagebox
 from PIL import Image, ImageTk
 
+from bidding import hand_strength_score, is_declaration_hand
+from engine import cards_to_mask
+from exchange import best_keeps
+from lieut import LieutCaller
+
 
 # ----------------------------
 # Card utilities
@@ -139,42 +146,121 @@ def card_to_filename(c: str) -> str:
     return f"{r}_of_{suit_word}.png"
 
 
+CARD_IMAGE_CACHE = 256  # PhotoImages kept, over every size
+BACK_KEY = "BACK"
+CARD_SCALE = 0.1  # card image scale at the default 1400x820 window
+RESCALE_DELAY_MS = 200  # wait for the window to settle before rescaling cards
+
+
+def card_scale_for(width: int, height: int) -> float:
+    """Card image scale for a window size, in 0.005 steps (0.08..0.14)."""
+    fit = min(width / 1400, height / 820)
+    return min(0.14, max(0.08, round(CARD_SCALE * fit / 0.005) * 0.005))
+
+
 class CardImages:
-    def __init__(self, base_dir: str, scale: float = 0.1):
+    """Card PhotoImages keyed by (card, pixel size), least recently used dropped first.
+
+    warm() decodes and resizes with PIL on a background thread; the PhotoImage
+    itself is made on the Tk thread in get(). set_scale() switches the size
+    (the window was resized) and warms the new size. Widgets keep their own
+    reference (lbl.image), so an evicted image stays on screen until redrawn.
+    """
+
+    def __init__(self, base_dir: str, scale: float = CARD_SCALE, max_items: int = CARD_IMAGE_CACHE):
         self.base_dir = base_dir
-        self.scale = scale
-        self.cache = {}
+        self.max_items = max_items
+        self.cache = OrderedDict()  # (card, size) -> PhotoImage
+        self._ready = {}  # (card, size) -> resized PIL image from the warm thread
+        self._lock = threading.Lock()
+        self._warm_gen = 0  # bumped by set_scale() to stop a stale warm thread
         self.missing = self._make_missing()
-        self.back = self._load_special("back.png")
+        self.card_size = self._card_size()
+        self.scale = scale
+        self.size = self._size_for(scale)
 
     def _make_missing(self):
         img = Image.new("RGBA", (120, 160), (200, 200, 200, 255))
         return ImageTk.PhotoImage(img)
 
-    def _load_special(self, fn: str):
-        path = os.path.join(self.base_dir, fn)
+    def _path(self, c: str) -> str:
+        fn = "back.png" if c == BACK_KEY else card_to_filename(c)
+        return os.path.join(self.base_dir, fn)
+
+    def _card_size(self):
+        # All card files share one size; read from the back without decoding it.
+        try:
+            with Image.open(self._path(BACK_KEY)) as img:
+                return img.size
+        except OSError:
+            return (500, 726)
+
+    def _size_for(self, scale: float):
+        w, h = self.card_size
+        return (max(1, int(w * scale)), max(1, int(h * scale)))
+
+    def _load(self, c: str, size):
+        # PIL only, so it is safe off the Tk thread; None when the file is missing.
+        path = self._path(c)
         if not os.path.exists(path):
-            return self.missing
-        img = Image.open(path).convert("RGBA")
-        nw = max(1, int(img.width * self.scale))
-        nh = max(1, int(img.height * self.scale))
-        img = img.resize((nw, nh), Image.Resampling.LANCZOS)
-        return ImageTk.PhotoImage(img)
+            return None
+        with Image.open(path) as img:
+            return img.convert("RGBA").resize(size, Image.Resampling.LANCZOS)
 
     def get(self, c: str):
-        if c in self.cache:
-            return self.cache[c]
-        fn = card_to_filename(c)
-        path = os.path.join(self.base_dir, fn)
-        if not os.path.exists(path):
-            self.cache[c] = self.missing
-            return self.cache[c]
-        img = Image.open(path).convert("RGBA")
-        nw = max(1, int(img.width * self.scale))
-        nh = max(1, int(img.height * self.scale))
-        img = img.resize((nw, nh), Image.Resampling.LANCZOS)
-        self.cache[c] = ImageTk.PhotoImage(img)
-        return self.cache[c]
+        key = (c, self.size)
+        photo = self.cache.get(key)
+        if photo is not None:
+            self.cache.move_to_end(key)
+            return photo
+        with self._lock:
+            img = self._ready.pop(key, None)
+        if img is None:
+            img = self._load(c, self.size)
+        photo = self.missing if img is None else ImageTk.PhotoImage(img)
+        self.cache[key] = photo
+        while len(self.cache) > self.max_items:
+            self.cache.popitem(last=False)
+        return photo
+
+    @property
+    def back(self):
+        return self.get(BACK_KEY)
+
+    def warm(self, cards=None):
+        """Decode + resize cards (default: all 53 and the back) at the current size on a daemon thread."""
+        cards = list(build_deck_4p()) + [BACK_KEY] if cards is None else list(cards)
+        size, gen = self.size, self._warm_gen
+
+        def run():
+            for c in cards:
+                if self._warm_gen != gen:
+                    return
+                key = (c, size)
+                if key in self.cache or key in self._ready:
+                    continue
+                img = self._load(c, size)
+                if img is not None:
+                    with self._lock:
+                        self._ready[key] = img
+
+        t = threading.Thread(target=run, name="card-images", daemon=True)
+        t.start()
+        return t
+
+    def set_scale(self, scale: float) -> bool:
+        """Switch to a new card scale; returns False when the pixel size is unchanged."""
+        size = self._size_for(scale)
+        self.scale = scale
+        if size == self.size:
+            return False
+        self.size = size
+        self._warm_gen += 1
+        self.cache = OrderedDict((k, v) for k, v in self.cache.items() if k[1] == size)
+        with self._lock:
+            self._ready = {k: v for k, v in self._ready.items() if k[1] == size}
+        self.warm()
+        return True
 
 
 # ----------------------------
@@ -191,7 +277,9 @@ class Player:
 
 
 class GameEngine:
-    def __init__(self):
+    def __init__(self, rng=None):
+        # Own random stream (deal + CPU fallbacks); pass a seeded random.Random to reproduce games.
+        self.rng = rng if rng is not None else random.Random()
         self.players = [Player(1, True), Player(2, False), Player(3, False), Player(4, False)]
         self.deck = []
         self.mount = []
@@ -223,7 +311,7 @@ class GameEngine:
 
     def new_game(self):
         self.deck = build_deck_4p()
-        random.shuffle(self.deck)
+        self.rng.shuffle(self.deck)
 
         self.mount = []
         self.obverse = ""
@@ -690,7 +778,7 @@ class GameEngine:
                 return card_value_basic(c)
 
             legal.sort(key=score, reverse=True)
-            return legal[0] if legal else random.choice(self.players[pid - 1].cards)
+            return legal[0] if legal else self.rng.choice(self.players[pid - 1].cards)
 
         # ----------------------------
         # Team-aware behavior (no cheat)
@@ -747,7 +835,7 @@ class GameEngine:
             if best is not None:
                 return best
 
-            return random.choice(legal) if legal else random.choice(self.players[pid - 1].cards)
+            return self.rng.choice(legal) if legal else self.rng.choice(self.players[pid - 1].cards)
 
         # Not leader: responding within an existing turn.
         lead_card = self.first_card
@@ -837,7 +925,7 @@ class GameEngine:
                 best_score = score
                 best = c
 
-        return best if best is not None else (legal[0] if legal else random.choice(self.players[pid - 1].cards))
+        return best if best is not None else (legal[0] if legal else self.rng.choice(self.players[pid - 1].cards))
 
 
 # ----------------------------
@@ -845,7 +933,7 @@ class GameEngine:
 # ----------------------------
 
 class NapoApp:
-    def __init__(self):
+    def __init__(self, seed=None):
         self.root = tk.Tk()
         self.root.title("Napoleon (GUI playable)")
 
@@ -855,8 +943,14 @@ class NapoApp:
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
         self.cards_dir = os.path.join(self.base_dir, "Cards")
 
-        self.engine = GameEngine()
-        self.img = CardImages(self.cards_dir, scale=0.1)
+        # One seed drives the whole session: the app's own CPU decisions and an
+        # independent stream for the engine.
+        self.rng = random.Random(seed)
+        self.engine = GameEngine(rng=random.Random(self.rng.getrandbits(64)))
+        self.lieut_caller = LieutCaller(rng=self.rng)
+        self.img = CardImages(self.cards_dir, scale=CARD_SCALE)
+        self.img.warm()  # decode the whole deck while the first deal is set up
+        self._rescale_job = None
 
         self.selected_lieut = None
         self.selected_hand_swap = None
@@ -882,8 +976,35 @@ class NapoApp:
 
         self._build_ui()
         self._new_game()
+        self.root.bind("<Configure>", self._on_configure)
 
     # ---------- UI helpers ----------
+    def _on_configure(self, event):
+        if event.widget is not self.root:
+            return
+        if self._rescale_job is not None:
+            self.root.after_cancel(self._rescale_job)
+        self._rescale_job = self.root.after(RESCALE_DELAY_MS, self._rescale_cards)
+
+    def _rescale_cards(self):
+        self._rescale_job = None
+        scale = card_scale_for(self.root.winfo_width(), self.root.winfo_height())
+        if not self.img.set_scale(scale):
+            return
+        # Rebuilt card rows lose their highlight, so selections start over.
+        self.selected_lieut = None
+        self.selected_hand_swap = None
+        self.selected_mount_swap = None
+        self.selected_play_card = None
+        st = self.engine.stage
+        self._build_hand_preview()
+        if st == "lieut":
+            self._build_lieut_candidates()
+        elif st == "exchange":
+            self._build_exchange_panels()
+        elif st == "play":
+            self._build_play_hand()
+
     def _clear_frame(self, w):
         for child in w.winfo_children():
             child.destroy()
@@ -1164,13 +1285,13 @@ class NapoApp:
             # Add randomness: even with strong hand, might not declare immediately
             if strength:
                 # Random chance to declare based on hand strength
-                declare_probability = random.random()
+                declare_probability = self.rng.random()
                 if declare_probability > 0.3:  # 70% chance if hand is strong
                     declaration_candidates.append(pid)
         
         # If any CPU wants to declare, pick one randomly
         if declaration_candidates:
-            declaring_cpu = random.choice(declaration_candidates)
+            declaring_cpu = self.rng.choice(declaration_candidates)
             self.log(f"Player {declaring_cpu} (CPU) evaluates hand and decides to declare first!")
             self.root.after(800, lambda: self._cpu_make_initial_declaration(declaring_cpu))
         else:
@@ -1281,9 +1402,9 @@ class NapoApp:
             has_strength = self._evaluate_hand_for_declaration(hand)
             # Add randomness: even with strong hand, might not declare
             if has_strength:
-                return random.random() > 0.4  # 60% chance to declare if strong
+                return self.rng.random() > 0.4  # 60% chance to declare if strong
             else:
-                return random.random() > 0.85  # 15% chance to declare if weak (bluff)
+                return self.rng.random() > 0.85  # 15% chance to declare if weak (bluff)
         
         # If someone has declared, decide whether to raise based on hand strength
         hand_strength = self._evaluate_hand_strength_score(hand)
@@ -1304,82 +1425,16 @@ class NapoApp:
         target_penalty = (self.current_target - 13) * 0.15
         final_probability = max(0.05, base_probability - target_penalty)
         
-        return random.random() < final_probability
+        return self.rng.random() < final_probability
     
     def _evaluate_hand_for_declaration(self, hand) -> bool:
         """Evaluate if hand is strong enough to make initial declaration"""
-        # Count strong cards
-        strong_count = 0
-        pict_count = 0
-        
-        for c in hand:
-            if is_joker(c):
-                strong_count += 3
-                continue
-            
-            r = rank(c)
-            s = suit(c)
-            
-            # Count picture cards
-            if r in ["0", "J", "Q", "K", "A"]:
-                pict_count += 1
-            
-            # Special cards
-            if c == SPECIAL_MIGHTY:  # Spade A
-                strong_count += 3
-            elif c == SPECIAL_YORO:  # Heart Q
-                strong_count += 2
-            elif r == "A":
-                strong_count += 2
-            elif r == "K":
-                strong_count += 1
-            elif r == "Q":
-                strong_count += 1
-        
-        # Decision threshold: need at least 6 strong points or 8+ pict cards
-        return strong_count >= 6 or pict_count >= 8
+        # Need at least 6 strong points or 8+ pict cards (see bidding.py)
+        return is_declaration_hand(cards_to_mask(hand))
     
     def _evaluate_hand_strength_score(self, hand) -> int:
         """Calculate numeric hand strength score for bidding decisions"""
-        score = 0
-        pict_count = 0
-        
-        for c in hand:
-            if is_joker(c):
-                score += 3
-                pict_count += 1
-                continue
-            
-            r = rank(c)
-            s = suit(c)
-            
-            # Count picture cards
-            if r in ["0", "J", "Q", "K", "A"]:
-                pict_count += 1
-            
-            # Special cards
-            if c == SPECIAL_MIGHTY:  # Spade A
-                score += 3
-            elif c == SPECIAL_YORO:  # Heart Q
-                score += 2
-            elif r == "A":
-                score += 2
-            elif r == "K":
-                score += 1
-            elif r == "Q":
-                score += 1
-            elif r == "J":
-                score += 0.5
-            elif r == "0":
-                score += 0.5
-        
-        # Bonus for having many picture cards
-        if pict_count >= 10:
-            score += 2
-        elif pict_count >= 8:
-            score += 1
-        
-        return int(score)
+        return hand_strength_score(cards_to_mask(hand))
 
     def _advance_bid_turn(self):
         """Advance to next player's turn"""
@@ -1524,49 +1579,15 @@ class NapoApp:
         def is_trump(c: str) -> bool:
             return (not is_joker(c)) and suit(c) == trump
 
-        def strong_card_value(c: str) -> int:
-            if c in specials:
-                return 200000
-            if is_pict(c) and is_trump(c):
-                return 120000 + rv(c)
-            if is_trump(c):
-                return 80000 + rv(c)
-            if is_pict(c):
-                return 30000 + rv(c)
-            return rv(c)
-
-        holder = {}
-        for c in self.engine.mount:
-            holder[c] = None
-        for p in self.engine.players:
-            if p.id == self.engine.napoleon_id:
-                continue
-            for c in p.cards:
-                holder[c] = p.id
-
-        outside = [c for c in build_deck_4p() if c not in nap.cards]
-        best_c = None
-        best_score = -10**18
-        for c in outside:
-            sc = strong_card_value(c)
-            if c in self.engine.mount:
-                sc -= 60000
-            if holder.get(c) is not None:
-                sc += 5000
-            if is_trump(c) and rv(c) >= 11:
-                sc += 8000
-            if sc > best_score:
-                best_score = sc
-                best_c = c
-
-        self.engine.lieut_card = best_c if best_c else random.choice(outside)
-
-        if self.engine.lieut_card in self.engine.mount:
-            self.engine.lieut_in_mount = True
-            self.engine.lieut_id = None
-        else:
-            self.engine.lieut_in_mount = False
-            self.engine.lieut_id = holder.get(self.engine.lieut_card)
+        # Lieut card by sampled playouts of the unknown hands (lieut.py); the
+        # holder is looked up only to record the sides.
+        self.engine.lieut_card = self.lieut_caller.choose(nap.cards, trump, self.engine.target)
+        self.engine.lieut_id = None
+        self.engine.lieut_in_mount = self.engine.lieut_card in self.engine.mount
+        if not self.engine.lieut_in_mount:
+            for p in self.engine.players:
+                if self.engine.lieut_card in p.cards:
+                    self.engine.lieut_id = p.id
 
         def keep_value(c: str) -> int:
             if c in specials:
@@ -1584,53 +1605,29 @@ class NapoApp:
                 return 15000 + rv(c)
             return rv(c)
 
-        def two_synergy_score(hand_cards) -> int:
-            counts = {"s": 0, "h": 0, "d": 0, "c": 0}
-            for c in hand_cards:
-                if is_joker(c):
-                    continue
-                counts[suit(c)] += 1
-            dominant_s = max(counts, key=lambda k: counts[k])
-            dom = counts[dominant_s]
+        def two_synergy_score(counts) -> int:
+            # counts: cards per suit in SUITS order (s, h, d, c), Joker not counted.
+            dom = max(counts)
             score = dom * 1200
-            if dominant_s == trump:
+            if SUITS[counts.index(dom)] == trump:
                 score += dom * 900
-            spread = sum(1 for k in counts if counts[k] > 0)
+            spread = sum(1 for n in counts if n > 0)
             score -= spread * 500
             return score
 
-        def hand_total_score(cards) -> int:
-            return sum(keep_value(x) for x in cards) + two_synergy_score(cards)
-
-        for _ in range(5):
-            best_delta = 0
-            best_out = None
-            best_in = None
-            current_score = hand_total_score(nap.cards)
-
-            for out_c in nap.cards:
-                if out_c in specials:
-                    continue
-                for in_c in self.engine.mount:
-                    new_hand = list(nap.cards)
-                    new_hand.remove(out_c)
-                    new_hand.append(in_c)
-                    delta = hand_total_score(new_hand) - current_score
-                    if delta > best_delta:
-                        best_delta = delta
-                        best_out = out_c
-                        best_in = in_c
-
-            if best_delta <= 0 or best_out is None or best_in is None:
-                break
-
-            nap.cards.remove(best_out)
-            self.engine.mount.remove(best_in)
-            nap.cards.append(best_in)
-            self.engine.mount.append(best_out)
-
-        nap.cards = sort_cards(nap.cards)
-        self.engine.mount = sort_cards(self.engine.mount)
+        # Best 12 of hand + mount over every keep set (exchange.best_keeps).
+        # Specials in hand are never discarded; as before, a Lieut card in the
+        # mount may be picked up like any other mount card.
+        cards = list(nap.cards) + list(self.engine.mount)
+        _, kept = best_keeps(
+            cards,
+            {c: keep_value(c) for c in cards},
+            two_synergy_score,
+            keep=len(nap.cards),
+            forced_keep=[c for c in nap.cards if c in specials],
+        )[0]
+        nap.cards = sort_cards(kept)
+        self.engine.mount = sort_cards([c for c in cards if c not in kept])
 
     # ---------- new game ----------
     def _new_game(self):
@@ -1888,7 +1885,7 @@ class NapoApp:
                         legal = legal2
                 if not legal:
                     break
-                card = random.choice(legal)
+                card = self.rng.choice(legal)
                 self.engine.play_card(pid, card)
 
             shown = self.engine.last_shown_for_pid(pid) or card
@@ -0,0 +1,258 @@
+# pimc.py
+# Napoleon (PIMC CPU) - Perfect Information Monte Carlo play.
+#
+# From one player's point of view, hidden cards are re-dealt at random in a way
+# that agrees with everything public: cards already played, face-down reveals
+# (a BACK play means that player is void in the lead suit) and the Lieut card.
+# Every candidate card is then played out on each sampled deal, and the card
+# with the best average Napoleon-side pict outcome is chosen.
+#
+# Usage: PimcPlayer(time_budget=0.2).choose(engine, pid)
+
+import math
+import time
+
+from engine import (
+    CARD_BIT,
+    FACE_DOWN,
+    FULL_MASK,
+    JOKER_BIT,
+    SUIT_MASK,
+    cards_to_mask,
+    is_joker,
+    mask_count,
+    mask_to_cards,
+    suit,
+)
+from solver import SOLVER_MAX_TRICKS, Solver, nap_side_ids
+
+
+# ----------------------------
+# Public information
+# ----------------------------
+
+def _lead_suit(engine, first_card):
+    return engine.obverse if is_joker(first_card) else suit(first_card)
+
+
+def hidden_view(engine, pid):
+    """What player pid cannot see, as (unseen cards mask, slots).
+
+    slots: [(owner, size, allowed mask)] to refill with the unseen cards, where
+    owner is a pid (hand), "mount", or ("trick", i) for a face-down card at
+    turn_cards[i] that is still hidden on the table.
+    """
+    me = engine.players[pid - 1]
+    seen = me.mask | engine.seen_mask
+    if pid == engine.napoleon_id:
+        seen |= engine.mount_mask  # Napoleon built the mount during the exchange.
+    for p, c in engine.turn_cards:
+        if p == pid:
+            seen |= CARD_BIT[c]  # own face-down card
+
+    # Voids and located cards come from the engine's public knowledge.
+    slots = []
+    for p in engine.players:
+        if p.id != pid:
+            slots.append((p.id, len(p.cards), engine.possible_mask(p.id)))
+    if pid != engine.napoleon_id:
+        slots.append(("mount", len(engine.mount), engine.possible_masks[4]))
+    if engine.turn_cards:
+        lead = _lead_suit(engine, engine.first_card)
+        for i, (p, sh) in enumerate(engine.turn_display):
+            if sh == FACE_DOWN and p != pid:
+                slots.append((("trick", i), 1, FULL_MASK & ~SUIT_MASK.get(lead, 0) & ~JOKER_BIT))
+
+    return FULL_MASK & ~seen, slots
+
+
+def _deal_exact(unseen, slots, rng):
+    # Uniform over every deal that fits the slots. Cards allowed in the same set
+    # of slots are interchangeable, so only the class sizes put into each slot
+    # are drawn (weighted by their counted completions), then the cards of a
+    # class are shuffled into those shares.
+    classes = {}
+    for c in mask_to_cards(unseen):
+        key = tuple(k for k, (_, _, allowed) in enumerate(slots) if allowed & CARD_BIT[c])
+        classes.setdefault(key, []).append(c)
+    classes = list(classes.items())
+
+    def splits(ks, n, caps):
+        # (caps after putting n cards into slots ks, ways to pick which cards go where)
+        if not ks:
+            if n == 0:
+                yield caps, 1
+            return
+        k, rest = ks[0], ks[1:]
+        for x in range(min(n, caps[k]) + 1):
+            for out, ways in splits(rest, n - x, caps[:k] + (caps[k] - x,) + caps[k + 1:]):
+                yield out, ways * math.comb(n, x)
+
+    memo = {}
+
+    def count(i, caps):
+        if i == len(classes):
+            return 1 if not any(caps) else 0
+        key = (i, caps)
+        if key not in memo:
+            ks, cards = classes[i]
+            memo[key] = sum(ways * count(i + 1, out) for out, ways in splits(ks, len(cards), caps))
+        return memo[key]
+
+    caps = tuple(size for _, size, _ in slots)
+    if not count(0, caps):
+        raise RuntimeError("Hidden cards do not fit the slots.")
+    out = {owner: [] for owner, _, _ in slots}
+    for i, (ks, cards) in enumerate(classes):
+        options = [(nxt, ways * count(i + 1, nxt)) for nxt, ways in splits(ks, len(cards), caps)]
+        r = rng.randrange(sum(w for _, w in options))
+        for nxt, w in options:
+            if r < w:
+                break
+            r -= w
+        cards = rng.sample(cards, len(cards))
+        for k in ks:
+            take = caps[k] - nxt[k]
+            out[slots[k][0]] += cards[:take]
+            cards = cards[take:]
+        caps = nxt
+    return out
+
+
+def _deal_slots(unseen, slots, rng, tries=20):
+    # Most constrained slots first; retry on a dead end, then deal by exact counting.
+    order = sorted(slots, key=lambda s: mask_count(unseen & s[2]) - s[1])
+    for _ in range(tries):
+        left = unseen
+        out = {}
+        for owner, size, allowed in order:
+            pool = mask_to_cards(left & allowed)
+            if len(pool) < size:
+                break
+            pick = rng.sample(pool, size)
+            for c in pick:
+                left &= ~CARD_BIT[c]
+            out[owner] = pick
+        else:
+            return out
+    return _deal_exact(unseen, slots, rng)
+
+
+def sample_world(engine, pid, rng):
+    """Clone of engine with every card hidden from pid re-dealt at random."""
+    unseen, slots = hidden_view(engine, pid)
+    dealt = _deal_slots(unseen, slots, rng)
+    w = engine.clone()
+
+    trick = list(w.turn_cards)
+    for owner, cards in dealt.items():
+        if owner == "mount":
+            w.mount = mask_to_cards(cards_to_mask(cards))
+        elif isinstance(owner, tuple):
+            i = owner[1]
+            trick[i] = (trick[i][0], cards[0])
+        else:
+            w.players[owner - 1].cards = mask_to_cards(cards_to_mask(cards))
+    w.turn_cards = trick
+    if engine.turn_cards:
+        n_done = len(w.history) - len(trick)
+        w.history[n_done:] = [(p, c, sh) for (p, c), (_, sh) in zip(trick, w.turn_display)]
+
+    # Sides follow the sampled Lieut card unless it has already been played.
+    if not w.lieut_revealed and w.lieut_card:
+        bit = CARD_BIT[w.lieut_card]
+        w.lieut_id = None
+        w.lieut_in_mount = True
+        for p in w.players:
+            if p.mask & bit and p.id != w.napoleon_id:
+                w.lieut_id = p.id
+                w.lieut_in_mount = False
+    return w
+
+
+# ----------------------------
+# Player
+# ----------------------------
+
+def _nap_pict(world):
+    return sum(world.pict_count(i) for i in nap_side_ids(world))
+
+
+def _rollout(world):
+    # Play the sample to the end with the one-ply CPU, then undo everything.
+    n = 0
+    while world.stage == "play":
+        pid = world.next_player_id()
+        world.push_move(pid, world.cpu_choose(pid))
+        n += 1
+    v = _nap_pict(world)
+    for _ in range(n):
+        world.pop_move()
+    return v
+
+
+class PimcPlayer:
+    """CPU strength level on top of cpu_choose(): sampled deals + playouts.
+
+    time_budget: seconds per move (at least one sample is always evaluated).
+    max_samples: optional cap on deals per move.
+    solver_tricks: from this many tricks left, samples are scored exactly by
+    the double-dummy solver instead of a cpu_choose() playout; capped at
+    solver.SOLVER_MAX_TRICKS, as deeper solves cost tenths of a second each.
+    rng: random.Random for sampling; defaults to the engine's own stream.
+    """
+
+    def __init__(self, time_budget=0.2, max_samples=None, solver_tricks=3, rng=None):
+        self.time_budget = time_budget
+        self.max_samples = max_samples
+        self.solver_tricks = min(solver_tricks, SOLVER_MAX_TRICKS)
+        self.rng = rng
+        self.last_samples = 0
+
+    def _values(self, world, pid, legal):
+        tricks_left = 13 - world.turn_no
+        if tricks_left <= self.solver_tricks:
+            return Solver(world).move_values()
+        out = {}
+        for c in legal:
+            world.push_move(pid, c)
+            out[c] = _rollout(world)
+            world.pop_move()
+        return out
+
+    def choose(self, engine, pid):
+        legal = engine.legal_moves(pid)
+        if len(legal) <= 1:
+            return legal[0] if legal else None
+
+        deadline = time.perf_counter() + self.time_budget
+        # Every player knows their own side: Napoleon, or dealt the Lieut card.
+        my_nap = pid == engine.napoleon_id or (engine.lieut_id == pid and not engine.lieut_in_mount)
+        rng = self.rng if self.rng is not None else engine.rng
+        totals = {c: 0 for c in legal}
+        n = 0
+        while True:
+            world = sample_world(engine, pid, rng)
+            for c, v in self._values(world, pid, legal).items():
+                totals[c] += v if my_nap else -v
+            n += 1
+            if self.max_samples is not None and n >= self.max_samples:
+                break
+            if time.perf_counter() >= deadline:
+                break
+        self.last_samples = n
+
+        # Ties go to the one-ply CPU's pick.
+        fallback = engine.cpu_choose(pid)
+        return max(legal, key=lambda c: (totals[c], c == fallback))
+
+
+_default_player = None
+
+
+def pimc_policy(engine, pid):
+    """Play policy for simulate/tournament with the default PimcPlayer."""
+    global _default_player
+    if _default_player is None:
+        _default_player = PimcPlayer()
+    return _default_player.choose(engine, pid)
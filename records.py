@@ -0,0 +1,245 @@
+# records.py
+# Napoleon (game records) - compact binary format, streaming writer and reader.
+#
+# File  = FILE_MAGIC, then records back to back.
+# Record = u16 body length (little-endian), then the body:
+#   u64   seed (NO_SEED if unknown)
+#   53 B  deal: P1..P4 hands (12 each, as dealt) then the 5 mount cards
+#   u8    bid count, then 3 B per bid: pid, suit index (SUITS), target
+#   3 B   napoleon pid, obverse suit index, target  (0xFF x3 if never declared)
+#   u8    Lieut card (0xFF if never called)
+#   u8    swap count, then 2 B per swap: hand card, mount card
+#   u8    play count (48 for a finished game), then 1 B per play:
+#         card id, | FACE_DOWN_FLAG when it was shown as BACK
+# Cards are engine.CARD_ID values, so every card is one byte.
+# Seats of the plays are not stored; replaying the rules recovers them.
+
+import struct
+
+from engine import CARD_CODES, CARD_ID, FACE_DOWN, SUITS
+
+FILE_MAGIC = b"NAPR\x01"
+NO_SEED = 0xFFFFFFFFFFFFFFFF
+NONE_BYTE = 0xFF
+FACE_DOWN_FLAG = 0x80
+
+_LEN = struct.Struct("<H")
+_SEED = struct.Struct("<Q")
+
+
+# ----------------------------
+# Encode / decode
+# ----------------------------
+
+def encode_record(rec: dict) -> bytes:
+    """Body bytes (without the length prefix) for a record dict (see decode_record)."""
+    out = bytearray()
+    seed = rec.get("seed")
+    out += _SEED.pack(NO_SEED if seed is None else seed)
+    for hand in rec["hands"]:
+        out += bytes(CARD_ID[c] for c in hand)
+    out += bytes(CARD_ID[c] for c in rec["mount"])
+
+    bids = rec.get("bids", [])
+    swaps = rec.get("swaps", [])
+    plays = rec.get("plays", [])
+    if max(len(bids), len(swaps), len(plays)) > 255:
+        raise ValueError("Too many bids/swaps/plays for one record.")
+    out.append(len(bids))
+    for b in bids:
+        out += bytes((b["pid"], SUITS.index(b["suit"]), b["target"]))
+
+    if rec.get("obverse"):
+        out += bytes((rec["napoleon_id"], SUITS.index(rec["obverse"]), rec["target"]))
+    else:
+        out += bytes((NONE_BYTE, NONE_BYTE, NONE_BYTE))
+    out.append(CARD_ID[rec["lieut_card"]] if rec.get("lieut_card") else NONE_BYTE)
+
+    out.append(len(swaps))
+    for hand_card, mount_card in swaps:
+        out += bytes((CARD_ID[hand_card], CARD_ID[mount_card]))
+
+    out.append(len(plays))
+    out += bytes(CARD_ID[c] | (FACE_DOWN_FLAG if shown == FACE_DOWN else 0) for c, shown in plays)
+    return bytes(out)
+
+
+def decode_record(body) -> dict:
+    """Record dict from body bytes (bytes, bytearray or memoryview).
+
+    plays are (card, shown code) pairs in play order.
+    """
+    b = bytes(body)
+    seed = _SEED.unpack_from(b, 0)[0]
+    i = _SEED.size
+    hands = [[CARD_CODES[x] for x in b[i + 12 * k:i + 12 * (k + 1)]] for k in range(4)]
+    i += 48
+    mount = [CARD_CODES[x] for x in b[i:i + 5]]
+    i += 5
+
+    n = b[i]
+    i += 1
+    bids = [{"pid": b[i + 3 * k], "suit": SUITS[b[i + 3 * k + 1]], "target": b[i + 3 * k + 2]} for k in range(n)]
+    i += 3 * n
+
+    nap, obv, target = b[i], b[i + 1], b[i + 2]
+    i += 3
+    lieut = b[i]
+    i += 1
+
+    n = b[i]
+    i += 1
+    swaps = [(CARD_CODES[b[i + 2 * k]], CARD_CODES[b[i + 2 * k + 1]]) for k in range(n)]
+    i += 2 * n
+
+    n = b[i]
+    i += 1
+    plays = []
+    for x in b[i:i + n]:
+        c = CARD_CODES[x & ~FACE_DOWN_FLAG]
+        plays.append((c, FACE_DOWN if x & FACE_DOWN_FLAG else c))
+
+    return {
+        "seed": None if seed == NO_SEED else seed,
+        "hands": hands,
+        "mount": mount,
+        "bids": bids,
+        "napoleon_id": None if nap == NONE_BYTE else nap,
+        "obverse": "" if obv == NONE_BYTE else SUITS[obv],
+        "target": 0 if target == NONE_BYTE else target,
+        "lieut_card": "" if lieut == NONE_BYTE else CARD_CODES[lieut],
+        "swaps": swaps,
+        "plays": plays,
+    }
+
+
+# ----------------------------
+# Streaming I/O
+# ----------------------------
+
+class RecordWriter:
+    """Append-only record file. The magic header is written when the file is empty."""
+
+    def __init__(self, path):
+        self.f = open(path, "ab")
+        if self.f.tell() == 0:
+            self.f.write(FILE_MAGIC)
+
+    def write(self, rec: dict):
+        body = encode_record(rec)
+        self.f.write(_LEN.pack(len(body)))
+        self.f.write(body)
+
+    def flush(self):
+        self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+
+def iter_record_bodies(f):
+    """Yield raw record bodies from an open binary file, one at a time."""
+    if f.read(len(FILE_MAGIC)) != FILE_MAGIC:
+        raise ValueError("Not a Napoleon record file.")
+    while True:
+        head = f.read(_LEN.size)
+        if len(head) < _LEN.size:
+            return
+        (n,) = _LEN.unpack(head)
+        body = f.read(n)
+        if len(body) < n:
+            return  # torn tail from an interrupted write
+        yield body
+
+
+def read_records(path):
+    """Generator over every record dict in a file, without loading the file."""
+    with open(path, "rb") as f:
+        for body in iter_record_bodies(f):
+            yield decode_record(body)
+
+
+# ----------------------------
+# GameEngine hook
+# ----------------------------
+
+def net_swaps(hand, swaps):
+    """Shortest swap list taking hand to the same final hand as swaps."""
+    final = set(hand)
+    for hand_card, mount_card in swaps:
+        final.discard(hand_card)
+        final.add(mount_card)
+    gone = [c for c in hand if c not in final]
+    came = sorted(final - set(hand), key=CARD_ID.get)
+    return list(zip(gone, came))
+
+
+class GameRecorder:
+    """Attach as engine.recorder; each game becomes one record in writer.
+
+    The record is written when the game ends, or (unfinished) when the next
+    game starts or the recorder is closed. Moves made through push_move()
+    (search) are not recorded.
+    """
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.rec = None
+
+    def _flush_game(self):
+        if self.rec is not None:
+            rec = self.rec
+            # Counts are one byte: keep the latest bids, and fold a long swap
+            # back-and-forth into the net exchange (same final hands).
+            rec["bids"] = rec["bids"][-255:]
+            if len(rec["swaps"]) > 255:
+                rec["swaps"] = net_swaps(rec["hands"][rec["napoleon_id"] - 1], rec["swaps"])
+            self.writer.write(rec)
+            self.writer.flush()
+            self.rec = None
+
+    def on_new_game(self, engine, seed=None):
+        self._flush_game()
+        if not (isinstance(seed, int) and 0 <= seed < NO_SEED):
+            seed = None  # only u64 seeds fit the record
+        self.rec = {
+            "seed": seed,
+            "hands": [list(p.cards) for p in engine.players],
+            "mount": list(engine.mount),
+            "bids": [],
+            "napoleon_id": None,
+            "obverse": "",
+            "target": 0,
+            "lieut_card": "",
+            "swaps": [],
+            "plays": [],
+        }
+
+    def on_bids(self, bids):
+        if self.rec is not None:
+            self.rec["bids"].extend({"pid": b["pid"], "suit": b["suit"], "target": b["target"]} for b in bids)
+
+    def on_declaration(self, engine):
+        if self.rec is not None:
+            self.rec["napoleon_id"] = engine.napoleon_id
+            self.rec["obverse"] = engine.obverse
+            self.rec["target"] = engine.target
+
+    def on_lieut(self, engine):
+        if self.rec is not None:
+            self.rec["lieut_card"] = engine.lieut_card
+
+    def on_swap(self, hand_card, mount_card):
+        if self.rec is not None:
+            self.rec["swaps"].append((hand_card, mount_card))
+
+    def on_play(self, engine, c, shown):
+        if self.rec is None:
+            return
+        self.rec["plays"].append((c, shown))
+        if engine.stage == "done":
+            self._flush_game()
+
+    def close(self):
+        self._flush_game()
+        self.writer.close()
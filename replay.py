@@ -0,0 +1,118 @@
+# replay.py
+# Napoleon (replay) - rebuild GameEngine state at any ply of a recorded game.
+#
+# The record (records.py) is replayed through the normal engine API:
+# new_game(fixed deal) -> set_declaration -> set_lieut_card -> do_swap... ->
+# finish_exchange -> play_card... Snapshots (GameEngine.clone()) are taken every
+# `every` plies on the way, so a seek replays at most every-1 cards.
+#
+# Usage:
+#   r = Replay(archive[n])
+#   e = r.at(20)                 # state after 20 cards played
+#   e = r.at_trick(9, seat=3)    # trick 9, just before P3 plays
+
+from engine import GameEngine
+
+
+def deck_for_deal(hands, mount):
+    """Deck order that GameEngine.new_game(deck) deals into exactly these hands/mount."""
+    order = list(mount)
+    for i in range(12):
+        for h in hands:
+            order.append(h[i])
+    # new_game() pops from the end: mount first, then one card per hand per round.
+    return order[::-1]
+
+
+def start_engine(rec) -> GameEngine:
+    """Engine at ply 0: after the exchange, or as far as the record got."""
+    e = GameEngine()
+    e.new_game(deck_for_deal(rec["hands"], rec["mount"]))
+    if not rec["obverse"]:
+        return e
+    e.napoleon_id = rec["napoleon_id"]
+    _check(e.set_declaration(rec["obverse"], rec["target"]), "declaration")
+    if not rec["lieut_card"]:
+        return e
+    _check(e.set_lieut_card(rec["lieut_card"]), "lieut")
+    for hand_card, mount_card in rec["swaps"]:
+        _check(e.do_swap(hand_card, mount_card), "swap")
+    if rec["plays"]:
+        _check(e.finish_exchange(), "finish exchange")
+    return e
+
+
+def _check(result, what):
+    ok, msg = result
+    if not ok:
+        raise ValueError(f"Record does not replay ({what}): {msg}")
+
+
+def _play(e, c, shown):
+    pid = e.next_player_id()
+    ok, res = e.play_card(pid, c)
+    if not ok:
+        raise ValueError(f"Record does not replay (P{pid} {c}): {res}")
+    if res["shown"] != shown:
+        raise ValueError(f"Record does not replay (P{pid} {c} shown {res['shown']}, recorded {shown})")
+
+
+class Replay:
+    """Seekable replay of one record. at() returns a fresh engine the caller may modify."""
+
+    def __init__(self, rec, every: int = 4):
+        self.rec = rec
+        self.every = max(1, every)
+        self._snaps = [start_engine(rec)]  # _snaps[k] = state at ply k * every
+
+    @property
+    def plies(self) -> int:
+        return len(self.rec["plays"])
+
+    def at(self, ply: int) -> GameEngine:
+        if not 0 <= ply <= self.plies:
+            raise IndexError(f"ply {ply} outside 0..{self.plies}")
+        plays = self.rec["plays"]
+        k = ply // self.every
+
+        # Extend the snapshot chain up to the one at or below ply.
+        while len(self._snaps) <= k:
+            e = self._snaps[-1].clone()
+            base = (len(self._snaps) - 1) * self.every
+            for c, shown in plays[base:base + self.every]:
+                _play(e, c, shown)
+            self._snaps.append(e)
+
+        e = self._snaps[k].clone()
+        for c, shown in plays[k * self.every:ply]:
+            _play(e, c, shown)
+        return e
+
+    def ply_of(self, turn_no: int, seat=None) -> int:
+        """Ply at the start of trick turn_no, or just before seat (pid) plays in it."""
+        ply = (turn_no - 1) * 4
+        if seat is None:
+            return ply
+        e = self.at(min(ply, self.plies))
+        for i in range(4):
+            if e.stage != "play":
+                break
+            if e.next_player_id() == seat:
+                return ply + i
+            if ply + i >= self.plies:
+                break
+            c, shown = self.rec["plays"][ply + i]
+            _play(e, c, shown)
+        raise IndexError(f"P{seat} does not play trick {turn_no} in this record")
+
+    def at_trick(self, turn_no: int, seat=None) -> GameEngine:
+        return self.at(self.ply_of(turn_no, seat))
+
+    def seats(self):
+        """Pid of every recorded play (not stored in the record; recovered by replay)."""
+        e = self.at(0)
+        out = []
+        for c, shown in self.rec["plays"]:
+            out.append(e.next_player_id())
+            _play(e, c, shown)
+        return out
@@ -0,0 +1,238 @@
+# solver.py
+# Napoleon (double-dummy solver) - exact play when every hand is visible.
+#
+# Value of a position = Napoleon-side pict count at the end of the game under
+# optimal play (Napoleon + real Lieut maximize, Coalition minimizes).
+# Moves go through GameEngine.push_move()/pop_move(), so legal_moves(), the
+# face-down trump rule and the 2-rule are exactly the engine's.
+
+#
+# Measured best_move() on self-play positions (CPython 3.11, 20 deals):
+#   3 tricks left ~1.5 ms, 4 tricks ~12 ms, 5 tricks ~80 ms, 6 tricks ~0.5 s.
+# Only the last SOLVER_MAX_TRICKS tricks are solved inside a time budget (pimc.py).
+
+from engine import CARD_ID, CARD_IS_PICT, SPECIAL_YORO, is_pict, mask_count, PICT_MASK, rank, suit
+
+INF = 10**6
+SOLVER_MAX_TRICKS = 4  # deepest solve that stays in milliseconds
+
+
+def nap_side_ids(engine):
+    # Real sides, known to the solver even before the Lieut card is played.
+    ids = {engine.napoleon_id}
+    if engine.lieut_id is not None and not engine.lieut_in_mount:
+        ids.add(engine.lieut_id)
+    return ids
+
+
+def nap_pict_now(engine) -> int:
+    return sum(engine.pict_count(pid) for pid in nap_side_ids(engine))
+
+
+class Solver:
+    """Alpha-beta search with a transposition table keyed on
+    (leader, four hand masks) at trick boundaries. Moves are tried as: the
+    table's best move, the ply's killer (last cutoff card), then _order();
+    moves after the first are searched with a null window first.
+
+    One Solver can be reused for every position of the same deal/declaration.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.nap_ids = nap_side_ids(engine)
+        self.tt = {}  # trick-boundary key -> (lower bound, upper bound, best card)
+        self.killers = {}  # ply -> last card that cut off there
+        self.nodes = 0
+
+    def _order(self, pid, moves):
+        # Drop equivalent cards, then order by what the card does to the trick.
+        e = self.engine
+        moves = self._distinct(moves)
+        if not e.turn_cards:
+            # On lead: strong cards first, they settle tricks early and tighten the window.
+            return sorted(moves, key=e.strength, reverse=True)
+
+        my_nap = pid in self.nap_ids
+        current = e._current_trick_best()
+
+        def key(c):
+            winner, _ = e._provisional_winner_after_play(pid, c, current)
+            pict = CARD_IS_PICT.get(c, False)
+            if (winner in self.nap_ids) == my_nap:
+                # Our side keeps the trick: dump picts, spend the cheapest card.
+                return (0, not pict, e.strength(c))
+            # Trick goes to the other side: shed low non-pict cards.
+            return (1, pict, e.strength(c))
+
+        return sorted(moves, key=key)
+
+    def _distinct(self, moves):
+        # Two plain cards of one suit are interchangeable when no card still in
+        # play (hands + current trick) ranks between them and both have the same
+        # pict status. Specials, Yoromeki, Joker and rank-2 (2-rule) are kept as is.
+        e = self.engine
+        special = e._decl_tables()[1]
+        live = e.players[0].mask | e.players[1].mask | e.players[2].mask | e.players[3].mask
+        for _, c in e.turn_cards:
+            live |= 1 << CARD_ID[c]
+
+        out = []
+        prev = None  # (suit, id, pict) of the last kept plain card
+        for c in moves:  # legal_moves() is in id order
+            if special.get(c, True) or c == SPECIAL_YORO or rank(c) == "2":
+                out.append(c)
+                prev = None
+                continue
+            i = CARD_ID[c]
+            s = suit(c)
+            p = CARD_IS_PICT[c]
+            if prev is not None and prev[0] == s and prev[2] == p:
+                between = (1 << i) - (1 << (prev[1] + 1))
+                if not (live & between):
+                    prev = (s, i, p)
+                    continue
+            out.append(c)
+            prev = (s, i, p)
+        return out
+
+    def _search(self, alpha: int, beta: int) -> int:
+        # Future Napoleon-side picts from the current position.
+        e = self.engine
+        if e.stage != "play":
+            return 0
+        self.nodes += 1
+
+        remaining = mask_count(PICT_MASK & (e.players[0].mask | e.players[1].mask | e.players[2].mask | e.players[3].mask))
+        remaining += sum(1 for _, c in e.turn_cards if is_pict(c))
+        if remaining <= alpha:
+            return remaining
+        if beta <= 0:
+            return 0
+
+        key = None
+        tt_move = None
+        if not e.turn_cards:
+            key = (e.leader_id, e.players[0].mask, e.players[1].mask, e.players[2].mask, e.players[3].mask)
+            ent = self.tt.get(key)
+            if ent is not None:
+                lo, hi, tt_move = ent
+                if lo == hi or lo >= beta:
+                    return lo
+                if hi <= alpha:
+                    return hi
+                alpha = max(alpha, lo)
+                beta = min(beta, hi)
+
+        pid = e.next_player_id()
+        maximize = pid in self.nap_ids
+        a, b = alpha, beta
+        best = -INF if maximize else INF
+        best_c = None
+        ply = len(e.history)
+
+        for c in self._first(self._order(pid, e.legal_moves(pid)), tt_move, self.killers.get(ply)):
+            gain = self._play(pid, c)
+            if best_c is None:
+                v = gain + self._search(a - gain, b - gain)
+            else:
+                # Later moves only need to be shown worse: null window first, full window if not.
+                if maximize:
+                    v = gain + self._search(a - gain, a - gain + 1)
+                    if a < v < b:
+                        v = gain + self._search(a - gain, b - gain)
+                else:
+                    v = gain + self._search(b - gain - 1, b - gain)
+                    if a < v < b:
+                        v = gain + self._search(a - gain, b - gain)
+            e.pop_move()
+
+            if maximize:
+                if v > best:
+                    best, best_c = v, c
+                if best > a:
+                    a = best
+            else:
+                if v < best:
+                    best, best_c = v, c
+                if best < b:
+                    b = best
+            if a >= b:
+                self.killers[ply] = c
+                break
+
+        if key is not None:
+            lo, hi, _ = self.tt.get(key, (0, INF, None))
+            if best <= alpha:
+                hi = min(hi, best)
+            elif best >= beta:
+                lo = max(lo, best)
+            else:
+                lo = hi = best
+            self.tt[key] = (lo, hi, best_c)
+        return best
+
+    @staticmethod
+    def _first(moves, *tries):
+        # Transposition-table move, then the killer of this ply, ahead of the ordering.
+        for c in reversed(tries):
+            if c is not None and c in moves and moves[0] != c:
+                moves.remove(c)
+                moves.insert(0, c)
+        return moves
+
+    def value(self) -> int:
+        """Final Napoleon-side pict count under optimal play."""
+        return nap_pict_now(self.engine) + self._search(-INF, INF)
+
+    def _play(self, pid, c):
+        # push_move() and return the Napoleon-side gain of that play.
+        _, res = self.engine.push_move(pid, c)
+        if res["turn_complete"] and res["winner_id"] in self.nap_ids:
+            return len(res["picts"])
+        return 0
+
+    def move_values(self):
+        """{card: final Napoleon-side pict count} for every legal move of the player to act."""
+        e = self.engine
+        if e.stage != "play":
+            return {}
+        base = nap_pict_now(e)
+        pid = e.next_player_id()
+        out = {}
+        for c in e.legal_moves(pid):
+            gain = self._play(pid, c)
+            out[c] = base + gain + self._search(-INF, INF)
+            e.pop_move()
+        return out
+
+    def best_move(self):
+        """(best card, final Napoleon-side pict count) for the player to act."""
+        e = self.engine
+        if e.stage != "play":
+            return None, nap_pict_now(e)
+        pid = e.next_player_id()
+        maximize = pid in self.nap_ids
+        base = nap_pict_now(e)
+        best_c = None
+        best = -INF if maximize else INF
+        for c in self._order(pid, e.legal_moves(pid)):
+            gain = self._play(pid, c)
+            # Only a strictly better line matters, so the window is one-sided.
+            if maximize:
+                v = gain + self._search(best - gain, INF)
+                better = v > best
+            else:
+                v = gain + self._search(-INF, best - gain)
+                better = v < best
+            e.pop_move()
+            if better:
+                best = v
+                best_c = c
+        return best_c, base + best
+
+
+def solve(engine, solver=None):
+    """Exact (best card, final Napoleon-side pict count) for the player to act."""
+    return (solver or Solver(engine)).best_move()
+
@@ -0,0 +1,71 @@
+import io
+import os
+import random
+import struct
+import tempfile
+import unittest
+
+from archive import GameArchive, index_path, update_index
+from engine import GameEngine
+from records import FILE_MAGIC, GameRecorder, RecordWriter, iter_record_bodies, read_records
+from simulate import deal_deck, play_game
+
+
+def write_games(path, n, seed):
+    e = GameEngine()
+    e.recorder = GameRecorder(RecordWriter(path))
+    rng = random.Random(seed)
+    for _ in range(n):
+        play_game(e, deal_deck(rng))
+    e.recorder.close()
+
+
+class ArchiveTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "games.napr")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_random_access_matches_sequential_read(self):
+        write_games(self.path, 30, 0)
+        recs = list(read_records(self.path))
+        with GameArchive(self.path) as ar:
+            self.assertEqual(len(ar), 30)
+            self.assertEqual(ar[17], recs[17])
+            self.assertEqual(ar[-1], recs[-1])
+            self.assertEqual(list(ar.iter_range(5, 9)), recs[5:9])
+            with self.assertRaises(IndexError):
+                ar[30]
+
+            # A span is a valid record stream on its own.
+            span = bytes(ar.span(10, 20))
+            bodies = list(iter_record_bodies(io.BytesIO(FILE_MAGIC + span)))
+            self.assertEqual([bytes(ar.body(n)) for n in range(10, 20)], bodies)
+
+            offs = struct.unpack(f"<{len(ar)}Q", bytes(ar.offsets_buffer()))
+            self.assertEqual(list(offs), [ar.offset(n) for n in range(len(ar))])
+
+            picked = list(ar.sample(0.2, seed=1))
+            self.assertEqual(len(picked), 6)
+            self.assertEqual([r for _, r in picked], [recs[n] for n, _ in picked])
+
+    def test_index_grows_with_the_file(self):
+        write_games(self.path, 4, 0)
+        self.assertEqual(update_index(self.path), 4)
+        write_games(self.path, 3, 1)
+        with GameArchive(self.path) as ar:
+            self.assertEqual(len(ar), 7)
+            self.assertEqual(ar[6], list(read_records(self.path))[6])
+        self.assertEqual(os.path.getsize(index_path(self.path)), 8 + 7 * 8)
+
+    def test_empty_archive(self):
+        RecordWriter(self.path).close()
+        with GameArchive(self.path) as ar:
+            self.assertEqual(len(ar), 0)
+            self.assertEqual(len(ar.span(0, 10)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
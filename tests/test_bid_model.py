@@ -0,0 +1,47 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+
+from bid_model import _pool_adjacent, fit, run_chunk, write_table
+from bidding import TARGETS
+
+
+class BidModelTests(unittest.TestCase):
+    def test_pool_adjacent_is_monotone_and_weighted(self):
+        self.assertEqual(_pool_adjacent([0.1, 0.5, 0.3, 0.9], [1, 1, 3, 1]), [0.1, 0.35, 0.35, 0.9])
+        self.assertEqual(_pool_adjacent([0.2, 0.4], [5, 5]), [0.2, 0.4])
+
+    def test_fit_and_table_round_trip(self):
+        games = run_chunk(seed=3, start=0, count=30, samples=(1, 1))
+        self.assertEqual(len(games), 120)
+        self.assertEqual(run_chunk(seed=3, start=0, count=2, samples=(1, 1)), games[:8])
+        self.assertTrue(all(t in TARGETS and 0 <= pict <= 20 for _, t, pict in games))
+
+        lo, rows = fit(games)
+        self.assertEqual(lo, min(s for s, _, _ in games))
+        for row in rows:
+            self.assertEqual(row, sorted(row, reverse=True))
+        for k in range(len(TARGETS)):
+            col = [row[k] for row in rows]
+            self.assertEqual(col, sorted(col))
+
+        fd, path = tempfile.mkstemp(suffix=".py")
+        os.close(fd)
+        try:
+            write_table(path, lo, rows)
+            spec = importlib.util.spec_from_file_location("bid_table_test", path)
+            mod = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(mod)
+        finally:
+            os.remove(path)
+        self.assertEqual(mod.SCORE_MIN, lo)
+        self.assertEqual(mod.TARGETS, TARGETS)
+        self.assertEqual(len(mod.PROBS), len(rows) * len(TARGETS))
+        for i, row in enumerate(rows):
+            for k, p in enumerate(row):
+                self.assertAlmostEqual(mod.PROBS[i * len(TARGETS) + k] / 255, p, delta=0.5 / 255 + 1e-9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import random
+import unittest
+
+import bidding
+from bidding import (
+    best_bid,
+    hand_strength_score,
+    is_declaration_hand,
+    reach_probability,
+    suit_scores,
+    target_for_score,
+    threshold_target,
+)
+from engine import SUITS, cards_to_mask, deal_masks, mask_to_cards, rank, suit
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# The per-card heuristics as they were written before the lookup tables.
+def ref_suit_score(hand, suit_code):
+    score = 0
+    suit_count = 0
+    for c in hand:
+        if c == "Jo":
+            score += 5
+            continue
+        r = rank(c)
+        if suit(c) == suit_code:
+            suit_count += 1
+            score += 2
+            score += {"A": 6, "K": 5, "Q": 4, "J": 3, "0": 2}.get(r, 0)
+        elif r in {"A", "K"}:
+            score += 1
+    if suit_count >= 6:
+        score += 3
+    elif suit_count >= 5:
+        score += 2
+    elif suit_count >= 4:
+        score += 1
+    return score
+
+
+def ref_napo(hand):
+    strong = 0
+    decl_picts = 0
+    score = 0
+    picts = 0
+    for c in hand:
+        if c == "Jo":
+            strong += 3
+            score += 3
+            picts += 1
+            continue
+        r = rank(c)
+        if r in ["0", "J", "Q", "K", "A"]:
+            decl_picts += 1
+            picts += 1
+        if c == "sA":
+            strong += 3
+            score += 3
+        elif c == "hQ":
+            strong += 2
+            score += 2
+        elif r == "A":
+            strong += 2
+            score += 2
+        elif r in ("K", "Q"):
+            strong += 1
+            score += 1
+        elif r in ("J", "0"):
+            score += 0.5
+    if picts >= 10:
+        score += 2
+    elif picts >= 8:
+        score += 1
+    return strong >= 6 or decl_picts >= 8, int(score)
+
+
+def random_hands(n, seed=0):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        hands, _ = deal_masks(rng)
+        out.extend(hands)
+    # Long suits and picture-heavy hands, which random deals rarely produce.
+    out.append(cards_to_mask(["sA", "sK", "sQ", "sJ", "s0", "s9", "s8", "s7", "s6", "s5", "s4", "Jo"]))
+    out.append(cards_to_mask([f"{s}{r}" for s in "shd" for r in "AKQJ"]))
+    return out
+
+
+class BiddingTests(unittest.TestCase):
+    def test_tables_match_the_card_by_card_heuristics(self):
+        for m in random_hands(500):
+            hand = mask_to_cards(m)
+            scores = suit_scores(m)
+            self.assertEqual(scores, tuple(ref_suit_score(hand, s) for s in SUITS))
+            s, sc, target = best_bid(m)
+            self.assertEqual(sc, max(scores))
+            self.assertEqual(s, SUITS[scores.index(sc)])
+            self.assertEqual(target, target_for_score(sc))
+            self.assertEqual((is_declaration_hand(m), hand_strength_score(m)), ref_napo(hand))
+
+    def test_threshold_targets(self):
+        self.assertEqual(threshold_target(0), 13)
+        self.assertEqual(threshold_target(17), 14)
+        self.assertEqual(threshold_target(40), 18)
+        self.assertEqual(threshold_target(41), 19)
+
+    def test_target_table(self):
+        targets = [target_for_score(sc) for sc in range(-5, bidding.MAX_SCORE + 5)]
+        self.assertEqual(targets, sorted(targets))
+        self.assertTrue(set(targets) <= set(bidding.TARGETS))
+        if bidding.bid_table is None:
+            self.assertEqual(targets[5:-4], [threshold_target(sc) for sc in range(bidding.MAX_SCORE + 1)])
+            return
+        for sc in range(bidding.MAX_SCORE + 1):
+            reachable = [t for t in bidding.TARGETS if reach_probability(sc, t) >= bidding.BID_CONFIDENCE]
+            self.assertEqual(target_for_score(sc), max(reachable, default=bidding.MIN_TARGET))
+
+    @unittest.skipUnless(np is not None, "NumPy not installed")
+    def test_batch_matches_single_hand(self):
+        from bidding import best_bids_batch, deal_batch, napo_batch, suit_scores_batch
+
+        masks = random_hands(300, seed=1)
+        self.assertEqual(suit_scores_batch(masks).tolist(), [list(suit_scores(m)) for m in masks])
+        best, top, targets = best_bids_batch(masks)
+        declares, strength = napo_batch(masks)
+        for i, m in enumerate(masks):
+            self.assertEqual((SUITS[best[i]], top[i], targets[i]), best_bid(m))
+            self.assertEqual((bool(declares[i]), strength[i]), (is_declaration_hand(m), hand_strength_score(m)))
+
+        hands, mounts = deal_batch(50, seed=3)
+        for row, mount in zip(hands.tolist(), mounts.tolist()):
+            self.assertEqual([bin(h).count("1") for h in row], [12, 12, 12, 12])
+            self.assertEqual(row[0] | row[1] | row[2] | row[3] | mount, (1 << 53) - 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import json
+import os
+import unittest
+
+from build_atlas import CARD_WIDTH, MAX_PAGE, atlas_files, plan_pages
+
+CARDS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Cards")
+
+
+class BuildAtlasTests(unittest.TestCase):
+    def test_atlas_files(self):
+        files = atlas_files()
+        self.assertEqual(len(set(files)), 54)
+        for fn in files:
+            self.assertTrue(os.path.exists(os.path.join(CARDS_DIR, fn)), fn)
+
+    def test_plan_pages(self):
+        ids = [os.path.splitext(fn)[0] for fn in atlas_files()]
+        cell_h = round(726 * CARD_WIDTH / 500)
+        self.assertEqual(len(plan_pages(ids, CARD_WIDTH, cell_h)), 1)
+
+        for max_page in (MAX_PAGE, 700):
+            pages = plan_pages(ids, CARD_WIDTH, cell_h, max_page)
+            self.assertEqual(sorted(uid for _, regions in pages for uid in regions), sorted(ids))
+            for (w, h), regions in pages:
+                self.assertLessEqual(max(w, h), max_page)
+                boxes = list(regions.values())
+                for i, (x, y, rw, rh) in enumerate(boxes):
+                    self.assertTrue(0 <= x and x + rw <= w and 0 <= y and y + rh <= h)
+                    for x2, y2, _, _ in boxes[i + 1:]:
+                        self.assertTrue(abs(x - x2) >= rw or abs(y - y2) >= rh)
+
+    def test_committed_atlas_covers_every_card(self):
+        # buildozer.spec ships the atlas instead of the separate PNG files.
+        with open(os.path.join(CARDS_DIR, "cards.atlas"), encoding="utf-8") as f:
+            meta = json.load(f)
+        ids = [uid for regions in meta.values() for uid in regions]
+        self.assertEqual(sorted(ids), sorted(os.path.splitext(fn)[0] for fn in atlas_files()))
+        for page in meta:
+            self.assertTrue(os.path.exists(os.path.join(CARDS_DIR, page)), page)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+
+import engine
+from engine import (
+    CARD_CODES,
+    SUIT_MASK,
+    GameEngine,
+    Player,
+    build_deck_4p,
+    card_from_id,
+    card_id,
+    cards_to_mask,
+    mask_count,
+    mask_to_cards,
+    mask_to_moves,
+    sort_cards,
+)
+
+
+class CardEncodingTests(unittest.TestCase):
+    def test_every_deck_card_has_unique_id(self):
+        deck = build_deck_4p()
+        ids = [card_id(c) for c in deck]
+        self.assertEqual(len(set(ids)), 53)
+        self.assertEqual(sorted(ids), list(range(53)))
+        for c in deck:
+            self.assertEqual(card_from_id(card_id(c)), c)
+
+    def test_mask_round_trip_is_sorted(self):
+        hand = ["Jo", "c2", "sA", "h0", "d5", "s3"]
+        m = cards_to_mask(hand)
+        self.assertEqual(mask_count(m), len(hand))
+        self.assertEqual(mask_to_cards(m), sort_cards(hand))
+        self.assertEqual(mask_to_cards(cards_to_mask(CARD_CODES)), sort_cards(build_deck_4p()))
+
+    def test_suit_masks_partition_deck(self):
+        total = 0
+        for m in SUIT_MASK.values():
+            self.assertEqual(mask_count(m), 13)
+            self.assertEqual(total & m, 0)
+            total |= m
+        self.assertEqual(mask_count(total), 52)
+
+    def test_player_mask_follows_hand(self):
+        e = GameEngine()
+        e.players = [Player(1, True), Player(2, False), Player(3, False), Player(4, False)]
+        e.stage = "play"
+        e.turn_no = 3
+        e.obverse = "h"
+        e.leader_id = 1
+        e.players[0].cards = ["s9", "h2"]
+        self.assertEqual(e.players[0].mask, cards_to_mask(["s9", "h2"]))
+
+        ok, _ = e.play_card(1, "s9")
+        self.assertTrue(ok)
+        self.assertEqual(e.players[0].mask, cards_to_mask(["h2"]))
+
+    def test_new_game_masks_cover_deck(self):
+        e = GameEngine()
+        e.new_game()
+        total = e.mount_mask
+        for p in e.players:
+            self.assertEqual(p.mask, cards_to_mask(p.cards))
+            self.assertEqual(total & p.mask, 0)
+            total |= p.mask
+        self.assertEqual(total, cards_to_mask(CARD_CODES))
+
+    def test_legal_moves_are_shared_tuples(self):
+        e = GameEngine()
+        e.new_game(seed=2)
+        e.stage = "play"
+        e.turn_no = 2
+        moves = e.legal_moves(1)
+        self.assertIsInstance(moves, tuple)
+        self.assertEqual(list(moves), mask_to_cards(e.legal_mask(1)))
+        self.assertIs(e.legal_moves(1), moves)
+        # The cache follows the hand.
+        e.players[0].cards = e.players[0].cards[1:]
+        self.assertEqual(e.legal_moves(1), moves[1:])
+
+    def test_moves_cache_is_bounded(self):
+        for m in range(1, engine.MOVES_CACHE_SIZE + 10):
+            mask_to_moves(m)
+        self.assertLessEqual(len(engine._MOVES_CACHE), engine.MOVES_CACHE_SIZE)
+
+
+if __name__ == "__main__":
+    unittest.main()
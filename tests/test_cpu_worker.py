@@ -0,0 +1,70 @@
+import threading
+import unittest
+
+from cpu_worker import CpuWorker
+from tests.test_make_unmake import snapshot, start_play
+
+
+class CpuWorkerTests(unittest.TestCase):
+    def test_result_comes_back_from_a_snapshot(self):
+        e = start_play(1)
+        pid = e.next_player_id()
+        before = snapshot(e)
+        done = threading.Event()
+        got = []
+        w = CpuWorker()
+        job = w.submit(e, pid, lambda j: (got.append(j), done.set()))
+        self.assertTrue(done.wait(5))
+        self.assertIs(got[0], job)
+        self.assertEqual(job.card, e.cpu_choose(pid))
+        self.assertEqual(job.ply, len(e.history))
+        self.assertEqual(snapshot(e), before)
+        self.assertTrue(w.claim(job))
+        self.assertFalse(w.claim(job))
+
+    def test_cancel_stops_search_and_drops_result(self):
+        started = threading.Event()
+        finished = threading.Event()
+        called = []
+
+        def decide(engine, pid, stop):
+            started.set()
+            while not stop():
+                pass
+            finished.set()
+            return "sA"
+
+        w = CpuWorker(decide)
+        e = start_play(2)
+        job = w.submit(e, e.next_player_id(), called.append)
+        self.assertTrue(started.wait(5))
+        w.cancel()
+        self.assertTrue(job.cancelled)
+        self.assertTrue(finished.wait(5))
+        self.assertFalse(w.claim(job))
+        self.assertEqual(called, [])
+
+    def test_errors_are_reported(self):
+        def decide(engine, pid, stop):
+            raise ValueError("boom")
+
+        done = threading.Event()
+        w = CpuWorker(decide)
+        e = start_play(3)
+        job = w.submit(e, e.next_player_id(), lambda j: done.set())
+        self.assertTrue(done.wait(5))
+        self.assertIsInstance(job.error, ValueError)
+
+    def test_decide_per_job(self):
+        done = threading.Event()
+        w = CpuWorker(lambda engine, pid, stop: "sA")
+        e = start_play(4)
+        job = w.submit(e, e.napoleon_id, lambda j: done.set(), decide=lambda engine, pid, stop: engine.stage)
+        self.assertTrue(done.wait(5))
+        self.assertEqual(job.card, "play")
+        self.assertEqual(job.stage, "play")
+        self.assertIs(job.error, None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -203,6 +203,23 @@ class EngineRuleTests(unittest.TestCase):
         self.assertEqual(win_card, SPECIAL_MIGHTY)
         self.assertEqual(winner, 2)
 
+    def test_declaration_tables_follow_obverse(self):
+        e = self._fresh_engine()
+        e.stage = "bid"
+        ok, _ = e.set_declaration("d", 14)
+        self.assertTrue(ok)
+        self.assertEqual(e.strength("dJ"), 4300)
+        self.assertEqual(e.strength("hJ"), 4200)
+        self.assertTrue(e.is_special("hJ"))
+        self.assertFalse(e.is_special("sJ"))
+
+        # Direct obverse assignment (as in older callers) must not use stale tables.
+        e.obverse = "s"
+        self.assertEqual(e.strength("sJ"), 4300)
+        self.assertEqual(e.strength("cJ"), 4200)
+        self.assertEqual(e.strength("dJ"), 11)
+        self.assertFalse(e.is_special("dJ"))
+
     def test_joker_not_led_is_weaker_than_two(self):
         e = self._fresh_engine()
         e.stage = "play"
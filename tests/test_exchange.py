@@ -0,0 +1,83 @@
+import itertools
+import random
+import unittest
+
+from engine import SUITS, GameEngine, is_joker, suit
+from exchange import best_keeps, card_value, keep_candidates, pair_shape, plan_exchange
+
+
+def at_exchange(seed, lieut=None):
+    e = GameEngine(seed=seed)
+    e.new_game(seed=seed)
+    e.napoleon_id = 1 + seed % 4
+    e.set_declaration(SUITS[seed % 4], 13 + seed % 7)
+    e.set_lieut_card(lieut or e.cpu_lieut_card())
+    return e
+
+
+def brute_keeps(cards, value, shape, keep, forced_keep=(), forced_out=()):
+    out = []
+    for kept in itertools.combinations(cards, keep):
+        if any(c in kept for c in forced_out) or any(c not in kept for c in forced_keep):
+            continue
+        counts = tuple(sum(1 for c in kept if not is_joker(c) and suit(c) == s) for s in SUITS)
+        out.append(sum(value[c] for c in kept) + shape(counts))
+    return sorted(out, reverse=True)
+
+
+class ExchangeTests(unittest.TestCase):
+    def test_matches_brute_force(self):
+        rng = random.Random(5)
+        for seed in range(12):
+            e = at_exchange(seed)
+            cards = e.players[e.napoleon_id - 1].cards + e.mount
+            value = {c: card_value(c, e.obverse, e.target) for c in cards}
+            forced_keep = rng.sample(cards, 2) if seed % 2 else ()
+            forced_out = [c for c in cards if c not in forced_keep][:1] if seed % 3 == 0 else ()
+            found = best_keeps(cards, value, pair_shape, 12, 4, forced_keep, forced_out)
+            expect = brute_keeps(cards, value, pair_shape, 12, forced_keep, forced_out)[:4]
+            self.assertEqual(len(found), 4)
+            for (score, kept), best in zip(found, expect):
+                self.assertAlmostEqual(score, best)
+                self.assertEqual(len(kept), 12)
+                self.assertTrue(set(forced_keep) <= set(kept))
+                self.assertFalse(set(forced_out) & set(kept))
+
+    def test_lieut_card_stays_in_mount(self):
+        for seed in range(8):
+            e = at_exchange(seed)
+            e.set_lieut_card(max(e.mount, key=lambda c: card_value(c, e.obverse, e.target)))
+            self.assertTrue(e.lieut_in_mount)
+            for _, kept in keep_candidates(e, 3):
+                self.assertNotIn(e.lieut_card, kept)
+            e.cpu_exchange()
+            self.assertIn(e.lieut_card, e.mount)
+
+    def test_cpu_exchange_reaches_the_best_keep(self):
+        for seed in range(8):
+            e = at_exchange(seed)
+            nap = e.players[e.napoleon_id - 1]
+            both = nap.mask | e.mount_mask
+            _, best = keep_candidates(e)[0]
+            e.cpu_exchange()
+            self.assertEqual(nap.cards, best)
+            self.assertEqual(len(e.mount), 5)
+            self.assertEqual(nap.mask | e.mount_mask, both)
+
+    def test_max_swaps(self):
+        for seed in range(8):
+            e = at_exchange(seed)
+            need = len(set(keep_candidates(e)[0][1]) - set(e.players[e.napoleon_id - 1].cards))
+            self.assertEqual(e.clone().cpu_exchange(max_swaps=1), min(1, need))
+            self.assertEqual(e.cpu_exchange(), need)
+
+    def test_playout_ranking_picks_a_candidate(self):
+        e = at_exchange(3)
+        keeps = [kept for _, kept in keep_candidates(e, 3)]
+        kept = plan_exchange(e, top_k=3, time_budget=0.0, max_samples=1, rng=random.Random(0))
+        self.assertIn(kept, keeps)
+        self.assertEqual(e.stage, "exchange")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import random
+import unittest
+
+from ismcts import IsmctsPlayer
+from tests.test_make_unmake import snapshot, start_play
+
+
+class IsmctsTests(unittest.TestCase):
+    def test_choose_is_legal_and_leaves_engine_untouched(self):
+        e = start_play(1)
+        pid = e.next_player_id()
+        before = snapshot(e)
+        c = IsmctsPlayer(iterations=40, rng=random.Random(0)).choose(e, pid)
+        self.assertIn(c, e.legal_moves(pid))
+        self.assertEqual(snapshot(e), before)
+
+    def test_best_move_on_demand(self):
+        e = start_play(2)
+        pid = e.next_player_id()
+        p = IsmctsPlayer(iterations=50, rng=random.Random(0))
+        self.assertEqual(p.best_move(e, pid), e.cpu_choose(pid))
+        self.assertEqual(p.search(e, pid, max_iterations=5), 5)
+        self.assertFalse(p.finished(e, pid))
+        self.assertIn(p.best_move(e, pid), e.legal_moves(pid))
+        p.search(e, pid)
+        self.assertTrue(p.finished(e, pid))
+
+    def test_slice_runs_at_least_one_iteration(self):
+        e = start_play(3)
+        p = IsmctsPlayer(iterations=10**6, time_budget=10.0, rng=random.Random(0))
+        self.assertGreaterEqual(p.search(e, e.next_player_id(), max_time=0.0), 1)
+
+    def test_tree_is_reused_within_a_game_only(self):
+        e = start_play(4)
+        p = IsmctsPlayer(iterations=200, rng=random.Random(0))
+        pid = e.next_player_id()
+        c = p.choose(e, pid)
+        e.play_card(pid, c)
+        # The next play is still inside the searched tree.
+        q = e.next_player_id()
+        e.play_card(q, e.cpu_choose(q))
+        self.assertGreater(p._root(e, pid)[0].visits, 0)
+
+        other = start_play(5)
+        self.assertEqual(p._root(other, pid)[0].visits, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
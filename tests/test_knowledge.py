@@ -0,0 +1,69 @@
+import random
+import unittest
+
+from engine import CARD_BIT, FACE_DOWN, FULL_MASK, MIGHTY_BIT, SUIT_MASK, suit
+from tests.test_make_unmake import start_play
+
+
+def rescan(e):
+    # seen_mask / possible_masks recomputed from the history.
+    seen = 0
+    possible = [FULL_MASK] * 5
+    n_done = len(e.history) - len(e.turn_cards)
+    lead = ""
+    for i, (p, c, sh) in enumerate(e.history):
+        if i % 4 == 0:
+            lead = e.obverse if c == "Jo" else suit(c)
+        if sh == FACE_DOWN:
+            possible[p - 1] &= ~SUIT_MASK.get(lead, 0)
+        elif i % 4 and lead == "s" and suit(c) not in ("s", ""):
+            # The only Spade left in that hand is sA.
+            possible = [m if k == p - 1 else m & ~MIGHTY_BIT for k, m in enumerate(possible)]
+            possible[p - 1] &= ~SUIT_MASK["s"] | MIGHTY_BIT
+        if sh != FACE_DOWN or i < n_done:
+            seen |= CARD_BIT[c]
+    return seen, [m & ~seen for m in possible]
+
+
+class KnowledgeTests(unittest.TestCase):
+    def test_incremental_matches_rescan_and_the_real_deal(self):
+        for seed in range(10):
+            e = start_play(seed)
+            rng = random.Random(seed)
+            states = []
+            while e.stage == "play":
+                states.append((e.seen_mask, list(e.possible_masks)))
+                self.assertEqual((e.seen_mask, e.possible_masks), rescan(e))
+                for p in e.players:
+                    self.assertEqual(p.mask & ~e.possible_mask(p.id), 0)
+                self.assertEqual(e.mount_mask & ~e.possible_masks[4], 0)
+                pid = e.next_player_id()
+                e.push_move(pid, rng.choice(e.legal_moves(pid)))
+            self.assertEqual(e.seen_mask, FULL_MASK & ~e.mount_mask)
+            while states:
+                e.pop_move()
+                self.assertEqual((e.seen_mask, e.possible_masks), states.pop())
+
+    def test_face_down_play_marks_a_void(self):
+        e = start_play(2)
+        while e.stage == "play":
+            pid = e.next_player_id()
+            e.play_card(pid, e.cpu_choose(pid))
+            if e.turn_cards and e.turn_display[-1][1] == FACE_DOWN:
+                self.assertTrue(e.is_void(pid, e.first_suit))
+                self.assertFalse(e.players[pid - 1].mask & SUIT_MASK[e.first_suit])
+                return
+        self.fail("no face-down play in this deal")
+
+    def test_known_lieut_after_reveal(self):
+        e = start_play(1)
+        while e.stage == "play":
+            self.assertEqual(e.known_lieut_id(), e.lieut_id if e.lieut_revealed else None)
+            pid = e.next_player_id()
+            e.play_card(pid, e.cpu_choose(pid))
+        if not e.lieut_in_mount:
+            self.assertEqual(e.known_lieut_id(), e.lieut_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import random
+import time
+import unittest
+
+from engine import GameEngine, SPECIAL_MIGHTY
+from lieut import LieutCaller, candidate_cards
+
+
+def at_lieut(seed):
+    e = GameEngine(seed=seed)
+    e.new_game(seed=seed)
+    e.napoleon_id = 1 + seed % 4
+    e.set_declaration("shdc"[seed % 4], 14 + seed % 5)
+    return e
+
+
+class LieutTests(unittest.TestCase):
+    def test_candidates_are_outside_cards(self):
+        for seed in range(6):
+            e = at_lieut(seed)
+            hand = e.players[e.napoleon_id - 1].cards
+            cands = candidate_cards(hand, e.obverse, e.target)
+            self.assertEqual(len(cands), 6)
+            self.assertFalse(set(cands) & set(hand))
+            if SPECIAL_MIGHTY not in hand:
+                self.assertEqual(cands[0], SPECIAL_MIGHTY)
+
+    def test_call_is_memoized_per_signature(self):
+        e = at_lieut(1)
+        caller = LieutCaller(max_samples=2, rng=random.Random(0))
+        c = caller.call(e)
+        self.assertEqual(caller.last_samples, 2)
+        self.assertIn(c, candidate_cards(e.players[e.napoleon_id - 1].cards, e.obverse, e.target))
+        self.assertEqual(caller.call(e.clone()), c)
+        self.assertEqual(caller.last_samples, 0)
+        ok, _ = e.set_lieut_card(c)
+        self.assertTrue(ok)
+
+    def test_budget_is_strict(self):
+        e = at_lieut(2)
+        hand = e.players[e.napoleon_id - 1].cards
+        caller = LieutCaller(time_budget=0.0, rng=random.Random(0))
+        self.assertEqual(caller.choose(hand, e.obverse, e.target), candidate_cards(hand, e.obverse, e.target)[0])
+        self.assertEqual(caller.last_samples, 0)
+        self.assertEqual(caller.cache, {})
+
+        caller = LieutCaller(time_budget=0.05, rng=random.Random(0))
+        t0 = time.perf_counter()
+        caller.choose(hand, e.obverse, e.target)
+        # At most one playout past the deadline.
+        self.assertLess(time.perf_counter() - t0, 0.15)
+
+
+if __name__ == "__main__":
+    unittest.main()
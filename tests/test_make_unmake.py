@@ -0,0 +1,116 @@
+import random
+import tracemalloc
+import unittest
+
+from engine import GameEngine, Player, bid_key
+from simulate import deal_deck
+
+
+def snapshot(e):
+    return (
+        [(list(p.cards), p.mask, p.role, p.revealed_role) for p in e.players],
+        list(e.turn_cards),
+        list(e.turn_display),
+        e.first_card,
+        e.first_suit,
+        e.leader_id,
+        e.turn_no,
+        e.stage,
+        e.lieut_id,
+        e.lieut_in_mount,
+        e.lieut_revealed,
+        dict(e.pict_won_count),
+        {k: list(v) for k, v in e.pict_won_cards.items()},
+        list(e.history),
+    )
+
+
+def start_play(seed):
+    e = GameEngine()
+    e.new_game(deal_deck(random.Random(seed)))
+    bid = max((e.cpu_best_bid(pid) for pid in (1, 2, 3, 4)), key=bid_key)
+    e.napoleon_id = bid["pid"]
+    e.set_declaration(bid["suit"], bid["target"])
+    e.set_lieut_card(e.cpu_lieut_card())
+    e.cpu_exchange()
+    e.finish_exchange()
+    return e
+
+
+class MakeUnmakeTests(unittest.TestCase):
+    def test_pop_restores_every_ply_of_a_full_game(self):
+        for seed in range(12):
+            e = start_play(seed)
+            rng = random.Random(seed)
+            snaps = []
+            while e.stage == "play":
+                snaps.append(snapshot(e))
+                pid = e.next_player_id()
+                ok, _ = e.push_move(pid, rng.choice(e.legal_moves(pid)))
+                self.assertTrue(ok)
+            self.assertEqual(len(snaps), 48)
+            while snaps:
+                e.pop_move()
+                self.assertEqual(snapshot(e), snaps.pop())
+
+    def test_push_matches_play_card(self):
+        a = start_play(3)
+        b = start_play(3)
+        while a.stage == "play":
+            pid = a.next_player_id()
+            c = a.cpu_choose(pid)
+            self.assertEqual(a.push_move(pid, c), b.play_card(pid, c))
+            self.assertEqual(snapshot(a), snapshot(b))
+
+    def test_clone_is_independent(self):
+        e = start_play(6)
+        before = snapshot(e)
+        c = e.clone()
+        self.assertEqual(snapshot(c), before)
+        while c.stage == "play":
+            pid = c.next_player_id()
+            c.play_card(pid, c.cpu_choose(pid))
+        self.assertEqual(len(c.history), 48)
+        self.assertEqual(snapshot(e), before)
+
+    def test_rejected_move_leaves_no_undo_entry(self):
+        e = start_play(5)
+        pid = e.next_player_id()
+        before = snapshot(e)
+        ok, _ = e.push_move(pid, "BACK")
+        self.assertFalse(ok)
+        self.assertEqual(snapshot(e), before)
+        with self.assertRaises(IndexError):
+            e.pop_move()
+
+    def test_clone_copies_every_slot(self):
+        e = start_play(7)
+        for _ in range(6):
+            pid = e.next_player_id()
+            e.play_card(pid, e.cpu_choose(pid))
+        c = e.clone()
+        self.assertFalse(hasattr(c, "__dict__") or hasattr(c.players[0], "__dict__"))
+        for name in GameEngine.__slots__:
+            self.assertTrue(hasattr(c, name), name)
+        for name in Player.__slots__:
+            self.assertTrue(hasattr(c.players[0], name), name)
+        self.assertEqual(sum(c.pict_won_count.values()), sum(len(v) for v in c.pict_won_cards.values()))
+
+    def test_clone_memory(self):
+        # Target: a mid-game clone stays under 2.5 KB (was ~5.9 KB with dict-backed state).
+        e = start_play(8)
+        for _ in range(22):
+            pid = e.next_player_id()
+            e.play_card(pid, e.cpu_choose(pid))
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            clones = [e.clone() for _ in range(200)]
+            per_clone = (tracemalloc.get_traced_memory()[0] - before) / len(clones)
+        finally:
+            tracemalloc.stop()
+        self.assertLess(per_clone, 2500)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import random
+import unittest
+
+from collections import Counter
+
+from engine import CARD_BIT, FACE_DOWN, cards_to_mask, mask_count
+from pimc import PimcPlayer, _deal_slots, hidden_view, sample_world
+from solver import SOLVER_MAX_TRICKS
+from tests.test_make_unmake import snapshot, start_play
+
+
+class PimcTests(unittest.TestCase):
+    def test_samples_agree_with_public_information(self):
+        rng = random.Random(0)
+        for seed in range(6):
+            e = start_play(seed)
+            while e.stage == "play":
+                pid = e.next_player_id()
+                for pov in (1, 2, 3, 4):
+                    unseen, slots = hidden_view(e, pov)
+                    self.assertEqual(mask_count(unseen), sum(size for _, size, _ in slots))
+                    # The real deal is one of the deals being sampled from.
+                    for owner, _, allowed in slots:
+                        if isinstance(owner, int):
+                            self.assertEqual(e.players[owner - 1].mask & ~allowed, 0)
+
+                    w = sample_world(e, pov, rng)
+                    self.assertEqual(w.players[pov - 1].cards, e.players[pov - 1].cards)
+                    self.assertEqual(w.turn_display, e.turn_display)
+                    for (p, c), (_, sh) in zip(w.turn_cards, w.turn_display):
+                        if sh != FACE_DOWN:
+                            self.assertEqual(c, sh)
+                    for p in w.players:
+                        self.assertEqual(len(p.cards), len(e.players[p.id - 1].cards))
+                e.play_card(pid, e.cpu_choose(pid))
+
+    def test_dead_ends_deal_by_exact_counting(self):
+        rng = random.Random(1)
+        e = start_play(3)
+        while e.stage == "play":
+            pid = e.next_player_id()
+            for pov in (1, 2, 3, 4):
+                unseen, slots = hidden_view(e, pov)
+                dealt = _deal_slots(unseen, slots, rng, tries=0)
+                for owner, size, allowed in slots:
+                    self.assertEqual(len(dealt[owner]), size)
+                    self.assertEqual(cards_to_mask(dealt[owner]) & ~allowed, 0)
+                self.assertEqual(sum(map(cards_to_mask, dealt.values())), unseen)
+            e.play_card(pid, e.cpu_choose(pid))
+
+        # Two fitting deals (sA or sK to slot 1) are drawn equally often.
+        unseen = cards_to_mask(["sA", "sK", "sQ"])
+        slots = [(1, 1, cards_to_mask(["sA", "sK"])), (2, 2, unseen)]
+        counts = Counter(_deal_slots(unseen, slots, rng, tries=0)[1][0] for _ in range(2000))
+        self.assertEqual(set(counts), {"sA", "sK"})
+        self.assertLess(abs(counts["sA"] - 1000), 150)
+
+    def test_void_from_face_down_play(self):
+        e = start_play(2)
+        while e.stage == "play":
+            pid = e.next_player_id()
+            e.play_card(pid, e.cpu_choose(pid))
+            if e.turn_cards and e.turn_display[-1][1] == FACE_DOWN:
+                lead = e.first_suit
+                _, slots = hidden_view(e, pid % 4 + 1)
+                allowed = {owner: a for owner, _, a in slots}
+                self.assertEqual(allowed[pid] & CARD_BIT[lead + "3"], 0)
+                return
+        self.fail("no face-down play in this deal")
+
+    def test_choose_is_legal_seeded_and_pure(self):
+        e = start_play(4)
+        pid = e.next_player_id()
+        before = snapshot(e)
+        a = PimcPlayer(max_samples=3, rng=random.Random(1)).choose(e, pid)
+        b = PimcPlayer(max_samples=3, rng=random.Random(1)).choose(e, pid)
+        self.assertEqual(a, b)
+        self.assertIn(a, e.legal_moves(pid))
+        self.assertEqual(snapshot(e), before)
+
+    def test_solver_depth_is_capped(self):
+        self.assertEqual(PimcPlayer(solver_tricks=13).solver_tricks, SOLVER_MAX_TRICKS)
+
+    def test_time_budget_stops_sampling(self):
+        e = start_play(5)
+        p = PimcPlayer(time_budget=0.0, rng=random.Random(0))
+        p.choose(e, e.next_player_id())
+        self.assertEqual(p.last_samples, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
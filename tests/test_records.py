@@ -0,0 +1,107 @@
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from engine import GameEngine
+from records import (
+    FILE_MAGIC,
+    GameRecorder,
+    RecordWriter,
+    decode_record,
+    encode_record,
+    iter_record_bodies,
+    net_swaps,
+    read_records,
+)
+from simulate import deal_deck, play_game
+
+
+class RecordTests(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".napr")
+        os.close(fd)
+        os.remove(self.path)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_games_round_trip_through_a_file(self):
+        e = GameEngine()
+        e.recorder = GameRecorder(RecordWriter(self.path))
+        rng = random.Random(0)
+        expected = []
+        for _ in range(5):
+            deck = deal_deck(rng)
+            dealt = GameEngine()
+            dealt.new_game(deck)
+            play_game(e, deck)
+            expected.append(
+                (
+                    [list(p.cards) for p in dealt.players],
+                    list(dealt.mount),
+                    [(c, sh) for _, c, sh in e.history],
+                    (e.napoleon_id, e.obverse, e.target, e.lieut_card),
+                )
+            )
+        e.recorder.close()
+
+        recs = list(read_records(self.path))
+        self.assertEqual(len(recs), 5)
+        for rec, (hands, mount, plays, decl) in zip(recs, expected):
+            self.assertEqual(rec["hands"], hands)
+            self.assertEqual(rec["mount"], mount)
+            self.assertEqual(rec["plays"], plays)
+            self.assertEqual(len(plays), 48)
+            self.assertEqual((rec["napoleon_id"], rec["obverse"], rec["target"], rec["lieut_card"]), decl)
+            self.assertEqual(len(rec["bids"]), 4)
+            self.assertEqual(decode_record(encode_record(rec)), rec)
+
+    def test_unfinished_game_seed_and_search_moves(self):
+        e = GameEngine()
+        e.recorder = GameRecorder(RecordWriter(self.path))
+        e.new_game(deal_deck(random.Random(1)), seed=123)
+        e.napoleon_id = 2
+        e.set_declaration("h", 14)
+        e.set_lieut_card(e.cpu_lieut_card())
+        e.cpu_exchange()
+        e.finish_exchange()
+        pid = e.next_player_id()
+        e.push_move(pid, e.legal_moves(pid)[0])
+        e.pop_move()
+        e.play_card(pid, e.legal_moves(pid)[0])
+        e.new_game(deal_deck(random.Random(2)))  # flushes the unfinished game
+        e.recorder.close()  # and the untouched one
+
+        first, second = read_records(self.path)
+        self.assertEqual(first["seed"], 123)
+        self.assertEqual((first["napoleon_id"], first["obverse"], first["target"]), (2, "h", 14))
+        self.assertEqual(len(first["plays"]), 1)
+        self.assertIsNone(second["seed"])
+        self.assertEqual(second["obverse"], "")
+        self.assertEqual(second["plays"], [])
+
+    def test_reader_stops_at_a_torn_tail(self):
+        w = RecordWriter(self.path)
+        rec = {"hands": [["s2"] * 12] * 4, "mount": ["Jo"] * 5, "plays": [("hA", "BACK")]}
+        w.write(rec)
+        w.write(rec)
+        w.close()
+        with open(self.path, "rb") as f:
+            data = f.read()
+        bodies = list(iter_record_bodies(io.BytesIO(data[:-3])))
+        self.assertEqual(len(bodies), 1)
+        self.assertEqual(decode_record(bodies[0])["plays"], [("hA", "BACK")])
+        with self.assertRaises(ValueError):
+            list(iter_record_bodies(io.BytesIO(b"nope" + data[len(FILE_MAGIC):])))
+
+    def test_net_swaps(self):
+        hand = ["s2", "s3", "h4"]
+        swaps = [("s2", "dA"), ("dA", "s2"), ("s3", "cK"), ("h4", "Jo")]
+        self.assertEqual(net_swaps(hand, swaps), [("s3", "cK"), ("h4", "Jo")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import random
+import tempfile
+import unittest
+
+from engine import GameEngine
+from records import GameRecorder, RecordWriter, read_records
+from replay import Replay, deck_for_deal
+from simulate import deal_deck, play_game
+from tests.test_make_unmake import snapshot
+
+
+class SnapshotRecorder(GameRecorder):
+    # Keeps the engine state after every play next to the record.
+    def __init__(self, writer):
+        super().__init__(writer)
+        self.states = []
+
+    def on_new_game(self, engine, seed=None):
+        super().on_new_game(engine, seed)
+        self.states.append([])
+
+    def on_play(self, engine, c, shown):
+        super().on_play(engine, c, shown)
+        self.states[-1].append(snapshot(engine))
+
+
+class ReplayTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "games.napr")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def _record(self, n):
+        e = GameEngine()
+        e.recorder = SnapshotRecorder(RecordWriter(self.path))
+        rng = random.Random(3)
+        for _ in range(n):
+            play_game(e, deal_deck(rng))
+        e.recorder.close()
+        return list(read_records(self.path)), e.recorder.states
+
+    def test_every_ply_matches_the_live_game(self):
+        recs, states = self._record(4)
+        for rec, live in zip(recs, states):
+            r = Replay(rec, every=5)
+            for ply in (48, 0, 7, 20, 13, 47):
+                e = r.at(ply)
+                if ply:
+                    self.assertEqual(snapshot(e), live[ply - 1])
+                else:
+                    self.assertEqual(e.stage, "play")
+                    self.assertEqual(e.history, [])
+
+    def test_seek_by_trick_and_seat(self):
+        recs, _ = self._record(1)
+        r = Replay(recs[0])
+        seats = r.seats()
+        self.assertEqual(len(seats), 48)
+        e = r.at_trick(9, seat=3)
+        self.assertEqual(e.turn_no, 9)
+        self.assertEqual(e.next_player_id(), 3)
+        self.assertEqual(seats[len(e.history)], 3)
+        self.assertEqual(r.ply_of(9), 32)
+        # Snapshots are never handed out: modifying a result does not leak.
+        e.play_card(3, e.legal_moves(3)[0])
+        self.assertEqual(len(r.at_trick(9, seat=3).history), len(e.history) - 1)
+
+    def test_deck_for_deal(self):
+        e = GameEngine()
+        e.new_game(deal_deck(random.Random(0)))
+        hands = [list(p.cards) for p in e.players]
+        again = GameEngine()
+        again.new_game(deck_for_deal(hands, e.mount))
+        self.assertEqual([p.cards for p in again.players], hands)
+        self.assertEqual(again.mount, e.mount)
+
+    def test_bad_record_is_reported(self):
+        recs, _ = self._record(1)
+        rec = recs[0]
+        rec["plays"][5] = rec["plays"][4]
+        with self.assertRaises(ValueError):
+            Replay(rec).at(6)
+
+
+if __name__ == "__main__":
+    unittest.main()
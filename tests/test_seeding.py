@@ -0,0 +1,57 @@
+import random
+import unittest
+
+from engine import FULL_MASK, GameEngine, deal_masks, mask_count
+from simulate import play_game, simulate
+
+
+def hands(e):
+    return [list(p.cards) for p in e.players], list(e.mount)
+
+
+class SeedingTests(unittest.TestCase):
+    def test_seeded_deals_are_reproducible(self):
+        a = GameEngine(seed=7)
+        b = GameEngine(seed=7)
+        a.new_game()
+        b.new_game()
+        self.assertEqual(hands(a), hands(b))
+        a.new_game(seed=99)
+        c = GameEngine()
+        c.new_game(seed=99)
+        self.assertEqual(hands(a), hands(c))
+        c.new_game(seed=100)
+        self.assertNotEqual(hands(a), hands(c))
+
+    def test_deal_masks_partition_the_deck(self):
+        rng = random.Random(0)
+        for _ in range(50):
+            hs, mount = deal_masks(rng)
+            self.assertEqual([mask_count(m) for m in hs], [12, 12, 12, 12])
+            self.assertEqual(mask_count(mount), 5)
+            total = mount
+            for m in hs:
+                self.assertEqual(total & m, 0)
+                total |= m
+            self.assertEqual(total, FULL_MASK)
+
+    def test_global_random_is_not_used(self):
+        random.seed(1)
+        state = random.getstate()
+        play_game(GameEngine(), seed=3)
+        GameEngine().new_game()
+        self.assertEqual(random.getstate(), state)
+
+    def test_clone_has_its_own_stream(self):
+        e = GameEngine(seed=4)
+        c = e.clone()
+        self.assertEqual(c.rng.random(), e.rng.random())
+        c.rng.random()
+        self.assertNotEqual(c.rng.getstate(), e.rng.getstate())
+
+    def test_simulate_is_reproducible(self):
+        self.assertEqual(simulate(5, seed=1), simulate(5, seed=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import random
+import unittest
+
+from engine import GameEngine, cards_to_mask, is_pict
+from simulate import deal_deck, play_game, simulate
+
+
+class SimulateTests(unittest.TestCase):
+    def test_games_finish_and_account_for_every_pict(self):
+        engine = GameEngine()
+        rng = random.Random(7)
+        for _ in range(20):
+            res = play_game(engine, deal_deck(rng))
+            self.assertTrue(res["done"])
+            self.assertEqual(engine.stage, "done")
+            for p in engine.players:
+                self.assertEqual(p.cards, [])
+            mount_pict = sum(1 for c in engine.mount if is_pict(c))
+            self.assertEqual(res["total_pict"] + mount_pict, 20)
+            self.assertEqual(sum(res["pict_won_count"].values()), res["total_pict"])
+
+    def test_same_seed_gives_same_results(self):
+        self.assertEqual(simulate(15, seed=3), simulate(15, seed=3))
+        self.assertNotEqual(simulate(15, seed=3), simulate(15, seed=4))
+
+    def test_fixed_deal_is_dealt_from_deck(self):
+        deck = deal_deck(random.Random(11))
+        e = GameEngine()
+        e.new_game(deck)
+        # Mount takes the last 5 cards, then hands are dealt round-robin.
+        self.assertEqual(e.mount_mask, cards_to_mask(deck[-5:]))
+        self.assertEqual(e.players[0].mask, cards_to_mask(deck[-6::-4][:12]))
+
+
+if __name__ == "__main__":
+    unittest.main()
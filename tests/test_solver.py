@@ -0,0 +1,59 @@
+import unittest
+
+from solver import Solver, nap_pict_now, solve
+from tests.test_make_unmake import snapshot, start_play
+
+
+def play_until(e, tricks_left):
+    while e.stage == "play" and (e.turn_no <= 12 - tricks_left or e.turn_cards):
+        pid = e.next_player_id()
+        e.play_card(pid, e.cpu_choose(pid))
+    return e
+
+
+def brute_force(e, nap_ids):
+    if e.stage != "play":
+        return 0
+    pid = e.next_player_id()
+    vals = []
+    for c in e.legal_moves(pid):
+        _, res = e.push_move(pid, c)
+        gain = len(res["picts"]) if res["turn_complete"] and res["winner_id"] in nap_ids else 0
+        vals.append(gain + brute_force(e, nap_ids))
+        e.pop_move()
+    return max(vals) if pid in nap_ids else min(vals)
+
+
+class SolverTests(unittest.TestCase):
+    def test_matches_brute_force_on_last_tricks(self):
+        for seed in range(15):
+            e = play_until(start_play(seed), 3)
+            s = Solver(e)
+            c, v = s.best_move()
+            self.assertEqual(v, nap_pict_now(e) + brute_force(e, s.nap_ids), seed)
+            self.assertEqual(Solver(e).move_values()[c], v)
+
+    def test_mid_trick_position(self):
+        e = play_until(start_play(4), 2)
+        pid = e.next_player_id()
+        e.play_card(pid, e.cpu_choose(pid))
+        s = Solver(e)
+        vals = s.move_values()
+        self.assertEqual(set(vals), set(e.legal_moves(e.next_player_id())))
+        _, v = s.best_move()
+        self.assertEqual(v, nap_pict_now(e) + brute_force(e, s.nap_ids))
+
+    def test_solve_leaves_engine_untouched(self):
+        e = play_until(start_play(7), 5)
+        before = snapshot(e)
+        c, v = solve(e)
+        self.assertIn(c, e.legal_moves(e.next_player_id()))
+        self.assertEqual(snapshot(e), before)
+
+    def test_finished_game(self):
+        e = play_until(start_play(1), 0)
+        self.assertEqual(solve(e), (None, nap_pict_now(e)))
+
+
+if __name__ == "__main__":
+    unittest.main()
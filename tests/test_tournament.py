@@ -0,0 +1,28 @@
+import unittest
+
+from tournament import engine_policy, resolve_policy, run_tournament, wilson_interval
+
+
+class TournamentTests(unittest.TestCase):
+    def test_results_do_not_depend_on_workers_or_chunks(self):
+        seats = ["engine", "tournament:engine_policy", "engine", "tournament:engine_policy"]
+        a = run_tournament(24, seats, seed=5, workers=1, chunk_size=24)
+        b = run_tournament(24, seats, seed=5, workers=2, chunk_size=7)
+        self.assertEqual(a, b)
+        self.assertEqual(a["engine"]["seat_games"], 48)
+
+    def test_resolve_policy(self):
+        self.assertIs(resolve_policy("engine"), engine_policy)
+        self.assertIs(resolve_policy("tournament:engine_policy"), engine_policy)
+        with self.assertRaises(ValueError):
+            resolve_policy("nope")
+
+    def test_wilson_interval_contains_rate(self):
+        lo, hi = wilson_interval(30, 100)
+        self.assertLess(lo, 0.3)
+        self.assertGreater(hi, 0.3)
+        self.assertEqual(wilson_interval(0, 0), (0.0, 0.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import random
+import unittest
+
+from engine import GameEngine
+from simulate import deal_deck
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@unittest.skipUnless(np is not None, "NumPy not installed")
+class TrickBatchTests(unittest.TestCase):
+    def _collect(self, n_games):
+        from trick_batch import encode_trick
+
+        rows, expected = [], []
+        e = GameEngine()
+        rng = random.Random(0)
+        for _ in range(n_games):
+            e.new_game(deal_deck(rng))
+            bid = e.cpu_best_bid(1)
+            e.napoleon_id = 1
+            e.set_declaration(bid["suit"], bid["target"])
+            e.set_lieut_card(e.cpu_lieut_card())
+            e.cpu_exchange()
+            e.finish_exchange()
+            while e.stage == "play":
+                pid = e.next_player_id()
+                if len(e.turn_cards) == 3:
+                    e.turn_cards.append((pid, e.cpu_choose(pid)))
+                    e.turn_display.append((pid, e._shown_code_for_play(pid, e.turn_cards[-1][1])))
+                    rows.append(encode_trick(e))
+                    expected.append((e.judge_turn_winner()[0], len(e._pict_cards_in_turn())))
+                    c = e.turn_cards.pop()[1]
+                    e.turn_display.pop()
+                    e.play_card(pid, c)
+                else:
+                    e.play_card(pid, e.cpu_choose(pid))
+        return rows, expected
+
+    def test_matches_judge_turn_winner_on_played_tricks(self):
+        from trick_batch import judge_tricks
+
+        rows, expected = self._collect(60)
+        cards, obverse, leader, face_down, turn_no = (np.array(col) for col in zip(*rows))
+        winner, picts = judge_tricks(cards, obverse, leader, face_down, turn_no)
+        self.assertEqual(list(zip(winner.tolist(), picts.tolist())), expected)
+
+    def test_special_rules(self):
+        from engine import CARD_ID
+        from trick_batch import judge_tricks
+
+        def ids(*cs):
+            return [CARD_ID[c] for c in cs]
+
+        cases = [
+            # cards, obverse, leader, face_down, turn, expected winner
+            (ids("Jo", "hA", "h2", "h3"), 1, 2, [0, 0, 0, 0], 3, 2),  # Joker lead dominates
+            (ids("Jo", "sA", "h2", "h3"), 1, 2, [0, 0, 0, 0], 3, 3),  # ...but not over Mighty
+            (ids("dK", "sA", "hQ", "d3"), 2, 1, [0, 1, 1, 0], 3, 3),  # Yoromeki
+            (ids("d5", "d2", "d9", "dA"), 0, 4, [0, 0, 0, 0], 5, 1),  # 2-rule
+            (ids("d5", "d2", "d9", "dA"), 0, 4, [0, 0, 0, 0], 1, 3),  # no 2-rule on turn 1
+            (ids("d5", "s3", "d9", "dA"), 0, 1, [0, 1, 0, 0], 5, 2),  # face-down obverse trump
+            (ids("d5", "s3", "d9", "dA"), 0, 1, [0, 0, 0, 0], 5, 4),  # face-up off-suit loses
+        ]
+        cards, obverse, leader, face_down, turn_no, want = (np.array(col) for col in zip(*cases))
+        winner, picts = judge_tricks(cards, obverse, leader, face_down, turn_no)
+        self.assertEqual(winner.tolist(), want.tolist())
+        self.assertEqual(picts.tolist(), [1, 1, 3, 1, 1, 1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
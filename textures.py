@@ -0,0 +1,115 @@
+# textures.py
+# Napoleon (Kivy) - card textures decoded once and scaled to the on-screen size.
+#
+# Every card image (PNG file, or atlas region from build_atlas.py) is decoded
+# into a source texture. For each card size on screen (Root.compute_card_sizes:
+# hand, mount, table) a copy is rendered at that pixel size through an Fbo, so
+# the GPU samples a texture the size of the widget instead of the 500x726
+# original: less texture memory traffic and fill rate per frame.
+#
+# Scaled textures are keyed by (card, width, height). set_sizes() names the
+# sizes in use, drops every other size (the window was resized) and queues the
+# missing ones, card by card. The queue is worked off on the Kivy clock, a few
+# milliseconds per frame, because GL calls must stay on the main thread. get()
+# scales on demand when a card is needed before its turn comes.
+#
+# A source texture is released as soon as the card has all its sizes, and the
+# Fbos drop their drawing instructions after rendering, so only the scaled
+# textures stay in memory. After a GL context loss (Android pause / resume)
+# the Fbos come back empty; _reload() decodes the sources again and re-renders
+# into the same Fbos, so widgets keep their texture objects.
+
+import time
+
+from kivy.clock import Clock
+from kivy.core.image import Image as CoreImage
+from kivy.graphics import ClearBuffers, ClearColor, Color, Fbo, Rectangle
+from kivy.graphics.context import get_context
+
+WARM_FRAME_SEC = 0.004  # warm-up time per frame
+
+
+class CardTextures:
+    """Scaled card textures; source_of(card code) -> image source ("" if none)."""
+
+    def __init__(self, source_of):
+        self.source_of = source_of
+        self.sources = {}  # card -> full-size texture (or None without an image), while sizes are missing
+        self.scaled = {}  # (card, w, h) -> (texture, fbo)
+        self.sizes = set()
+        self._queue = []
+        self._event = None
+        get_context().add_reload_observer(self._reload)
+
+    def _source(self, c):
+        if c not in self.sources:
+            src = self.source_of(c)
+            tex = None
+            if src:
+                # Atlas regions share one page texture and cannot have their own mipmaps.
+                mipmap = not src.startswith("atlas://")
+                tex = CoreImage(src, mipmap=mipmap).texture
+                tex.min_filter = "linear_mipmap_linear" if mipmap else "linear"
+                tex.mag_filter = "linear"
+            self.sources[c] = tex
+        return self.sources[c]
+
+    def _release(self, c):
+        # Drop the source once every size in use is scaled (or the card has no image).
+        if self.sources.get(c) is None or all((c, w, h) in self.scaled for w, h in self.sizes):
+            self.sources.pop(c, None)
+
+    @staticmethod
+    def _render(fbo, src):
+        with fbo:
+            ClearColor(0, 0, 0, 0)
+            ClearBuffers()
+            Color(1, 1, 1, 1)
+            Rectangle(size=fbo.size, texture=src)
+        fbo.draw()
+        fbo.clear()  # the Fbo keeps its texture, not the source
+
+    def get(self, c, w, h):
+        """Texture of card c at w x h px, or None when the card has no image."""
+        key = (c, int(round(w)), int(round(h)))
+        hit = self.scaled.get(key)
+        if hit is None:
+            src = self._source(c)
+            if src is None:
+                self._release(c)
+                return None
+            fbo = Fbo(size=key[1:])
+            self._render(fbo, src)
+            hit = self.scaled[key] = (fbo.texture, fbo)
+            self._release(c)
+        return hit[0]
+
+    def set_sizes(self, sizes, cards):
+        """Keep only textures for sizes [(w, h)], and warm cards at those sizes in the background."""
+        self.sizes = {(int(round(w)), int(round(h))) for w, h in sizes}
+        self.scaled = {k: v for k, v in self.scaled.items() if k[1:] in self.sizes}
+        # Card by card, so each source is decoded once and released after its last size.
+        self._queue = [(c, w, h) for c in cards for w, h in sorted(self.sizes) if (c, w, h) not in self.scaled]
+        self._queue.reverse()  # pop() takes them in order
+        if self._queue and self._event is None:
+            self._event = Clock.schedule_interval(self._warm, 0)
+
+    def _warm(self, _dt):
+        deadline = time.perf_counter() + WARM_FRAME_SEC
+        while self._queue and time.perf_counter() < deadline:
+            self.get(*self._queue.pop())
+        if not self._queue:
+            self._event = None
+            return False  # unschedules
+        return True
+
+    def _reload(self, *_):
+        # GL context restored: the Fbo textures are blank, so render them again.
+        self.sources.clear()
+        for c, w, h in sorted(self.scaled):
+            if c not in self.sources:
+                self.sources.clear()  # sorted keys: the previous card is done
+            src = self._source(c)
+            if src is not None:
+                self._render(self.scaled[(c, w, h)][1], src)
+        self.sources.clear()
@@ -0,0 +1,225 @@
+# tournament.py
+# Napoleon (CPU policy tournament) - seeded headless games spread over a process pool.
+#
+# Each seat is pinned to a play policy (bid/lieut/exchange always use the engine CPU).
+# Game i always gets the same deal for a given seed, so results do not depend on
+# the worker count or chunking.
+#
+# Usage: python tournament.py [-n GAMES] [--seed S] [--workers W] P1 P2 P3 P4
+#   e.g. python tournament.py -n 100000 engine napo engine napo
+
+import argparse
+import importlib
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from engine import GameEngine
+from ismcts import ismcts_policy
+from pimc import pimc_policy
+from simulate import play_game
+
+
+# ----------------------------
+# Play policies: fn(engine, pid) -> card
+# ----------------------------
+
+def engine_policy(engine, pid):
+    return engine.cpu_choose(pid)
+
+
+_napo_engine = None
+
+
+def napo_policy(engine, pid):
+    """Older napo.py GameEngine.cpu_choose, fed with the current engine state.
+
+    napo.py imports tkinter/PIL, so it is loaded on first use only. Its legal move
+    rules are older (no sA follow exception, no Turn-1 Joker lead rule); a card the
+    current engine rejects is replaced by the first legal card.
+    """
+    global _napo_engine
+    if _napo_engine is None:
+        napo = importlib.import_module("napo")
+        _napo_engine = napo.GameEngine()
+    ne = _napo_engine
+    ne.rng = engine.rng  # its rare random fallbacks follow the game's stream
+
+    for np_, p in zip(ne.players, engine.players):
+        np_.cards = list(p.cards)
+        np_.role = p.role
+        np_.revealed_role = p.revealed_role
+    ne.mount = list(engine.mount)
+    ne.obverse = engine.obverse
+    ne.target = engine.target
+    ne.declaration = engine.declaration
+    ne.lieut_card = engine.lieut_card
+    ne.turn_no = engine.turn_no
+    ne.leader_id = engine.leader_id
+    ne.stage = engine.stage
+    ne.napoleon_id = engine.napoleon_id
+    ne.turn_cards = list(engine.turn_cards)
+    ne.turn_display = list(engine.turn_display)
+    ne.first_card = engine.first_card
+    ne.first_suit = engine.first_suit
+    ne.lieut_id = engine.lieut_id
+    ne.lieut_in_mount = engine.lieut_in_mount
+    ne.lieut_revealed = engine.lieut_revealed
+    ne.pict_won_count = dict(engine.pict_won_count)
+
+    c = ne.cpu_choose(pid)
+    legal = engine.legal_moves(pid)
+    return c if c in legal else legal[0]
+
+
+POLICIES = {
+    "engine": engine_policy,
+    "napo": napo_policy,
+    "pimc": pimc_policy,
+    "ismcts": ismcts_policy,
+}
+
+
+def resolve_policy(spec: str):
+    # Registered name, or "module:function" for policies living elsewhere.
+    if spec in POLICIES:
+        return POLICIES[spec]
+    mod, _, attr = spec.partition(":")
+    if not attr:
+        raise ValueError(f"Unknown policy: {spec}")
+    return getattr(importlib.import_module(mod), attr)
+
+
+# ----------------------------
+# Stats
+# ----------------------------
+
+def _empty_stats():
+    return {"seat_games": 0, "wins": 0, "pict_sum": 0, "pict_sq": 0, "nap_games": 0, "nap_wins": 0}
+
+
+def _merge(total: dict, part: dict):
+    for name, st in part.items():
+        acc = total.setdefault(name, _empty_stats())
+        for k, v in st.items():
+            acc[k] += v
+    return total
+
+
+def game_seed(seed, i):
+    # One independent, reproducible deal stream per (tournament seed, game index).
+    return (seed << 32) | i
+
+
+def run_chunk(seat_specs, seed, start, count):
+    """Play games start..start+count-1 and return per-policy counters."""
+    policies = {pid: resolve_policy(spec) for pid, spec in enumerate(seat_specs, start=1)}
+    engine = GameEngine()
+    stats = {}
+    for i in range(start, start + count):
+        res = play_game(engine, policies=policies, seed=game_seed(seed, i))
+        nap_ids = {res["napoleon_id"]}
+        if res["lieut_id"] is not None:
+            nap_ids.add(res["lieut_id"])
+        for pid, spec in enumerate(seat_specs, start=1):
+            st = stats.setdefault(spec, _empty_stats())
+            on_nap_side = pid in nap_ids
+            won = res["nap_win"] if on_nap_side else (not res["nap_win"])
+            pict = res["pict_won_count"][pid]
+            st["seat_games"] += 1
+            st["wins"] += 1 if won else 0
+            st["pict_sum"] += pict
+            st["pict_sq"] += pict * pict
+            if pid == res["napoleon_id"]:
+                st["nap_games"] += 1
+                st["nap_wins"] += 1 if res["nap_win"] else 0
+    return stats
+
+
+def wilson_interval(k: int, n: int, z: float = 1.96):
+    if n == 0:
+        return 0.0, 0.0
+    p = k / n
+    den = 1.0 + z * z / n
+    mid = (p + z * z / (2 * n)) / den
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / den
+    return max(0.0, mid - half), min(1.0, mid + half)
+
+
+def summarize(stats: dict, z: float = 1.96):
+    """Per-policy win rate / avg pict with confidence intervals.
+
+    Seat-games are treated as independent samples, so intervals are slightly
+    optimistic when one policy holds several seats of the same game.
+    """
+    out = {}
+    for name, st in stats.items():
+        n = st["seat_games"]
+        mean = st["pict_sum"] / n if n else 0.0
+        var = (st["pict_sq"] / n - mean * mean) if n else 0.0
+        half = z * math.sqrt(max(0.0, var) / n) if n else 0.0
+        out[name] = {
+            "seat_games": n,
+            "win_rate": st["wins"] / n if n else 0.0,
+            "win_ci": wilson_interval(st["wins"], n, z),
+            "avg_pict": mean,
+            "pict_ci": (mean - half, mean + half),
+            "nap_games": st["nap_games"],
+            "nap_win_rate": st["nap_wins"] / st["nap_games"] if st["nap_games"] else 0.0,
+            "nap_win_ci": wilson_interval(st["nap_wins"], st["nap_games"], z),
+        }
+    return out
+
+
+def run_tournament(n_games, seat_specs, seed=0, workers=None, chunk_size=2000):
+    """Play n_games with seat_specs[i] pinned to seat i+1 and return summarize() output.
+
+    workers=1 runs in-process; otherwise games are spread over a ProcessPoolExecutor.
+    """
+    seat_specs = list(seat_specs)
+    if len(seat_specs) != 4:
+        raise ValueError("Need exactly 4 seat policies.")
+    for spec in seat_specs:
+        resolve_policy(spec)
+
+    chunks = [(s, min(chunk_size, n_games - s)) for s in range(0, n_games, chunk_size)]
+    stats = {}
+    if workers == 1:
+        for start, count in chunks:
+            _merge(stats, run_chunk(seat_specs, seed, start, count))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futs = [pool.submit(run_chunk, seat_specs, seed, start, count) for start, count in chunks]
+            for f in futs:
+                _merge(stats, f.result())
+    return summarize(stats)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Seeded CPU policy tournament.")
+    ap.add_argument("seats", nargs=4, metavar="POLICY", help="policy per seat: " + ", ".join(POLICIES) + " or module:function")
+    ap.add_argument("-n", "--games", type=int, default=10000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--chunk", type=int, default=2000)
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    summary = run_tournament(args.games, args.seats, seed=args.seed, workers=args.workers, chunk_size=args.chunk)
+    dt = time.perf_counter() - t0
+
+    print(f"games: {args.games}  seats: {' / '.join(args.seats)}  seed: {args.seed}")
+    for name, s in summary.items():
+        lo, hi = s["win_ci"]
+        plo, phi = s["pict_ci"]
+        nlo, nhi = s["nap_win_ci"]
+        print(
+            f"{name:>10}: win {s['win_rate']:.4f} [{lo:.4f}, {hi:.4f}]  "
+            f"pict {s['avg_pict']:.3f} [{plo:.3f}, {phi:.3f}]  "
+            f"as Napoleon {s['nap_win_rate']:.4f} [{nlo:.4f}, {nhi:.4f}] (n={s['nap_games']})"
+        )
+    print(f"elapsed: {dt:.2f}s  ({args.games / dt:.0f} games/s)")
+
+
+if __name__ == "__main__":
+    main()
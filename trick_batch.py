@@ -0,0 +1,123 @@
+# trick_batch.py
+# Napoleon (batch trick judge) - GameEngine.judge_turn_winner() over NumPy arrays.
+#
+# One row per finished trick:
+#   cards     (N, 4) card ids (engine.CARD_ID) in play order, leader first
+#   obverse   (N,)   obverse suit index into engine.SUITS, -1 for none
+#   leader    (N,)   pid (1..4) who led the trick
+#   face_down (N, 4) True where the card was shown as BACK
+#   turn_no   (N,)   1..12 (the 2-rule is off on turn 1)
+# judge_tricks() returns (winner pid, pict count) arrays with exactly the
+# judge_turn_winner() result for every row.
+#
+# NumPy is optional for the rest of the game; only this module needs it.
+
+from engine import (
+    CARD_CODES,
+    CARD_ID,
+    CARD_IS_PICT,
+    FACE_DOWN,
+    SPECIAL_MIGHTY,
+    SPECIAL_YORO,
+    SUITS,
+    card_value_basic,
+    declaration_tables,
+    rank,
+    suit,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+
+JOKER_ID = CARD_ID["Jo"]
+MIGHTY_ID = CARD_ID[SPECIAL_MIGHTY]
+YORO_ID = CARD_ID[SPECIAL_YORO]
+NO_OBVERSE = len(SUITS)  # table row for an empty obverse
+
+_tables = None
+
+
+def _build_tables():
+    # Card tables, plus one row per obverse (SUITS order, then "") of the declaration tables.
+    n = len(CARD_CODES)
+    suit_idx = np.full(n, len(SUITS) + 1, dtype=np.int8)  # Joker matches no suit (not even "")
+    for i, c in enumerate(CARD_CODES):
+        if suit(c):
+            suit_idx[i] = SUITS.index(suit(c))
+    value = np.array([card_value_basic(c) for c in CARD_CODES], dtype=np.int32)
+    is_two = np.array([rank(c) == "2" for c in CARD_CODES], dtype=bool)
+    is_pict = np.array([CARD_IS_PICT[c] for c in CARD_CODES], dtype=bool)
+
+    score = np.zeros((len(SUITS) + 1, n), dtype=np.int32)
+    special = np.zeros((len(SUITS) + 1, n), dtype=bool)
+    forbidden = np.zeros((len(SUITS) + 1, n), dtype=bool)
+    for row, obv in enumerate(SUITS + [""]):
+        score_t, special_t, forbidden_t = declaration_tables(obv)
+        for i, c in enumerate(CARD_CODES):
+            score[row, i] = score_t[c]
+            special[row, i] = special_t[c]
+            forbidden[row, i] = c in forbidden_t
+    return suit_idx, value, is_two, is_pict, score, special, forbidden
+
+
+def _require_numpy():
+    global _tables
+    if np is None:
+        raise ImportError("trick_batch needs NumPy (pip install numpy).")
+    if _tables is None:
+        _tables = _build_tables()
+    return _tables
+
+
+def judge_tricks(cards, obverse, leader, face_down, turn_no):
+    """Vectorized judge_turn_winner(): (winner pid array, pict count array)."""
+    suit_idx, value, is_two, is_pict, score_t, special_t, forbidden_t = _require_numpy()
+
+    ids = np.asarray(cards, dtype=np.intp).reshape(-1, 4)
+    obv = np.asarray(obverse, dtype=np.intp).reshape(-1)
+    obv = np.where(obv < 0, NO_OBVERSE, obv)
+    lead_pid = np.asarray(leader, dtype=np.intp).reshape(-1)
+    fd = np.asarray(face_down, dtype=bool).reshape(-1, 4)
+    turn = np.asarray(turn_no).reshape(-1)
+
+    obv_col = obv[:, None]
+    cs = suit_idx[ids]
+    v = value[ids]
+
+    first_is_joker = ids[:, 0] == JOKER_ID
+    # A Joker lead asks for the obverse suit ("" matches nothing).
+    lead_suit = np.where(first_is_joker, np.where(obv == NO_OBVERSE, -1, obv), cs[:, 0])
+
+    has_forbidden = forbidden_t[obv_col, ids].any(axis=1)
+    yoro_now = (ids == MIGHTY_ID).any(axis=1) & (ids == YORO_ID).any(axis=1)
+    all_non_joker = ~(ids == JOKER_ID).any(axis=1)
+    same_suit_all = all_non_joker & (cs == cs[:, :1]).all(axis=1)
+    two_rule_active = (turn != 1) & ~first_is_joker & ~has_forbidden & same_suit_all & ~fd.any(axis=1)
+    joker_dominant = first_is_joker & ~has_forbidden
+
+    # Plain cards: face-down obverse trump, then follow / off-suit.
+    trump = fd & ~first_is_joker[:, None] & (obv_col != NO_OBVERSE) & (cs == obv_col)
+    score = np.where(trump, 2000 + v, np.where(cs != lead_suit[:, None], -10000 + v, v))
+    # Specials, in the same precedence as judge_turn_winner().
+    score = np.where(special_t[obv_col, ids], score_t[obv_col, ids], score)
+    score = np.where((ids == YORO_ID) & yoro_now[:, None], 4400, score)
+    score = np.where(ids == MIGHTY_ID, np.where(yoro_now, 4350, 4500)[:, None], score)
+    score = np.where(ids == JOKER_ID, np.where(joker_dominant, 4100, 1)[:, None], score)
+    score = score + np.where(two_rule_active[:, None] & is_two[ids], 3000, 0)
+
+    # argmax keeps the first maximum, like the strict ">" in the engine loop.
+    pos = np.argmax(score, axis=1)
+    winner = (lead_pid - 1 + pos) % 4 + 1
+    return winner, is_pict[ids].sum(axis=1)
+
+
+def encode_trick(engine):
+    """Row values (cards, obverse, leader, face_down, turn_no) for the engine's current 4-card trick."""
+    shown = dict(engine.turn_display)
+    cards = [CARD_ID[c] for _, c in engine.turn_cards]
+    face_down = [shown.get(pid) == FACE_DOWN for pid, _ in engine.turn_cards]
+    obverse = SUITS.index(engine.obverse) if engine.obverse else -1
+    return cards, obverse, engine.turn_cards[0][0], face_down, engine.turn_no